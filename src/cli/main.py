@@ -5,11 +5,12 @@ This module provides the main CLI commands using Click framework.
 """
 
 import click
+import functools
 import sys
 import yaml
 import shutil
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime, timezone
 from rich.console import Console
 from rich.table import Table
@@ -61,6 +62,19 @@ def get_full_model_name(model_command: str) -> str:
     """
     return MODEL_NAME_MAPPING.get(model_command.lower(), model_command)
 
+@functools.lru_cache(maxsize=128)
+def _forecast_hours_for_ranges(max_hours: int, ranges: Tuple[Tuple[int, int, int], ...]) -> Tuple[int, ...]:
+    """Sorted, unique forecast hours up to max_hours for frozen (start, end, frequency) ranges."""
+    all_forecast_hours = []
+    extend = all_forecast_hours.extend
+    for range_def in ranges:
+        start, end, frequency = range_def
+        # The range stop already caps every hour at max_hours
+        extend(range(start, min(end + 1, max_hours + 1), frequency))
+    
+    # Remove duplicates and sort
+    return tuple(sorted(set(all_forecast_hours)))
+
 def calculate_forecast_hours_from_days(days: float, model_config: dict) -> List[int]:
     """
     Calculate forecast hours for a given number of days based on model configuration.
@@ -75,21 +89,14 @@ def calculate_forecast_hours_from_days(days: float, model_config: dict) -> List[
     max_hours = int(days * 24)
     
     # Get all available forecast hours from model config
-    all_forecast_hours = []
     cycle_forecast_ranges = model_config.get('cycle_forecast_ranges', {})
     
     # Use the first cycle's ranges as reference (usually all cycles have same ranges)
     first_cycle = list(cycle_forecast_ranges.keys())[0] if cycle_forecast_ranges else '00'
     ranges = cycle_forecast_ranges.get(first_cycle, [])
     
-    for range_def in ranges:
-        start, end, frequency = range_def
-        for hour in range(start, min(end + 1, max_hours + 1), frequency):
-            if hour <= max_hours:
-                all_forecast_hours.append(hour)
-    
-    # Remove duplicates and sort
-    forecast_hours = sorted(list(set(all_forecast_hours)))
+    # Freeze the ranges so the computation can be cached; callers get their own list
+    forecast_hours = list(_forecast_hours_for_ranges(max_hours, tuple(map(tuple, ranges))))
     
     logger.info(f"📅 Generated {len(forecast_hours)} forecast hours for {days} day(s): {forecast_hours[0]}-{forecast_hours[-1]}h")
     return forecast_hours
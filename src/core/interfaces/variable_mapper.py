@@ -51,6 +51,42 @@ class VariableMapper(ABC):
         """
         pass
     
+    def try_get_model_variable_code(self, standard_variable: str, model: str) -> Optional[str]:
+        """
+        Get the model-specific code for a standard variable name, if mapped.
+        
+        Use this in loops where unmapped variables are expected, to avoid
+        raising and catching an exception per miss. Implementations should
+        override it with a direct lookup.
+        
+        Args:
+            standard_variable: Standard variable name (e.g., 't2m', 'u10m')
+            model: Model identifier (e.g., 'gfs', 'ecmwf', 'gem')
+            
+        Returns:
+            Model-specific variable code, or None if not supported
+        """
+        try:
+            return self.get_model_variable_code(standard_variable, model)
+        except ValueError:
+            return None
+    
+    def try_get_standard_variable_name(self, model_code: str, model: str) -> Optional[str]:
+        """
+        Get the standard variable name for a model-specific code, if mapped.
+        
+        Args:
+            model_code: Model-specific variable code
+            model: Model identifier
+            
+        Returns:
+            Standard variable name, or None if not supported
+        """
+        try:
+            return self.get_standard_variable_name(model_code, model)
+        except ValueError:
+            return None
+    
     @abstractmethod
     def get_variable_metadata(self, standard_variable: str) -> Dict[str, Any]:
         """
@@ -5,12 +5,50 @@ This module provides the YAML-based implementation of the VariableMapper interfa
 reading variable mappings from a YAML configuration file.
 """
 
+import copy
+import hashlib
+import heapq
+import threading
 import yaml
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from ..interfaces.variable_mapper import VariableMapper
 
 
+# Parsed YAML documents keyed by a digest of their text
+_yaml_cache: Dict[str, Any] = {}
+_yaml_cache_lock = threading.Lock()
+
+
+def _load_yaml_cached(yaml_path: Path) -> Any:
+    """
+    Load a YAML file, reusing an in-memory parse of identical text.
+    
+    The cache is keyed by a digest of the YAML text, so any edit to the source
+    invalidates it. Reading the text is cheap; it is the YAML parse that the
+    cache avoids. Each caller gets its own deep copy of the parsed content.
+    
+    Args:
+        yaml_path: Path to the YAML file
+        
+    Returns:
+        Parsed YAML content
+    """
+    with open(yaml_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    
+    digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(digest, _yaml_cache)
+    if cached is _yaml_cache:
+        cached = yaml.safe_load(text)
+        with _yaml_cache_lock:
+            _yaml_cache[digest] = cached
+    
+    return copy.deepcopy(cached)
+
+
 class YAMLVariableMapper(VariableMapper):
     """
     YAML-based implementation of the VariableMapper interface.
@@ -29,10 +67,15 @@ class YAMLVariableMapper(VariableMapper):
         self.mapping_file = mapping_file
         self.mapping = self._load_mapping()
         
+        # Resolve the standard variables section once; every lookup goes through it
+        self._std_vars = self.mapping.get('standard_variables', {})
+        
+        # Reverse lookups (model code -> standard name), built per model on demand
+        self._code_to_std: Dict[str, Dict[Any, str]] = {}
+        
         # Load model technical configurations
         models_config_path = Path(__file__).parent.parent.parent.parent / "models_config.yaml"
-        with open(models_config_path, 'r') as f:
-            self.models_config = yaml.safe_load(f)
+        self.models_config = _load_yaml_cached(models_config_path)
         
         # Model name to config key mapping
         self.model_keys = {
@@ -74,8 +117,7 @@ class YAMLVariableMapper(VariableMapper):
             raise FileNotFoundError(f"Mapping file not found: {self.mapping_file}")
         
         try:
-            with open(self.mapping_file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            return _load_yaml_cached(self.mapping_file)
         except yaml.YAMLError as e:
             raise yaml.YAMLError(f"Error parsing YAML file: {e}")
     
@@ -93,10 +135,10 @@ class YAMLVariableMapper(VariableMapper):
         Raises:
             ValueError: If variable or model is not supported
         """
-        if standard_variable not in self.mapping['standard_variables']:
+        if standard_variable not in self._std_vars:
             raise ValueError(f"Unknown standard variable: {standard_variable}")
         
-        variable_config = self.mapping['standard_variables'][standard_variable]
+        variable_config = self._std_vars[standard_variable]
         
         if model not in variable_config:
             raise ValueError(f"Model {model} not supported for variable {standard_variable}")
@@ -117,11 +159,47 @@ class YAMLVariableMapper(VariableMapper):
         Raises:
             ValueError: If code or model is not supported
         """
-        for std_var, config in self.mapping['standard_variables'].items():
-            if config.get(model) == model_code:
-                return std_var
+        std_var = self.try_get_standard_variable_name(model_code, model)
+        if std_var is None:
+            raise ValueError(f"Unknown model code: {model_code} for model: {model}")
         
-        raise ValueError(f"Unknown model code: {model_code} for model: {model}")
+        return std_var
+    
+    def try_get_model_variable_code(self, standard_variable: str, model: str) -> Optional[str]:
+        """
+        Get the model-specific code for a standard variable name, if mapped.
+        
+        Args:
+            standard_variable: Standard variable name (e.g., 't2m', 'u10m')
+            model: Model identifier (e.g., 'gfs', 'ecmwf', 'gem')
+            
+        Returns:
+            Model-specific variable code, or None if not supported
+        """
+        return self._std_vars.get(standard_variable, {}).get(model)
+    
+    def try_get_standard_variable_name(self, model_code: str, model: str) -> Optional[str]:
+        """
+        Get the standard variable name for a model-specific code, if mapped.
+        
+        Args:
+            model_code: Model-specific variable code
+            model: Model identifier
+            
+        Returns:
+            Standard variable name, or None if not supported
+        """
+        code_to_std = self._code_to_std.get(model)
+        if code_to_std is None:
+            code_to_std = {}
+            for std_var, config in self._std_vars.items():
+                code = config.get(model)
+                # Keep the first standard name per code, as the linear scan did
+                if code is not None and code not in code_to_std:
+                    code_to_std[code] = std_var
+            self._code_to_std[model] = code_to_std
+        
+        return code_to_std.get(model_code)
     
     def get_variable_metadata(self, standard_variable: str) -> Dict[str, Any]:
         """
@@ -136,10 +214,10 @@ class YAMLVariableMapper(VariableMapper):
         Raises:
             ValueError: If variable is not supported
         """
-        if standard_variable not in self.mapping['standard_variables']:
+        if standard_variable not in self._std_vars:
             raise ValueError(f"Unknown standard variable: {standard_variable}")
         
-        return self.mapping['standard_variables'][standard_variable].copy()
+        return self._std_vars[standard_variable].copy()
     
     def get_supported_variables(self, model: str) -> List[str]:
         """
@@ -152,7 +230,7 @@ class YAMLVariableMapper(VariableMapper):
             List of supported standard variable names
         """
         supported = []
-        for std_var, config in self.mapping['standard_variables'].items():
+        for std_var, config in self._std_vars.items():
             if model in config:
                 supported.append(std_var)
         return supported
@@ -235,19 +313,16 @@ class YAMLVariableMapper(VariableMapper):
             raise ValueError(f"Unsupported model: {model}")
         
         model_config = self.models_config['models'][model_key]
-        all_forecast_hours = set()
-        
-        # Get forecast hours from all cycles using ranges
-        for cycle, ranges in model_config['cycle_forecast_ranges'].items():
-            for range_tuple in ranges:
-                start, end, frequency = range_tuple  # Unpack tuple: [start, end, frequency]
-                
-                # Generate forecast hours for this range
-                for hour in range(start, end + 1, frequency):
-                    if hour <= max_forecast:
-                        all_forecast_hours.add(hour)
-        
-        return sorted(list(all_forecast_hours))
+        
+        # Every [start, end, frequency] range is already ascending, so merging them
+        # streams the hours in order and dict.fromkeys drops cross-cycle duplicates
+        hour_ranges = (
+            range(start, min(end, max_forecast) + 1, frequency)
+            for ranges in model_config['cycle_forecast_ranges'].values()
+            for start, end, frequency in ranges
+        )
+        
+        return list(dict.fromkeys(heapq.merge(*hour_ranges)))
     
     def get_cycles_for_model(self, model: str) -> List[str]:
         """
@@ -294,11 +369,10 @@ class YAMLVariableMapper(VariableMapper):
         ranges = model_config['cycle_forecast_ranges'][cycle]
         
         # Generate forecast hours from ranges
+        extend = forecast_hours.extend
         for range_tuple in ranges:
             start, end, frequency = range_tuple  # Unpack tuple: [start, end, frequency]
-            
-            for hour in range(start, end + 1, frequency):
-                forecast_hours.append(hour)
+            extend(range(start, end + 1, frequency))
         
         return sorted(forecast_hours)
     
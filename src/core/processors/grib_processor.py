@@ -8,13 +8,20 @@ This module provides processing capabilities for GRIB2 files including:
 - NetCDF conversion with optimization
 """
 
+import functools
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+import dask
 import xarray as xr
 import numpy as np
+import netCDF4
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
 from loguru import logger
 
 from ..interfaces.data_processor import DataProcessor
+from ...utils.compression import CompressionManager
 
 
 class GRIBProcessor(DataProcessor):
@@ -28,6 +35,25 @@ class GRIBProcessor(DataProcessor):
     - NetCDF output with compression and optimization
     """
     
+    # GRIB short names that cfgrib produces for each GFS variable code
+    GFS_CODE_TO_GRIB_NAMES = {
+        'TMP': ('t', 't2m'),  # Temperature maps to both t and t2m
+        'RH': ('r2',),        # Relative humidity
+        'UGRD': ('u10',),     # U wind component
+        'VGRD': ('v10',),     # V wind component
+        'HGT': ('orog',),     # Height/orography maps to orog only
+    }
+    
+    # Target NetCDF chunk size, well above the compressor window and FS block size
+    TARGET_CHUNK_BYTES = 1 << 20  # 1 MiB
+    
+    # Outputs smaller than this are written contiguous and uncompressed; the
+    # per-chunk filter pipeline costs more than it saves on files this size
+    CONTIGUOUS_MAX_BYTES = 16 << 20  # 16 MiB
+    
+    # Decimal digits worth keeping per variable, shared with CompressionManager
+    LEAST_SIGNIFICANT_DIGITS = CompressionManager.LEAST_SIGNIFICANT_DIGITS
+    
     def __init__(self, variable_mapper=None, user_config=None):
         """
         Initialize GRIB processor.
@@ -38,6 +64,23 @@ class GRIBProcessor(DataProcessor):
         """
         self.variable_mapper = variable_mapper
         self.user_config = user_config or {}
+        self._compression_encoding = self._get_compression_encoding()
+        self._workers = self.user_config.get('processing', {}).get('workers')  # None: one per CPU
+        self._configured_gfs_codes = None
+        self._subset_slices = {}
+        
+        compression_config = self.user_config.get('processing', {}).get('compression', {})
+        self._least_significant_digits = (
+            self.LEAST_SIGNIFICANT_DIGITS if compression_config.get('quantize', True) else {}
+        )
+        # Absolute error bounds per variable override the default digits
+        tolerances = compression_config.get('tolerances') or {}
+        if tolerances:
+            self._least_significant_digits = {
+                **self._least_significant_digits,
+                **CompressionManager.least_significant_digits_for_tolerances(tolerances)
+            }
+        self._pack_int16 = compression_config.get('pack_int16', False)
     
     def process(
         self, 
@@ -71,19 +114,28 @@ class GRIBProcessor(DataProcessor):
             # Prepare for variable calculations (placeholder)
             processed_dataset = self.prepare_for_variable_calculation(subset_dataset)
             
+            # Evaluate the load/subset graph once so both outputs share the result
+            # instead of decoding the GRIB files again for each of them
+            processed_dataset = processed_dataset.persist(scheduler='threads', num_workers=self._workers)
+            
             outputs = {}
             
+            # Packing ranges are taken once from the persisted data; linear time
+            # interpolation cannot leave them, so the hourly output reuses them
+            # instead of evaluating the whole interpolation graph an extra time
+            packing = self._get_int16_packing(processed_dataset) if self._pack_int16 else {}
+            
             # Always generate processed output (original frequencies)
             processed_output_path = self._get_processed_output_path(output_path)
-            optimized_original = self.optimize_storage(processed_dataset.copy())
+            optimized_original = self.optimize_storage(processed_dataset, packing=packing)
             self._save_netcdf(optimized_original, processed_output_path)
             outputs['processed'] = processed_output_path
             logger.success(f"✅ Saved original data: {processed_output_path}")
             
             # Always generate interpolated output (hourly)
-            interpolated_dataset = self.interpolate_temporal(processed_dataset.copy())
+            interpolated_dataset = self.interpolate_temporal(processed_dataset)
             interpolated_output_path = self._get_interpolated_output_path(output_path)
-            optimized_interpolated = self.optimize_storage(interpolated_dataset)
+            optimized_interpolated = self.optimize_storage(interpolated_dataset, packing=packing)
             self._save_netcdf(optimized_interpolated, interpolated_output_path)
             outputs['interpolated'] = interpolated_output_path
             logger.success(f"✅ Saved interpolated data: {interpolated_output_path}")
@@ -123,7 +175,8 @@ class GRIBProcessor(DataProcessor):
                     engine='cfgrib',
                     combine='by_coords',
                     parallel=True,
-                    chunks={'valid_time': 1}  # Chunk by valid_time for memory efficiency
+                    chunks={'valid_time': 1},  # Chunk by valid_time for memory efficiency
+                    backend_kwargs={'cache_geo_coords': True}  # Reuse lat/lon across records on the same grid
                 )
                 
                 # Rename valid_time to time for consistency, but drop existing time first if it exists
@@ -147,34 +200,28 @@ class GRIBProcessor(DataProcessor):
                 logger.info("🔄 Trying alternative loading approach...")
                 
                 # Alternative approach: Load files individually with multiple level filters
-                datasets = []
-                for file_path in input_files:
-                    file_datasets = []
-                    
-                    # Define level filters to load all relevant data
-                    level_filters = [
-                        {'typeOfLevel': 'surface'},
-                        {'typeOfLevel': 'heightAboveGround', 'level': 2},  # 2m variables
-                        {'typeOfLevel': 'heightAboveGround', 'level': 10}, # 10m variables
+                # Define level filters to load all relevant data
+                level_filters = [
+                    {'typeOfLevel': 'surface'},
+                    {'typeOfLevel': 'heightAboveGround', 'level': 2},  # 2m variables
+                    {'typeOfLevel': 'heightAboveGround', 'level': 10}, # 10m variables
+                ]
+                
+                # Open files concurrently, but each file's level filters one after
+                # another: cfgrib shares one .idx index file per GRIB file, and
+                # concurrent opens of the same file race to write and read it
+                def open_file_levels(file_path):
+                    return [
+                        ds_level for ds_level in
+                        (self._open_grib_level(file_path, level_filter) for level_filter in level_filters)
+                        if ds_level is not None
                     ]
-                    
-                    for level_filter in level_filters:
-                        try:
-                            ds_level = xr.open_dataset(
-                                str(file_path),
-                                engine='cfgrib',
-                                backend_kwargs={
-                                    'filter_by_keys': level_filter,
-                                    'errors': 'ignore'
-                                }
-                            )
-                            if len(ds_level.data_vars) > 0:  # Only add if it has variables
-                                file_datasets.append(ds_level)
-                                logger.debug(f"   ✅ Loaded {file_path.name} ({level_filter})")
-                        except Exception as e:
-                            logger.debug(f"   ⚠️ Could not load {file_path.name} with filter {level_filter}: {e}")
-                            continue
-                    
+                
+                with ThreadPoolExecutor(max_workers=max(1, min(32, len(input_files)))) as executor:
+                    file_level_datasets = list(executor.map(open_file_levels, input_files))
+                
+                datasets = []
+                for file_path, file_datasets in zip(input_files, file_level_datasets):
                     # Merge all levels for this file
                     if file_datasets:
                         try:
@@ -208,18 +255,12 @@ class GRIBProcessor(DataProcessor):
                 elif 'valid_time' in dataset.dims:
                     dataset = dataset.rename({'valid_time': 'time'})
                 
-                # Standardize coordinate names to ensure consistent dimensions
-                dataset = self._standardize_coordinate_names(dataset)
-                
-                logger.debug(f"📊 Combined dataset with dimensions: {dict(dataset.dims)}")
+                logger.debug(f"📊 Combined dataset with dimensions: {dict(dataset.sizes)}")
                 logger.debug(f"📊 Variables: {list(dataset.data_vars)}")
                 
-                # Filter variables to only keep those specified in user config
-                dataset = self._filter_config_variables(dataset)
-                logger.debug(f"📊 Variables after filtering: {list(dataset.data_vars)}")
-                
-                # Standardize variable names according to config
-                dataset = self._standardize_variable_names(dataset)
+                # Standardize coordinates, keep the configured variables and give
+                # them standard names in a single pass
+                dataset = self._standardize_dataset(dataset)
                 logger.debug(f"📊 Variables after standardization: {list(dataset.data_vars)}")
                 
                 return dataset
@@ -228,6 +269,37 @@ class GRIBProcessor(DataProcessor):
             logger.error(f"❌ Failed to load GRIB2 files: {e}")
             raise
     
+    def _open_grib_level(self, file_path: Path, level_filter: Dict[str, Any]) -> Optional[xr.Dataset]:
+        """
+        Open the messages of a GRIB2 file matching a single level filter.
+        
+        Args:
+            file_path: GRIB2 file path
+            level_filter: cfgrib filter_by_keys selection
+            
+        Returns:
+            Dataset for the level, or None if it could not be loaded or is empty
+        """
+        try:
+            ds_level = xr.open_dataset(
+                str(file_path),
+                engine='cfgrib',
+                backend_kwargs={
+                    'filter_by_keys': level_filter,
+                    'errors': 'ignore',
+                    'cache_geo_coords': True
+                }
+            )
+        except Exception as e:
+            logger.debug(f"   ⚠️ Could not load {file_path.name} with filter {level_filter}: {e}")
+            return None
+        
+        if len(ds_level.data_vars) == 0:  # Only keep it if it has variables
+            return None
+        
+        logger.debug(f"   ✅ Loaded {file_path.name} ({level_filter})")
+        return ds_level
+    
     def validate_data(self, dataset: xr.Dataset) -> xr.Dataset:
         """
         Validate the loaded dataset.
@@ -251,11 +323,12 @@ class GRIBProcessor(DataProcessor):
         if dataset.sizes['time'] == 0:
             raise ValueError("No time steps found in dataset")
         
-        # Check for NaN values
-        for var_name, var_data in dataset.data_vars.items():
-            nan_count = var_data.isnull().sum().compute()
+        # Check for NaN values in a single pass over the data rather than one
+        # graph execution per variable
+        nan_counts = dataset.isnull().sum().compute()
+        for var_name, nan_count in nan_counts.data_vars.items():
             if nan_count > 0:
-                logger.warning(f"⚠️  Variable {var_name} has {nan_count} NaN values")
+                logger.warning(f"⚠️  Variable {var_name} has {int(nan_count)} NaN values")
         
         logger.debug("✅ Dataset validation completed")
         return dataset
@@ -274,10 +347,11 @@ class GRIBProcessor(DataProcessor):
         
         # Get time coordinate
         time_coord = dataset.time
+        times = time_coord.values
+        one_hour = np.timedelta64(1, 'h')
         
-        # Check if interpolation is needed
-        time_diff = np.diff(time_coord.values.astype('datetime64[h]')).astype(int)
-        max_gap = np.max(time_diff) if len(time_diff) > 0 else 1
+        # Check if interpolation is needed (whole hours, in the coordinate's own unit)
+        max_gap = int(np.diff(times).max() // one_hour) if len(times) > 1 else 1
         
         if max_gap <= 1:
             logger.info("✅ No temporal interpolation needed - data is already at hourly frequency")
@@ -285,27 +359,90 @@ class GRIBProcessor(DataProcessor):
         
         logger.debug(f"🔄 Interpolating temporal gaps (max gap: {max_gap}h)")
         
-        # Create hourly time grid
-        start_time = time_coord.min().values
-        end_time = time_coord.max().values
-        
-        # Generate hourly time steps
-        hourly_times = np.arange(
-            start_time.astype('datetime64[h]'),
-            end_time.astype('datetime64[h]') + np.timedelta64(1, 'h'),
-            np.timedelta64(1, 'h')
-        )
+        # Generate hourly time steps; keeps the input resolution so no recasting
+        hourly_times = np.arange(times[0], times[-1] + one_hour, one_hour)
         
         # Interpolate to hourly grid
-        interpolated_dataset = dataset.interp(
-            time=hourly_times,
-            method='linear',
-            kwargs={'fill_value': 'extrapolate'}
-        )
+        interpolated_dataset = self._interpolate_linear_in_time(dataset, hourly_times)
         
         logger.debug(f"✅ Interpolated from {len(time_coord)} to {len(hourly_times)} time steps")
         return interpolated_dataset
     
+    def _interpolate_linear_in_time(self, dataset: xr.Dataset, target_times: np.ndarray) -> xr.Dataset:
+        """
+        Linearly interpolate time-dependent variables onto new time steps.
+        
+        The bracketing source steps and blend weights are computed once for the
+        whole dataset, so each variable reduces to two indexed reads and a
+        vectorized blend. Dask-backed data stays lazy and is chunked to match the
+        storage layout, so writing streams one chunk at a time. Target times
+        must lie within the source time range.
+        
+        Args:
+            dataset: Input dataset sorted by time
+            target_times: Time steps to interpolate to
+            
+        Returns:
+            Dataset on the target time steps
+            
+        Raises:
+            ValueError: If the time steps are not strictly increasing, or a
+                coordinate along time is not numeric and cannot be blended
+        """
+        source_times = dataset.time.values
+        
+        # Repeated or unsorted steps would give 0/0 or negative blend weights
+        if not (source_times[1:] > source_times[:-1]).all():
+            raise ValueError("Time coordinate must be strictly increasing for interpolation")
+        
+        # Index of the source step at or after each target, clipped so that
+        # [lower, upper] always brackets it (exact matches get weight 0 or 1)
+        upper = np.clip(np.searchsorted(source_times, target_times, side='right'), 1, len(source_times) - 1)
+        lower = upper - 1
+        weights = (target_times - source_times[lower]) / (source_times[upper] - source_times[lower])
+        
+        # Coordinates along time (e.g. step, whatever their other dimensions)
+        # are blended with the same weights
+        coords = {'time': target_times}
+        coord_weight = xr.Variable('time', weights)
+        for name, coord in dataset.coords.items():
+            if name == 'time':
+                continue
+            if 'time' not in coord.dims:
+                coords[name] = coord
+                continue
+            if coord.dtype.kind not in 'iufcmM':
+                raise ValueError(f"Cannot interpolate non-numeric coordinate '{name}' along time")
+            lower_values = coord.variable.isel(time=lower)
+            upper_values = coord.variable.isel(time=upper)
+            blended = lower_values + (upper_values - lower_values) * coord_weight
+            coords[name] = xr.Variable(coord.dims, blended.transpose(*coord.dims).data, coord.attrs)
+        
+        interpolated_vars = {}
+        for var_name, var in dataset.data_vars.items():
+            if 'time' not in var.dims:
+                interpolated_vars[var_name] = var  # Static fields (e.g. orography)
+                continue
+            
+            var = var.reset_coords(drop=True)
+            # Float weights in the variable's own precision; integer variables get
+            # float weights (and a float result) so fractions are not truncated
+            weight_dtype = np.result_type(var.dtype, np.float32)
+            weight = xr.DataArray(weights.astype(weight_dtype), dims='time', coords={'time': target_times})
+            lower_values = var.isel(time=lower).assign_coords(time=target_times)
+            upper_values = var.isel(time=upper).assign_coords(time=target_times)
+            interpolated = lower_values + (upper_values - lower_values) * weight
+            
+            if interpolated.chunks is not None:
+                # Stay lazy, but group time steps like the NetCDF chunks so each
+                # compressed chunk is produced and written in a single pass
+                storage_chunks = self._get_optimal_chunks(interpolated)
+                interpolated = interpolated.chunk(dict(zip(interpolated.dims, storage_chunks)))
+            
+            interpolated_vars[var_name] = interpolated.assign_attrs(var.attrs)
+        
+        return xr.Dataset(interpolated_vars, coords=coords, attrs=dataset.attrs)
+    
     def _filter_config_variables(self, dataset: xr.Dataset) -> xr.Dataset:
         """
         Filter dataset to only include variables specified in user config.
@@ -316,9 +453,26 @@ class GRIBProcessor(DataProcessor):
         Returns:
             Dataset with only configured variables
         """
+        vars_to_keep = self._select_config_variables(dataset)
+        if vars_to_keep is None:
+            return dataset
+        
+        # Selecting by name keeps the coordinates of the kept variables
+        return dataset[vars_to_keep]
+    
+    def _select_config_variables(self, dataset: xr.Dataset) -> Optional[List[str]]:
+        """
+        Find the dataset variables that correspond to the configured variables.
+        
+        Args:
+            dataset: Input dataset
+            
+        Returns:
+            Names of the variables to keep, or None to keep all of them
+        """
         if 'variables' not in self.user_config:
             logger.debug("🔍 No variable filter configured, keeping all variables")
-            return dataset
+            return None
         
         configured_vars = self.user_config['variables']
         logger.debug(f"🔍 Filtering for configured variables: {configured_vars}")
@@ -326,61 +480,53 @@ class GRIBProcessor(DataProcessor):
         # Create mapping from GRIB variable names to standard names
         if not self.variable_mapper:
             logger.warning("⚠️ No variable mapper available, keeping all variables")
-            return dataset
+            return None
         
         # Find which dataset variables correspond to configured standard variables
         vars_to_keep = []
-        for data_var in dataset.data_vars:
-            for std_var in configured_vars:
-                try:
-                    # Get the GFS code for this standard variable
-                    gfs_code = self.variable_mapper.get_model_variable_code(std_var, 'gfs')
-                    
-                    # Check if this data variable matches (by name similarity)
-                    # This is a simple mapping - could be improved
-                    var_mappings = {
-                        'TMP': ['t', 't2m'],  # Temperature maps to both t and t2m
-                        'RH': ['r2'],         # Relative humidity
-                        'UGRD': ['u10'],      # U wind component
-                        'VGRD': ['v10'],      # V wind component  
-                        'HGT': ['orog']       # Height/orography maps to orog only
-                    }
-                    
-                    if gfs_code in var_mappings:
-                        if data_var in var_mappings[gfs_code]:
-                            # For temperature, prefer t2m over t
-                            if std_var == 't2m' and data_var == 't2m':
-                                vars_to_keep.append(data_var)
-                            elif std_var == 't2m' and data_var == 't':
-                                continue  # Skip surface temperature if we want 2m temp
-                            elif gfs_code == 'TMP' and data_var == 't' and 't2m' not in dataset.data_vars:
-                                vars_to_keep.append(data_var)  # Use t if t2m not available
-                            elif gfs_code != 'TMP':
-                                vars_to_keep.append(data_var)
-                            
-                except ValueError:
+        for std_var, gfs_code in self._get_configured_gfs_codes():
+            for data_var in self.GFS_CODE_TO_GRIB_NAMES.get(gfs_code, ()):
+                if data_var not in dataset.data_vars:
                     continue
+                # For temperature, prefer t2m over t
+                if std_var == 't2m' and data_var == 't2m':
+                    vars_to_keep.append(data_var)
+                elif std_var == 't2m' and data_var == 't':
+                    continue  # Skip surface temperature if we want 2m temp
+                elif gfs_code == 'TMP' and data_var == 't' and 't2m' not in dataset.data_vars:
+                    vars_to_keep.append(data_var)  # Use t if t2m not available
+                elif gfs_code != 'TMP':
+                    vars_to_keep.append(data_var)
         
         # Remove duplicates
-        vars_to_keep = list(set(vars_to_keep))
+        vars_to_keep = list(dict.fromkeys(vars_to_keep))
         
         if not vars_to_keep:
             logger.warning("⚠️ No variables matched configuration, keeping all")
-            return dataset
+            return None
         
-        # Filter dataset to only include configured variables
         logger.info(f"✅ Keeping {len(vars_to_keep)} configured variables: {vars_to_keep}")
-        filtered_vars = {var: dataset[var] for var in vars_to_keep if var in dataset.data_vars}
+        return vars_to_keep
+
+    def _get_configured_gfs_codes(self) -> List[tuple]:
+        """
+        Resolve the configured standard variables to GFS codes.
         
-        # Create new dataset with filtered variables but keep all coordinates
-        filtered_dataset = xr.Dataset(
-            data_vars=filtered_vars,
-            coords=dataset.coords,
-            attrs=dataset.attrs
-        )
+        The lookup only depends on the user config and the mapper, so it is
+        done once per processor and reused for every dataset load.
         
-        return filtered_dataset
-
+        Returns:
+            List of (standard variable, GFS code) pairs; unsupported variables are skipped
+        """
+        if self._configured_gfs_codes is None:
+            supported = set(self.variable_mapper.get_supported_variables('gfs'))
+            self._configured_gfs_codes = [
+                (std_var, self.variable_mapper.get_model_variable_code(std_var, 'gfs'))
+                for std_var in self.user_config['variables']
+                if std_var in supported
+            ]
+        return self._configured_gfs_codes
+    
     def _standardize_variable_names(self, dataset: xr.Dataset) -> xr.Dataset:
         """
         Standardize variable names according to the mapping configuration.
@@ -391,9 +537,29 @@ class GRIBProcessor(DataProcessor):
         Returns:
             Dataset with standardized variable names
         """
+        name_mapping = self._get_variable_renames(dataset, dataset.data_vars)
+        if not name_mapping:
+            return dataset
+        
+        # Rename variables
+        renamed_dataset = dataset.rename(name_mapping)
+        
+        return renamed_dataset
+    
+    def _get_variable_renames(self, dataset: xr.Dataset, var_names) -> Dict[str, str]:
+        """
+        Map GRIB variable names to the configured standard names.
+        
+        Args:
+            dataset: Dataset the variables belong to (used to avoid name clashes)
+            var_names: Variable names that will be present
+            
+        Returns:
+            Rename mapping; empty when nothing needs renaming
+        """
         if not self.variable_mapper or 'variables' not in self.user_config:
             logger.debug("🔍 No variable mapper or config available, keeping original names")
-            return dataset
+            return {}
         
         # Create mapping from GRIB names to standard names
         name_mapping = {}
@@ -406,21 +572,19 @@ class GRIBProcessor(DataProcessor):
             't': 't',        # Keep surface temperature as t
         }
         
-        # Build mapping for variables that exist in dataset
+        # Build mapping for variables that exist in dataset, skipping no-op
+        # renames and targets already taken by another variable or coordinate
         for grib_name, std_name in grib_to_standard.items():
-            if grib_name in dataset.data_vars and std_name in self.user_config['variables']:
+            if (grib_name in var_names and std_name in self.user_config['variables']
+                    and grib_name != std_name and std_name not in dataset.variables):
                 name_mapping[grib_name] = std_name
         
         if not name_mapping:
             logger.debug("🔍 No variable names to standardize")
-            return dataset
+            return {}
         
         logger.info(f"🔄 Standardizing variable names: {name_mapping}")
-        
-        # Rename variables
-        renamed_dataset = dataset.rename(name_mapping)
-        
-        return renamed_dataset
+        return name_mapping
 
     def apply_spatial_subsetting(self, dataset: xr.Dataset) -> xr.Dataset:
         """
@@ -454,14 +618,21 @@ class GRIBProcessor(DataProcessor):
             if lon_max < 0:
                 lon_max = lon_max + 360
             
-            # Apply subsetting
-            subset_ds = dataset.sel(
-                longitude=slice(lon_min, lon_max),
-                latitude=slice(lat_max, lat_min)  # Note: latitude is usually descending
+            # Apply subsetting by position; the slices only depend on the grid
+            grid_key = tuple(
+                (index[0], index[-1], len(index))
+                for index in (dataset.indexes['longitude'], dataset.indexes['latitude'])
             )
+            if grid_key not in self._subset_slices:
+                self._subset_slices[grid_key] = (
+                    dataset.indexes['longitude'].slice_indexer(lon_min, lon_max),
+                    dataset.indexes['latitude'].slice_indexer(lat_max, lat_min)  # Note: latitude is usually descending
+                )
+            lon_slice, lat_slice = self._subset_slices[grid_key]
+            subset_ds = dataset.isel(longitude=lon_slice, latitude=lat_slice)
             
             logger.debug(f"✅ Spatial subsetting completed. "
-                        f"New dimensions: {dict(subset_ds.dims)}")
+                        f"New dimensions: {dict(subset_ds.sizes)}")
             
             return subset_ds
             
@@ -486,36 +657,170 @@ class GRIBProcessor(DataProcessor):
         
         return dataset
     
-    def optimize_storage(self, dataset: xr.Dataset) -> xr.Dataset:
+    def optimize_storage(
+        self,
+        dataset: xr.Dataset,
+        packing: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> xr.Dataset:
         """
         Optimize dataset for storage.
         
+        Quantization is applied here, per chunk and lazily, rather than through
+        the ``least_significant_digit`` encoding: netCDF4 would run it inside the
+        HDF5 write lock, serialized with compression, whereas dask can quantize
+        chunks concurrently while earlier ones are being written. Outputs below
+        ``CONTIGUOUS_MAX_BYTES`` are still packed and quantized, but stored
+        contiguously without chunking or compression.
+        
         Args:
             dataset: Input dataset
+            packing: Precomputed int16 packing per variable (see _get_int16_packing);
+                computed from the dataset when None and packing is enabled
             
         Returns:
             Optimized dataset with compression settings
         """
         logger.debug("🗜️  Optimizing dataset for storage")
         
-        # Apply compression encoding to all variables
-        encoding = {}
-        for var_name in dataset.data_vars:
-            encoding[var_name] = {
-                'zlib': True,
-                'complevel': 6,
-                'shuffle': True,
-                'fletcher32': True,
-                'chunksizes': self._get_optimal_chunks(dataset[var_name])
-            }
+        total_bytes = sum(var.nbytes for var in dataset.data_vars.values())
+        
+        # Packed variables are rounded by the packing itself
+        if packing is None:
+            packing = self._get_int16_packing(dataset) if self._pack_int16 else {}
+        
+        # Quantize floating-point variables with a known precision
+        quantized = {}
+        for var_name, var in dataset.data_vars.items():
+            digits = self._least_significant_digits.get(var_name)
+            if digits is None or var_name in packing or not np.issubdtype(var.dtype, np.floating):
+                continue
+            quantized[var_name] = xr.apply_ufunc(
+                self._quantize, var,
+                kwargs={'least_significant_digit': digits},
+                dask='parallelized',
+                output_dtypes=[var.dtype],
+                keep_attrs=True
+            ).assign_attrs(least_significant_digit=digits)
+        
+        if quantized:
+            dataset = dataset.assign(quantized)
+        
+        if total_bytes < self.CONTIGUOUS_MAX_BYTES:
+            logger.debug(f"📄 Small output ({total_bytes / (1024 * 1024):.1f} MB), "
+                         f"using contiguous storage without compression")
+            for var_name, var in dataset.data_vars.items():
+                var.encoding = {'contiguous': True, **packing.get(var_name, {})}
+            dataset.encoding['unlimited_dims'] = []  # Unlimited dimensions require chunking
+            return dataset
         
-        # Apply encoding
-        for var_name, var_encoding in encoding.items():
-            dataset[var_name].encoding.update(var_encoding)
+        # Apply compression encoding to all variables, replacing whatever was
+        # inherited from the GRIB source
+        for var_name, var in dataset.data_vars.items():
+            var.encoding = {
+                **self._compression_encoding,
+                'chunksizes': self._get_optimal_chunks(var),
+                **packing.get(var_name, {})
+            }
         
-        logger.debug(f"✅ Applied compression to {len(encoding)} variables")
+        logger.debug(f"✅ Applied compression to {len(dataset.data_vars)} variables")
         return dataset
     
+    def _get_int16_packing(self, dataset: xr.Dataset) -> Dict[str, Dict[str, Any]]:
+        """
+        Build CF int16 packing (scale_factor/add_offset) for floating-point variables.
+        
+        Each variable's range is mapped onto the int16 range, so the packing step
+        is (max - min) / 65532, e.g. about 0.002 K for a global temperature field.
+        Readers that follow CF conventions unpack transparently.
+        
+        Args:
+            dataset: Dataset to be written
+            
+        Returns:
+            Encoding entries per variable; all-NaN variables are left unpacked
+        """
+        float_vars = [
+            name for name, var in dataset.data_vars.items()
+            if np.issubdtype(var.dtype, np.floating)
+        ]
+        if not float_vars:
+            return {}
+        
+        # Ranges of all variables in a single pass over the data
+        minimums, maximums = dask.compute(
+            dataset[float_vars].min(), dataset[float_vars].max(),
+            scheduler='threads', num_workers=self._workers
+        )
+        
+        packing = {}
+        for var_name in float_vars:
+            vmin, vmax = float(minimums[var_name]), float(maximums[var_name])
+            if not (np.isfinite(vmin) and np.isfinite(vmax)):
+                continue
+            # Scale and offset in the variable's own type so it unpacks to the same dtype;
+            # 65532 steps leave a margin so rounding never overflows into the fill value
+            float_type = dataset[var_name].dtype.type
+            packing[var_name] = {
+                'dtype': 'int16',
+                'scale_factor': float_type((vmax - vmin) / 65532 or 1.0),
+                'add_offset': float_type((vmax + vmin) / 2),
+                '_FillValue': np.int16(-32768),
+            }
+        
+        logger.debug(f"📦 Packing {len(packing)} variables as int16")
+        return packing
+    
+    @staticmethod
+    def _quantize(data: np.ndarray, least_significant_digit: int) -> np.ndarray:
+        """
+        Round data to a power-of-two step finer than the given decimal digit.
+        
+        Matches netCDF4's ``least_significant_digit`` quantization bit for bit
+        (computed in float64) and returns the input dtype.
+        
+        Args:
+            data: Array to quantize
+            least_significant_digit: Decimal digit that must be preserved
+            
+        Returns:
+            Quantized array
+        """
+        scale = 2.0 ** math.ceil(math.log2(10.0 ** least_significant_digit))
+        return (np.around(data * np.float64(scale)) / scale).astype(data.dtype)
+    
+    def _get_compression_encoding(self) -> Dict[str, Any]:
+        """
+        Build the NetCDF compression settings shared by all variables.
+        
+        Uses Zstandard by default since it writes several times faster than zlib
+        at a similar ratio. Set ``processing.compression.codec: zlib`` to opt out;
+        zlib is also used when the installed netCDF library lacks the zstd filter.
+        ``processing.compression.level`` sets the level (default 3 for zstd, 6 for zlib).
+        Fletcher32 checksums cost a full pass over every chunk on write, so they
+        are only added when ``processing.netcdf.verify_checksums`` is set.
+        
+        Returns:
+            Encoding dictionary without per-variable chunk sizes
+        """
+        processing_config = self.user_config.get('processing', {})
+        compression_config = processing_config.get('compression', {})
+        codec = compression_config.get('codec', 'zstd')
+        
+        if codec == 'zstd' and not getattr(netCDF4, '__has_zstandard_support__', False):
+            logger.warning("⚠️ netCDF library has no Zstandard support, falling back to zlib")
+            codec = 'zlib'
+        
+        # Shuffle stays on for both codecs: HDF5 applies no byte shuffle of its own
+        if codec == 'zstd':
+            encoding = {'compression': 'zstd', 'complevel': compression_config.get('level', 3), 'shuffle': True}
+        else:
+            encoding = {'zlib': True, 'complevel': compression_config.get('level', 6), 'shuffle': True}
+        
+        if processing_config.get('netcdf', {}).get('verify_checksums', False):
+            encoding['fletcher32'] = True
+        
+        return encoding
+    
     def _get_optimal_chunks(self, data_array: xr.DataArray) -> tuple:
         """
         Calculate optimal chunk sizes for NetCDF storage.
@@ -526,16 +831,43 @@ class GRIBProcessor(DataProcessor):
         Returns:
             Optimal chunk sizes tuple
         """
-        # Simple chunking strategy: chunk time dimension, keep spatial intact
+        return self._chunks_for(
+            data_array.dims, data_array.shape, data_array.dtype.itemsize, self.TARGET_CHUNK_BYTES
+        )
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _chunks_for(dims: tuple, shape: tuple, itemsize: int, target_bytes: int) -> tuple:
+        """
+        Compute chunk sizes for a variable layout; memoized since most variables share one.
+        
+        Args:
+            dims: Dimension names
+            shape: Dimension sizes
+            itemsize: Bytes per element
+            target_bytes: Target chunk size in bytes
+            
+        Returns:
+            Chunk sizes tuple
+        """
+        # Keep the spatial plane intact and stack enough time steps per chunk to
+        # reach the target size; tiny chunks compress poorly and fragment reads
         chunks = []
-        for dim in data_array.dims:
-            if dim == 'time':
-                chunks.append(min(24, data_array.sizes[dim]))  # 24 hours max
-            elif dim in ['latitude', 'longitude']:
-                chunks.append(data_array.sizes[dim])  # Keep spatial intact
+        plane_bytes = itemsize
+        for dim, size in zip(dims, shape):
+            if dim in ['latitude', 'longitude']:
+                chunks.append(size)  # Keep spatial intact
+                plane_bytes *= size
+            elif dim == 'time':
+                chunks.append(None)  # Filled in once the plane size is known
             else:
                 chunks.append(1)  # Other dimensions
         
+        if 'time' in dims:
+            time_chunk = math.ceil(target_bytes / plane_bytes)
+            time_index = dims.index('time')
+            chunks[time_index] = max(1, min(time_chunk, shape[time_index]))
+        
         return tuple(chunks)
     
     def _get_processed_output_path(self, original_output_path: Path) -> Path:
@@ -571,6 +903,33 @@ class GRIBProcessor(DataProcessor):
         
         return Path(*parts)
 
+    def _standardize_dataset(self, dataset: xr.Dataset) -> xr.Dataset:
+        """
+        Filter variables and standardize variable and coordinate names in one pass.
+        
+        Equivalent to _standardize_coordinate_names, _filter_config_variables and
+        _standardize_variable_names applied in turn, but with a single selection
+        and a single rename instead of an intermediate dataset per step.
+        
+        Args:
+            dataset: Combined GRIB dataset
+            
+        Returns:
+            Dataset with configured variables under standard names
+        """
+        vars_to_keep = self._select_config_variables(dataset)
+        if vars_to_keep is not None:
+            dataset = dataset[vars_to_keep]
+        
+        renames = {
+            **self._get_coordinate_renames(dataset),
+            **self._get_variable_renames(dataset, dataset.data_vars),
+        }
+        if renames:
+            dataset = dataset.rename(renames)
+        
+        return self._order_dimensions(dataset)
+    
     def _standardize_coordinate_names(self, dataset: xr.Dataset) -> xr.Dataset:
         """
         Standardize coordinate names to ensure consistency across all models.
@@ -583,6 +942,22 @@ class GRIBProcessor(DataProcessor):
         Returns:
             Dataset with standardized coordinate names
         """
+        rename_dict = self._get_coordinate_renames(dataset)
+        if rename_dict:
+            dataset = dataset.rename(rename_dict)
+        
+        return self._order_dimensions(dataset)
+    
+    def _get_coordinate_renames(self, dataset: xr.Dataset) -> Dict[str, str]:
+        """
+        Map non-standard latitude/longitude coordinate names to standard ones.
+        
+        Args:
+            dataset: Input dataset
+            
+        Returns:
+            Rename mapping; empty when the names are already standard
+        """
         rename_dict = {}
         
         # Standardize latitude coordinate
@@ -599,28 +974,36 @@ class GRIBProcessor(DataProcessor):
         
         if rename_dict:
             logger.debug(f"🔄 Standardizing coordinate names: {rename_dict}")
-            dataset = dataset.rename(rename_dict)
         
+        return rename_dict
+    
+    def _order_dimensions(self, dataset: xr.Dataset) -> xr.Dataset:
+        """
+        Put time, latitude and longitude first (in that order) in every variable.
+        
+        Args:
+            dataset: Input dataset with standard coordinate names
+            
+        Returns:
+            Dataset with consistent dimension order
+        """
         # Ensure standard dimension order: time, latitude, longitude
         desired_order = ['time', 'latitude', 'longitude']
         available_dims = [dim for dim in desired_order if dim in dataset.dims]
         
-        # Transpose all data variables to have consistent dimension order
+        # Transpose data variables to have consistent dimension order, but only
+        # when some variable is out of order (the common case needs no rebuild)
         if len(available_dims) > 1:
-            data_vars = {}
-            for var_name, var in dataset.data_vars.items():
+            needs_transpose = False
+            for var in dataset.data_vars.values():
                 var_dims = [dim for dim in available_dims if dim in var.dims]
-                if var_dims and var_dims != list(var.dims[:len(var_dims)]):
-                    # Only transpose if order is different
-                    other_dims = [dim for dim in var.dims if dim not in var_dims]
-                    new_dims = var_dims + other_dims
-                    data_vars[var_name] = var.transpose(*new_dims)
-                else:
-                    data_vars[var_name] = var
-            
-            if data_vars:
+                if var_dims != list(var.dims[:len(var_dims)]):
+                    needs_transpose = True
+                    break
+            
+            if needs_transpose:
                 logger.debug(f"🔄 Reordering dimensions to: {available_dims}")
-                dataset = xr.Dataset(data_vars, coords=dataset.coords, attrs=dataset.attrs)
+                dataset = dataset.transpose(*available_dims, ...)
         
         return dataset
 
@@ -628,6 +1011,11 @@ class GRIBProcessor(DataProcessor):
         """
         Save dataset to NetCDF file.
         
+        The file is written to a temporary name next to the target and renamed
+        into place once complete, so readers never see a partial file. Pending
+        dask work (decoding, interpolation) is evaluated while writing, using
+        ``processing.workers`` threads when configured.
+        
         Args:
             dataset: Dataset to save
             output_path: Output file path
@@ -636,14 +1024,21 @@ class GRIBProcessor(DataProcessor):
         
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_name(f".{output_path.name}.tmp")
         
-        # Save with optimal settings
-        dataset.to_netcdf(
-            output_path,
-            format='NETCDF4',
-            unlimited_dims=['time'],
-            compute=True
-        )
+        try:
+            # Save with optimal settings
+            delayed_write = dataset.to_netcdf(
+                temp_path,
+                format='NETCDF4',
+                unlimited_dims=dataset.encoding.get('unlimited_dims', ['time']),
+                compute=False
+            )
+            dask.compute(delayed_write, scheduler='threads', num_workers=self._workers)
+            os.replace(temp_path, output_path)
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
         
         # Get file size
         file_size = output_path.stat().st_size / (1024 * 1024)  # MB
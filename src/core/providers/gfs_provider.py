@@ -5,11 +5,41 @@ This module provides the GFS-specific implementation of the WeatherModelProvider
 interface for downloading GFS 0.25 degree data from NOMADS.
 """
 
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from urllib.parse import urlencode
+from loguru import logger
 from ..interfaces.weather_model_provider import WeatherModelProvider
 
 
+# Query keys/values made only of these characters are left unchanged by urlencode
+_URL_SAFE_TOKEN = re.compile(r'[\w.~-]+', re.ASCII)
+
+
+def _encode_query(params: Dict[str, Any]) -> str:
+    """
+    URL-encode query parameters, skipping the escaping work for safe values.
+    
+    GFS keys and values (var_TMP=on, leftlon=-90.0, ...) need no escaping, so
+    they are joined directly; anything else goes through urlencode. The result
+    is identical to urlencode(params).
+    
+    Args:
+        params: Query parameters
+        
+    Returns:
+        Encoded query string
+    """
+    parts = []
+    for key, value in params.items():
+        value = str(value)
+        if _URL_SAFE_TOKEN.fullmatch(key) and _URL_SAFE_TOKEN.fullmatch(value):
+            parts.append(f"{key}={value}")
+        else:
+            parts.append(urlencode({key: value}))
+    return '&'.join(parts)
+
+
 class GFSProvider(WeatherModelProvider):
     """
     GFS 0.25 degree weather model provider.
@@ -18,6 +48,33 @@ class GFSProvider(WeatherModelProvider):
     dataset, which provides global weather forecasts at 0.25 degree resolution.
     """
     
+    # GFS variable codes and levels accepted in download requests
+    VALID_VARIABLES = frozenset({
+        'TMP', 'RH', 'UGRD', 'VGRD', 'HGT', 'PRES', 'TCDC', 'APCP',
+        'CAPE', 'CIN', 'LFTX', 'PWAT', 'VVEL', 'DZDT', 'ABSV'
+    })
+    VALID_LEVELS = frozenset({
+        'surface', '2_m_above_ground', '10_m_above_ground',
+        '1000_mb', '925_mb', '850_mb', '700_mb', '500_mb',
+        '250_mb', '200_mb', '100_mb', '50_mb'
+    })
+    
+    # Variable parameters requested when no variable mapper is available
+    DEFAULT_VAR_PARAMS = {
+        'var_TMP': 'on',  # Temperature
+        'var_RH': 'on',   # Relative humidity
+        'var_UGRD': 'on', # U-component of wind
+        'var_VGRD': 'on', # V-component of wind
+        'var_HGT': 'on',  # Geopotential height
+    }
+    
+    # Level parameters requested when no levels are given
+    DEFAULT_LEVEL_PARAMS = {
+        'lev_2_m_above_ground': 'on',
+        'lev_10_m_above_ground': 'on',
+        'lev_surface': 'on',
+    }
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None, variable_mapper=None):
         """
         Initialize GFS provider.
@@ -31,6 +88,13 @@ class GFSProvider(WeatherModelProvider):
         
         # Validate configuration
         self._validate_config()
+        
+        # Lookups used by validate_parameters for every URL, built once
+        self._cycle_set = frozenset(self.available_cycles)
+        self._valid_forecast_hours = self._build_valid_hours()
+        self._default_var_params = None
+        self._static_query = None
+        self._metadata = None
     
     @property
     def model_name(self) -> str:
@@ -85,6 +149,11 @@ class GFSProvider(WeatherModelProvider):
         # Build base URL
         base_url = self.config['base_url']
         
+        # Default variables and levels only depend on the config, so their
+        # encoded query is reused and only file/dir are formatted per call
+        if not (variables and self.variable_mapper) and not levels:
+            return f"{base_url}?{self._file_query(date, cycle, forecast_hour)}&{self._get_static_query()}"
+        
         # Prepare query parameters
         params = {
             'file': f'gfs.t{cycle}z.pgrb2.0p25.f{forecast_hour:03d}',
@@ -92,57 +161,29 @@ class GFSProvider(WeatherModelProvider):
         }
         
         # Add spatial bounds from config or use defaults
-        if 'spatial_bounds' in self.config:
-            bounds = self.config['spatial_bounds']
-            params.update({
-                'leftlon': bounds['lon_min'],
-                'rightlon': bounds['lon_max'],
-                'toplat': bounds['lat_max'],
-                'bottomlat': bounds['lat_min']
-            })
-        else:
-            # Default to global coverage if no bounds specified
-            params.update({
-                'leftlon': 0,
-                'rightlon': 360,
-                'toplat': 90,
-                'bottomlat': -90
-            })
+        params.update(self._get_spatial_params())
         
         # Handle variables
         if variables and self.variable_mapper:
             # Convert standard variable names to GFS codes
             gfs_variables = []
+            skipped = []
             for std_var in variables:
-                try:
-                    gfs_code = self.variable_mapper.get_model_variable_code(std_var, 'gfs')
+                gfs_code = self.variable_mapper.try_get_model_variable_code(std_var, 'gfs')
+                if gfs_code is None:
+                    skipped.append(std_var)
+                else:
                     gfs_variables.append(gfs_code)
-                except ValueError as e:
-                    print(f"Warning: {e}, skipping variable {std_var}")
-                    continue
+            
+            if skipped:
+                logger.warning("⚠️  Skipping variables with no GFS mapping: {}", skipped)
             
             # Add GFS variable parameters
             for gfs_var in gfs_variables:
                 params[f'var_{gfs_var}'] = 'on'
         else:
             # Use default variables from config
-            default_vars = self.config.get('variables', ['t2m', 'rh2m', 'u10m', 'v10m', 'hgt'])
-            if self.variable_mapper:
-                for std_var in default_vars:
-                    try:
-                        gfs_code = self.variable_mapper.get_model_variable_code(std_var, 'gfs')
-                        params[f'var_{gfs_code}'] = 'on'
-                    except ValueError:
-                        continue
-            else:
-                # Fallback to hardcoded variables
-                params.update({
-                    'var_TMP': 'on',  # Temperature
-                    'var_RH': 'on',   # Relative humidity
-                    'var_UGRD': 'on', # U-component of wind
-                    'var_VGRD': 'on', # V-component of wind
-                    'var_HGT': 'on',  # Geopotential height
-                })
+            params.update(self._get_default_var_params())
         
         # Handle levels
         if levels:
@@ -152,16 +193,36 @@ class GFSProvider(WeatherModelProvider):
                     params[f'lev_{level}'] = 'on'
         else:
             # Use default levels
-            params.update({
-                'lev_2_m_above_ground': 'on',
-                'lev_10_m_above_ground': 'on',
-                'lev_surface': 'on',
-            })
+            params.update(self.DEFAULT_LEVEL_PARAMS)
         
         # Build final URL
-        query_string = urlencode(params)
+        query_string = _encode_query(params)
         return f"{base_url}?{query_string}"
     
+    def get_download_urls(self, requests: Iterable[Tuple[str, str, int]]) -> Iterator[str]:
+        """
+        Generate download URLs for many forecast files with the default variables and levels.
+        
+        The query shared by every URL is built once. Each URL then only fills in
+        its file and directory, and matches get_download_url for the same request.
+        
+        Args:
+            requests: Iterable of (date, cycle, forecast_hour) tuples
+            
+        Yields:
+            Complete download URL for each request, in order
+            
+        Raises:
+            ValueError: If any request has invalid parameters
+        """
+        base_url = self.config['base_url']
+        static_query = self._get_static_query()
+        
+        for date, cycle, forecast_hour in requests:
+            if not self.validate_parameters(date, cycle, forecast_hour):
+                raise ValueError(f"Invalid parameters: date={date}, cycle={cycle}, forecast_hour={forecast_hour}")
+            yield f"{base_url}?{self._file_query(date, cycle, forecast_hour)}&{static_query}"
+    
     def validate_parameters(
         self, 
         date: str, 
@@ -184,7 +245,7 @@ class GFSProvider(WeatherModelProvider):
             return False
         
         # Validate cycle
-        if cycle not in self.available_cycles:
+        if cycle not in self._cycle_set:
             return False
         
         # Validate forecast hour
@@ -192,15 +253,9 @@ class GFSProvider(WeatherModelProvider):
             return False
         
         # Validate forecast hour frequency based on model configuration
-        if 'cycle_forecast_ranges' in self.config:
+        if self._valid_forecast_hours is not None:
             # Check if forecast hour is valid according to model's frequency rules
-            valid_forecast_hours = []
-            for cycle_ranges in self.config['cycle_forecast_ranges'].values():
-                for start, end, frequency in cycle_ranges:
-                    for hour in range(start, end + 1, frequency):
-                        valid_forecast_hours.append(hour)
-            
-            if forecast_hour not in valid_forecast_hours:
+            if forecast_hour not in self._valid_forecast_hours:
                 return False
         else:
             # Fallback: use old frequency-based validation
@@ -216,6 +271,14 @@ class GFSProvider(WeatherModelProvider):
         Returns:
             Dictionary containing GFS model metadata
         """
+        # Nothing here changes after construction, so build it once; callers
+        # get a copy so they cannot modify the cached metadata
+        if self._metadata is None:
+            self._metadata = self._build_metadata()
+        return dict(self._metadata)
+    
+    def _build_metadata(self) -> Dict[str, Any]:
+        """Build the GFS model metadata dictionary."""
         return {
             'model_name': self.model_name,
             'resolution': self.resolution,
@@ -249,19 +312,110 @@ class GFSProvider(WeatherModelProvider):
             if key not in self.config:
                 raise ValueError(f"Missing required configuration key: {key}")
     
+    def _get_spatial_params(self) -> Dict[str, Any]:
+        """
+        Get the spatial bound query parameters.
+        
+        Returns:
+            Bounds from the config, or global coverage if none are configured
+        """
+        if 'spatial_bounds' in self.config:
+            bounds = self.config['spatial_bounds']
+            return {
+                'leftlon': bounds['lon_min'],
+                'rightlon': bounds['lon_max'],
+                'toplat': bounds['lat_max'],
+                'bottomlat': bounds['lat_min']
+            }
+        
+        # Default to global coverage if no bounds specified
+        return {
+            'leftlon': 0,
+            'rightlon': 360,
+            'toplat': 90,
+            'bottomlat': -90
+        }
+    
+    @staticmethod
+    def _file_query(date: str, cycle: str, forecast_hour: int) -> str:
+        """
+        Format the encoded file and dir query parameters.
+        
+        Date and cycle are validated digits, so only the '/' separators in
+        dir need escaping.
+        
+        Args:
+            date: Date in YYYYMMDD format
+            cycle: Forecast cycle
+            forecast_hour: Forecast hour
+            
+        Returns:
+            Encoded query fragment selecting the forecast file
+        """
+        return (
+            f"file=gfs.t{cycle}z.pgrb2.0p25.f{forecast_hour:03d}"
+            f"&dir=%2Fgfs.{date}%2F{cycle}%2Fatmos"
+        )
+    
+    def _get_static_query(self) -> str:
+        """
+        Get the encoded bounds, default variables and default levels.
+        
+        Returns:
+            URL-encoded query fragment shared by every default download URL
+        """
+        if self._static_query is None:
+            params = self._get_spatial_params()
+            params.update(self._get_default_var_params())
+            params.update(self.DEFAULT_LEVEL_PARAMS)
+            self._static_query = _encode_query(params)
+        return self._static_query
+    
+    def _get_default_var_params(self) -> Dict[str, str]:
+        """
+        Resolve the configured default variables to GFS query parameters.
+        
+        The defaults do not change for the life of the provider, so the mapper
+        is only consulted on the first call.
+        
+        Returns:
+            Query parameters enabling each default variable
+        """
+        if not self.variable_mapper:
+            # Fallback to hardcoded variables
+            return self.DEFAULT_VAR_PARAMS
+        
+        if self._default_var_params is None:
+            default_vars = self.config.get('variables', ['t2m', 'rh2m', 'u10m', 'v10m', 'hgt'])
+            params = {}
+            for std_var in default_vars:
+                gfs_code = self.variable_mapper.try_get_model_variable_code(std_var, 'gfs')
+                if gfs_code is not None:
+                    params[f'var_{gfs_code}'] = 'on'
+            self._default_var_params = params
+        return self._default_var_params
+    
+    def _build_valid_hours(self) -> Optional[frozenset]:
+        """
+        Collect the forecast hours allowed by the configured cycle ranges.
+        
+        Returns:
+            Valid forecast hours across all cycles, or None if no ranges are configured
+        """
+        if 'cycle_forecast_ranges' not in self.config:
+            return None
+        
+        return frozenset(
+            hour
+            for cycle_ranges in self.config['cycle_forecast_ranges'].values()
+            for start, end, frequency in cycle_ranges
+            for hour in range(start, end + 1, frequency)
+        )
+    
     def _is_valid_variable(self, variable: str) -> bool:
         """Check if a variable is valid for GFS."""
-        valid_variables = [
-            'TMP', 'RH', 'UGRD', 'VGRD', 'HGT', 'PRES', 'TCDC', 'APCP',
-            'CAPE', 'CIN', 'LFTX', 'PWAT', 'VVEL', 'DZDT', 'ABSV'
-        ]
-        return variable in valid_variables
+        return variable in self.VALID_VARIABLES
     
     def _is_valid_level(self, level: str) -> bool:
         """Check if a level is valid for GFS."""
-        valid_levels = [
-            'surface', '2_m_above_ground', '10_m_above_ground',
-            '1000_mb', '925_mb', '850_mb', '700_mb', '500_mb',
-            '250_mb', '200_mb', '100_mb', '50_mb'
-        ]
-        return level in valid_levels
+        return level in self.VALID_LEVELS
@@ -5,15 +5,38 @@ This module provides the NetCDF-specific implementation of the DataSubsetter int
 allowing extraction of specific data subsets from NetCDF weather model datasets.
 """
 
+import os
+import netCDF4
 import xarray as xr
-from typing import Dict, List, Optional, Any, Union
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple, Union
 from pathlib import Path
 import numpy as np
+import pandas as pd
 
 from ..interfaces.data_subsetter import DataSubsetter
 from ..interfaces.variable_mapper import VariableMapper
 
 
+# Candidate dimension names, in priority order
+LON_DIMS = ('longitude', 'lon', 'x')
+LAT_DIMS = ('latitude', 'lat', 'y')
+LEVEL_DIMS = ('level', 'lev', 'pressure', 'height')
+TIME_DIMS = ('time', 't', 'forecast_time')
+
+# Keys every spatial bounds dictionary must provide
+REQUIRED_BOUNDS = ('lon_min', 'lon_max', 'lat_min', 'lat_max')
+
+
+class ResolvedDims(NamedTuple):
+    """Dimension names found in a dataset, or None when absent."""
+    lon: Optional[str]
+    lat: Optional[str]
+    level: Optional[str]
+    time: Optional[str]
+
+
 class NetCDFSubsetter(DataSubsetter):
     """
     NetCDF-specific implementation of the DataSubsetter interface.
@@ -22,6 +45,14 @@ class NetCDFSubsetter(DataSubsetter):
     and time ranges from NetCDF weather model datasets.
     """
     
+    # Dask chunks used by open(): one time step and up to 360x720 grid points
+    # per block, so subsetting only reads the blocks it selects
+    DEFAULT_OPEN_CHUNKS = {
+        **{dim: 1 for dim in TIME_DIMS},
+        **{dim: 360 for dim in LAT_DIMS},
+        **{dim: 720 for dim in LON_DIMS},
+    }
+    
     def __init__(self, variable_mapper: VariableMapper):
         """
         Initialize the NetCDF subsetter.
@@ -31,6 +62,123 @@ class NetCDFSubsetter(DataSubsetter):
         """
         self.variable_mapper = variable_mapper
     
+    @classmethod
+    def open(
+        cls,
+        paths: Union[str, Path, List[Union[str, Path]]],
+        chunks: Optional[Dict[str, int]] = None
+    ) -> xr.Dataset:
+        """
+        Open one or more NetCDF files as a lazy, dask-backed dataset.
+        
+        Subsetting operations on the returned dataset stay lazy; data is only
+        read from disk for the selected blocks when the result is loaded or
+        written.
+        
+        Args:
+            paths: NetCDF file path or list of paths
+            chunks: Dask chunk sizes per dimension (optional)
+            
+        Returns:
+            Dataset combined by coordinates from all files
+        """
+        return xr.open_mfdataset(
+            paths,
+            chunks=chunks or cls.DEFAULT_OPEN_CHUNKS,
+            parallel=True,
+            combine='by_coords'
+        )
+    
+    @staticmethod
+    def open_fast(path: Union[str, Path]) -> xr.Dataset:
+        """
+        Open a NetCDF file without CF decoding.
+        
+        Time decoding and mask/scale unpacking are skipped, which makes opening
+        files with long time axes much cheaper. subset_temporal converts its
+        time bounds to the raw axis units, so string bounds still work.
+        Resampling to a new frequency needs decoded times.
+        
+        Args:
+            path: NetCDF file path
+            
+        Returns:
+            Dataset with raw, undecoded values
+        """
+        return xr.open_dataset(path, decode_times=False, decode_cf=False, mask_and_scale=False)
+    
+    def subset_many(
+        self,
+        paths: List[Union[str, Path]],
+        out_dir: Union[str, Path],
+        max_workers: Optional[int] = None,
+        **subset_kwargs
+    ) -> List[Path]:
+        """
+        Subset several NetCDF files in parallel worker processes.
+        
+        Each file is opened, passed through subset_comprehensive and written to
+        out_dir under its original name. The variable mapper is sent to each
+        worker once, not with every file.
+        
+        Args:
+            paths: NetCDF files to subset
+            out_dir: Directory for the subset files
+            max_workers: Number of worker processes (default: one per CPU)
+            **subset_kwargs: Arguments for subset_comprehensive (variables, levels, bounds, time_range)
+            
+        Returns:
+            Paths of the written files, in input order
+            
+        Raises:
+            ValueError: If two inputs share a file name or an output would overwrite its input
+        """
+        out_dir = Path(out_dir)
+        jobs = [(Path(path), out_dir / Path(path).name) for path in paths]
+        
+        # Outputs are named after their inputs, so check before writing anything
+        seen = {}
+        for in_path, out_path in jobs:
+            if out_path.name in seen:
+                raise ValueError(
+                    f"Inputs {seen[out_path.name]} and {in_path} would both be written to {out_path}"
+                )
+            seen[out_path.name] = in_path
+            if out_path.resolve() == in_path.resolve():
+                raise ValueError(f"Output {out_path} would overwrite its input")
+        
+        out_dir.mkdir(parents=True, exist_ok=True)
+        
+        workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+        if workers <= 1:
+            return [self._subset_file(job, subset_kwargs) for job in jobs]
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_subset_worker,
+            initargs=(self.variable_mapper,)
+        ) as executor:
+            return list(executor.map(_subset_file_in_worker, jobs, repeat(subset_kwargs)))
+    
+    def _subset_file(self, job: Tuple[Path, Path], subset_kwargs: Dict[str, Any]) -> Path:
+        """
+        Subset one NetCDF file and write the result.
+        
+        Args:
+            job: Tuple of (input path, output path)
+            subset_kwargs: Arguments for subset_comprehensive
+            
+        Returns:
+            Path of the written file
+        """
+        in_path, out_path = job
+        with xr.open_dataset(in_path) as dataset:
+            # Source chunking/compression may not fit the subset, so re-encode
+            subset = self.subset_comprehensive(dataset, **subset_kwargs).drop_encoding()
+            encoding = {var: {'zlib': True, 'complevel': 1} for var in subset.data_vars}
+            subset.to_netcdf(out_path, encoding=encoding)
+        return out_path
+    
     def subset_variables(self, dataset: xr.Dataset, variables: List[str]) -> xr.Dataset:
         """
         Extract only the specified variables from the dataset.
@@ -48,43 +196,44 @@ class NetCDFSubsetter(DataSubsetter):
         if not variables:
             return dataset
         
-        subset_vars = {}
+        # Build the reverse lookup once so each requested variable is resolved
+        # with a dict access instead of a mapper call per dataset variable
+        std_to_var = {}
+        for var_name in dataset.data_vars:
+            std_var = self.variable_mapper.try_get_standard_variable_name(var_name, 'unknown')
+            if std_var is None:
+                # If mapping fails, fall back to a case-insensitive name match
+                std_var = str(var_name).lower()
+            std_to_var.setdefault(std_var, var_name)
+        
+        selected = []
+        rename_map = {}
         missing_vars = []
         
         for std_var in variables:
-            # Try to find the variable in the dataset
-            found = False
-            
             # First, try to find by standard name directly
             if std_var in dataset.data_vars:
-                subset_vars[std_var] = dataset[std_var]
-                found = True
+                selected.append(std_var)
                 continue
             
-            # If not found, try to map from model-specific codes
-            for var_name in dataset.data_vars:
-                try:
-                    # Try to map back to standard name
-                    mapped_std_var = self.variable_mapper.get_standard_variable_name(var_name, 'unknown')
-                    if mapped_std_var == std_var:
-                        # Rename to standard name
-                        subset_vars[std_var] = dataset[var_name].rename(std_var)
-                        found = True
-                        break
-                except ValueError:
-                    # If mapping fails, check if names are similar
-                    if var_name.lower() == std_var.lower():
-                        subset_vars[std_var] = dataset[var_name].rename(std_var)
-                        found = True
-                        break
-            
-            if not found:
+            var_name = std_to_var.get(std_var, std_to_var.get(std_var.lower()))
+            if var_name is None:
                 missing_vars.append(std_var)
+                continue
+            
+            selected.append(var_name)
+            rename_map[var_name] = std_var
         
         if missing_vars:
             raise ValueError(f"Variables not found in dataset: {missing_vars}")
         
-        return xr.Dataset(subset_vars)
+        # Select and rename in bulk; only variable names change, so no
+        # per-variable copies are made and dataset attrs are kept
+        subset_dataset = dataset[selected]
+        if rename_map:
+            subset_dataset = subset_dataset.rename_vars(rename_map)
+        
+        return subset_dataset
     
     def subset_levels(self, dataset: xr.Dataset, levels: List[str]) -> xr.Dataset:
         """
@@ -104,37 +253,54 @@ class NetCDFSubsetter(DataSubsetter):
             return dataset
         
         # Check if dataset has level dimension
-        level_dims = ['level', 'lev', 'pressure', 'height']
-        level_dim = None
-        
-        for dim in level_dims:
-            if dim in dataset.dims:
-                level_dim = dim
-                break
+        level_dim = self._resolve_dims(dataset).level
         
         if level_dim is None:
             # No level dimension found, return dataset as is
             return dataset
         
+        # Select only the specified levels
+        return dataset.isel({level_dim: self._level_indexer(dataset, level_dim, levels)})
+    
+    @staticmethod
+    def _level_indexer(dataset: xr.Dataset, level_dim: str, levels: List[str]) -> np.ndarray:
+        """
+        Find the positions of the requested levels along the level dimension.
+        
+        Args:
+            dataset: Input dataset
+            level_dim: Name of the level dimension
+            levels: List of level names to extract
+            
+        Returns:
+            Sorted positions of the matching levels
+            
+        Raises:
+            ValueError: If any level is not found in the dataset
+        """
         # Find level values that match the requested levels
         level_values = dataset[level_dim].values
-        level_indices = []
-        
-        for level in levels:
-            # Try exact match first
-            if level in level_values:
-                level_indices.append(np.where(level_values == level)[0][0])
-            else:
-                # Try partial match (e.g., "2_m_above_ground" vs "2")
-                for i, val in enumerate(level_values):
-                    if str(level) in str(val) or str(val) in str(level):
-                        level_indices.append(i)
-                        break
-                else:
-                    raise ValueError(f"Level {level} not found in dataset")
-        
-        # Select only the specified levels
-        return dataset.isel({level_dim: level_indices})
+        requested = np.asarray(levels)
+        
+        # Try exact match first
+        level_mask = np.isin(level_values, requested)
+        missing = requested[~np.isin(requested, level_values)]
+        
+        if missing.size:
+            # Try partial match (e.g., "2_m_above_ground" vs "2"), keeping the
+            # first matching level for each requested name
+            values_str = level_values.astype(str)[:, None]
+            missing_str = missing.astype(str)[None, :]
+            partial = (
+                (np.char.find(values_str, missing_str) >= 0) |
+                (np.char.find(missing_str, values_str) >= 0)
+            )
+            unmatched = ~partial.any(axis=0)
+            if unmatched.any():
+                raise ValueError(f"Level {missing[unmatched][0]} not found in dataset")
+            level_mask[partial.argmax(axis=0)] = True
+        
+        return np.flatnonzero(level_mask)
     
     def subset_spatial(self, dataset: xr.Dataset, bounds: Dict[str, float]) -> xr.Dataset:
         """
@@ -150,37 +316,84 @@ class NetCDFSubsetter(DataSubsetter):
         if not bounds:
             return dataset
         
-        required_bounds = ['lon_min', 'lon_max', 'lat_min', 'lat_max']
-        if not all(bound in bounds for bound in required_bounds):
-            raise ValueError(f"Missing required bounds: {required_bounds}")
+        return dataset.isel(self._spatial_indexers(dataset, self._resolve_dims(dataset), bounds))
+    
+    def _spatial_indexers(
+        self,
+        dataset: xr.Dataset,
+        dims: ResolvedDims,
+        bounds: Dict[str, float]
+    ) -> Dict[str, slice]:
+        """
+        Convert spatial bounds into positional slices.
+        
+        Args:
+            dataset: Input dataset
+            dims: Resolved dimension names of the dataset
+            bounds: Dictionary with spatial bounds (lon_min, lon_max, lat_min, lat_max)
+            
+        Returns:
+            Positional slices keyed by the longitude and latitude dimensions
+            
+        Raises:
+            ValueError: If bounds are missing or the dataset has no lon/lat dimensions
+        """
+        if not all(bound in bounds for bound in REQUIRED_BOUNDS):
+            raise ValueError(f"Missing required bounds: {list(REQUIRED_BOUNDS)}")
         
         # Find coordinate dimensions
-        lon_dims = ['longitude', 'lon', 'x']
-        lat_dims = ['latitude', 'lat', 'y']
+        lon_dim, lat_dim = dims.lon, dims.lat
         
-        lon_dim = None
-        lat_dim = None
+        if lon_dim is None or lat_dim is None:
+            raise ValueError("Could not find longitude/latitude dimensions")
         
-        for dim in lon_dims:
-            if dim in dataset.dims:
-                lon_dim = dim
-                break
+        # Flip the bounds on descending axes (e.g. GFS latitude runs 90 to -90)
+        # so the slice is not empty
+        lon_min, lon_max = bounds['lon_min'], bounds['lon_max']
+        lat_min, lat_max = bounds['lat_min'], bounds['lat_max']
+        if not self._axis_ascending(dataset, lon_dim):
+            lon_min, lon_max = lon_max, lon_min
+        if not self._axis_ascending(dataset, lat_dim):
+            lat_min, lat_max = lat_max, lat_min
+        
+        return {
+            lon_dim: dataset.indexes[lon_dim].slice_indexer(lon_min, lon_max),
+            lat_dim: dataset.indexes[lat_dim].slice_indexer(lat_min, lat_max)
+        }
+    
+    @staticmethod
+    def _resolve_dims(dataset: xr.Dataset) -> ResolvedDims:
+        """
+        Resolve the longitude, latitude, level and time dimension names.
         
-        for dim in lat_dims:
-            if dim in dataset.dims:
-                lat_dim = dim
-                break
+        Args:
+            dataset: Input dataset
+            
+        Returns:
+            ResolvedDims with the first matching candidate name per axis
+        """
+        dims = set(dataset.dims)
         
-        if lon_dim is None or lat_dim is None:
-            raise ValueError("Could not find longitude/latitude dimensions")
+        def first(candidates):
+            return next((dim for dim in candidates if dim in dims), None)
         
-        # Apply spatial subsetting
-        subset_dataset = dataset.sel({
-            lon_dim: slice(bounds['lon_min'], bounds['lon_max']),
-            lat_dim: slice(bounds['lat_min'], bounds['lat_max'])
-        })
+        return ResolvedDims(first(LON_DIMS), first(LAT_DIMS), first(LEVEL_DIMS), first(TIME_DIMS))
+    
+    @staticmethod
+    def _axis_ascending(dataset: xr.Dataset, dim: str) -> bool:
+        """
+        Check whether a coordinate axis is sorted in ascending order.
         
-        return subset_dataset
+        Args:
+            dataset: Input dataset
+            dim: Name of the indexed dimension
+            
+        Returns:
+            False if the axis is strictly descending, True otherwise
+        """
+        # pandas caches monotonicity on the index, so repeated calls are free
+        index = dataset.indexes[dim]
+        return not (len(index) > 1 and index.is_monotonic_decreasing)
     
     def subset_temporal(self, dataset: xr.Dataset, time_range: Dict[str, Any]) -> xr.Dataset:
         """
@@ -197,13 +410,7 @@ class NetCDFSubsetter(DataSubsetter):
             return dataset
         
         # Find time dimension
-        time_dims = ['time', 't', 'forecast_time']
-        time_dim = None
-        
-        for dim in time_dims:
-            if dim in dataset.dims:
-                time_dim = dim
-                break
+        time_dim = self._resolve_dims(dataset).time
         
         if time_dim is None:
             # No time dimension found, return dataset as is
@@ -211,36 +418,143 @@ class NetCDFSubsetter(DataSubsetter):
         
         subset_dataset = dataset
         
-        # Apply start time filter
-        if 'start_time' in time_range:
-            subset_dataset = subset_dataset.sel({
-                time_dim: slice(time_range['start_time'], None)
-            })
-        
-        # Apply end time filter
-        if 'end_time' in time_range:
+        # Apply start and end time filters in a single selection
+        start_time, end_time = self._time_bounds(dataset, time_dim, time_range)
+        if start_time is not None or end_time is not None:
             subset_dataset = subset_dataset.sel({
-                time_dim: slice(None, time_range['end_time'])
+                time_dim: slice(start_time, end_time)
             })
         
-        # Apply frequency filter (resample)
-        if 'frequency' in time_range:
-            subset_dataset = subset_dataset.resample({
-                time_dim: time_range['frequency']
-            }).mean()
+        # Apply frequency filter (resample), unless already at that frequency
+        frequency = time_range.get('frequency')
+        if frequency and not self._has_time_step(subset_dataset, time_dim, frequency):
+            subset_dataset = self._resample_mean(subset_dataset, time_dim, frequency)
         
         return subset_dataset
     
+    @staticmethod
+    def _time_bounds(dataset: xr.Dataset, time_dim: str, time_range: Dict[str, Any]) -> Tuple[Any, Any]:
+        """
+        Get the start and end time bounds in the units of the time axis.
+        
+        Args:
+            dataset: Input dataset
+            time_dim: Name of the time dimension
+            time_range: Dictionary with temporal bounds (start_time, end_time, frequency)
+            
+        Returns:
+            Tuple of (start, end), None where a bound is not given
+        """
+        bounds = (time_range.get('start_time'), time_range.get('end_time'))
+        
+        # Undecoded axes (see open_fast) hold offsets such as "hours since ..."
+        time_coord = dataset[time_dim]
+        if not np.issubdtype(time_coord.dtype, np.number) or 'units' not in time_coord.attrs:
+            return bounds
+        
+        calendar = time_coord.attrs.get('calendar', 'standard')
+        return tuple(
+            None if bound is None else
+            netCDF4.date2num(pd.Timestamp(bound).to_pydatetime(), time_coord.attrs['units'], calendar)
+            for bound in bounds
+        )
+    
+    @staticmethod
+    def _resample_mean(dataset: xr.Dataset, time_dim: str, frequency: str) -> xr.Dataset:
+        """
+        Average a dataset over time bins of the given frequency.
+        
+        Args:
+            dataset: Input dataset
+            time_dim: Name of the time dimension
+            frequency: Pandas frequency string (e.g. '3h')
+            
+        Returns:
+            Resampled dataset
+        """
+        factor = NetCDFSubsetter._coarsen_factor(dataset, time_dim, frequency)
+        if factor:
+            # Same bins as resample without rebuilding a DatetimeIndex; bins are
+            # labelled by their first time step like resample does
+            resampled = dataset.coarsen({time_dim: factor}, coord_func='min').mean()
+        else:
+            resampled = dataset.resample({time_dim: frequency}).mean()
+        
+        # Resampling a dask array leaves one tiny task per output step
+        if resampled.chunks:
+            resampled = resampled.chunk({time_dim: -1})
+        
+        return resampled
+    
+    @staticmethod
+    def _coarsen_factor(dataset: xr.Dataset, time_dim: str, frequency: str) -> Optional[int]:
+        """
+        Get the number of time steps per bin when coarsen can replace resample.
+        
+        This requires a fixed-length frequency (anchored ones such as 'W' or
+        'MS' have calendar bin edges) and a regular time axis whose step
+        divides it, starting on a bin boundary and filling whole bins.
+        
+        Args:
+            dataset: Input dataset
+            time_dim: Name of the time dimension
+            frequency: Pandas frequency string (e.g. '3h')
+            
+        Returns:
+            Time steps per bin, or None if resample is needed
+        """
+        times = dataset[time_dim].values
+        if times.size < 2 or not np.issubdtype(times.dtype, np.datetime64):
+            return None
+        
+        try:
+            offset = pd.tseries.frequencies.to_offset(frequency)
+        except ValueError:
+            return None
+        if not isinstance(offset, pd.tseries.offsets.Tick):
+            return None
+        step = pd.Timedelta(offset).to_timedelta64()
+        
+        native = times[1] - times[0]
+        if native <= np.timedelta64(0) or step % native or not np.all(np.diff(times) == native):
+            return None
+        
+        # resample bins start at midnight of the first day
+        factor = int(step // native)
+        if (times[0] - times[0].astype('datetime64[D]')) % step or times.size % factor:
+            return None
+        
+        return factor
+    
+    @staticmethod
+    def _has_time_step(dataset: xr.Dataset, time_dim: str, frequency: str) -> bool:
+        """
+        Check whether a time axis is already regular at the given frequency.
+        
+        The axis must also sit on the resample bin edges; otherwise resampling
+        would still relabel it (e.g. 01,04,07 with '3h' becomes 00,03,06).
+        
+        Args:
+            dataset: Input dataset
+            time_dim: Name of the time dimension
+            frequency: Pandas frequency string (e.g. '3h')
+            
+        Returns:
+            True if every step equals the frequency and the axis is bin-aligned
+        """
+        return NetCDFSubsetter._coarsen_factor(dataset, time_dim, frequency) == 1
+    
     def subset_comprehensive(
         self, 
         dataset: xr.Dataset, 
         variables: Optional[List[str]] = None,
         levels: Optional[List[str]] = None,
         bounds: Optional[Dict[str, float]] = None,
-        time_range: Optional[Dict[str, Any]] = None
+        time_range: Optional[Dict[str, Any]] = None,
+        materialize: bool = False
     ) -> xr.Dataset:
         """
-        Apply multiple subsetting operations in sequence.
+        Apply multiple subsetting operations.
         
         Args:
             dataset: Input dataset
@@ -248,24 +562,71 @@ class NetCDFSubsetter(DataSubsetter):
             levels: List of levels to extract (optional)
             bounds: Spatial bounds (optional)
             time_range: Temporal bounds (optional)
+            materialize: Load dask-backed results into memory (default: False)
+            
+        Returns:
+            Dataset with all subsetting operations applied
+        """
+        return self.subset_comprehensive_fused(dataset, variables, levels, bounds, time_range, materialize)
+    
+    def subset_comprehensive_fused(
+        self, 
+        dataset: xr.Dataset, 
+        variables: Optional[List[str]] = None,
+        levels: Optional[List[str]] = None,
+        bounds: Optional[Dict[str, float]] = None,
+        time_range: Optional[Dict[str, Any]] = None,
+        materialize: bool = False
+    ) -> xr.Dataset:
+        """
+        Apply level, spatial and temporal subsetting with a single indexing call.
+        
+        The level, lon/lat and time selections are converted to positional
+        indexers and applied together, so no intermediate dataset is built
+        per operation. Resampling to a new frequency is applied afterwards.
+        Dask-backed datasets stay lazy unless materialize is set.
+        
+        Args:
+            dataset: Input dataset
+            variables: List of variables to extract (optional)
+            levels: List of levels to extract (optional)
+            bounds: Spatial bounds (optional)
+            time_range: Temporal bounds (optional)
+            materialize: Load dask-backed results into memory (default: False)
             
         Returns:
             Dataset with all subsetting operations applied
         """
         subset_dataset = dataset
         
-        # Apply subsetting operations in order
         if variables:
             subset_dataset = self.subset_variables(subset_dataset, variables)
         
-        if levels:
-            subset_dataset = self.subset_levels(subset_dataset, levels)
+        # Resolve dimensions after variable selection, which may drop some
+        dims = self._resolve_dims(subset_dataset)
+        indexers = {}
+        
+        if levels and dims.level is not None:
+            indexers[dims.level] = self._level_indexer(subset_dataset, dims.level, levels)
         
         if bounds:
-            subset_dataset = self.subset_spatial(subset_dataset, bounds)
+            indexers.update(self._spatial_indexers(subset_dataset, dims, bounds))
         
-        if time_range:
-            subset_dataset = self.subset_temporal(subset_dataset, time_range)
+        frequency = None
+        if time_range and dims.time is not None:
+            start_time, end_time = self._time_bounds(subset_dataset, dims.time, time_range)
+            if start_time is not None or end_time is not None:
+                indexers[dims.time] = subset_dataset.indexes[dims.time].slice_indexer(start_time, end_time)
+            frequency = time_range.get('frequency')
+        
+        if indexers:
+            subset_dataset = subset_dataset.isel(indexers)
+        
+        if frequency and not self._has_time_step(subset_dataset, dims.time, frequency):
+            subset_dataset = self._resample_mean(subset_dataset, dims.time, frequency)
+        
+        if materialize:
+            subset_dataset = subset_dataset.load()
         
         return subset_dataset
     
@@ -279,33 +640,16 @@ class NetCDFSubsetter(DataSubsetter):
         Returns:
             Dictionary containing subsetting capabilities and current state
         """
-        info = {
+        dims = self._resolve_dims(dataset)
+        
+        return {
             'dimensions': dict(dataset.dims),
             'variables': list(dataset.data_vars.keys()),
             'coordinates': list(dataset.coords.keys()),
-            'spatial_subsetting': False,
-            'temporal_subsetting': False,
-            'level_subsetting': False
+            'spatial_subsetting': dims.lon is not None and dims.lat is not None,
+            'temporal_subsetting': dims.time is not None,
+            'level_subsetting': dims.level is not None
         }
-        
-        # Check spatial subsetting capability
-        lon_dims = ['longitude', 'lon', 'x']
-        lat_dims = ['latitude', 'lat', 'y']
-        
-        if any(dim in dataset.dims for dim in lon_dims) and any(dim in dataset.dims for dim in lat_dims):
-            info['spatial_subsetting'] = True
-        
-        # Check temporal subsetting capability
-        time_dims = ['time', 't', 'forecast_time']
-        if any(dim in dataset.dims for dim in time_dims):
-            info['temporal_subsetting'] = True
-        
-        # Check level subsetting capability
-        level_dims = ['level', 'lev', 'pressure', 'height']
-        if any(dim in dataset.dims for dim in level_dims):
-            info['level_subsetting'] = True
-        
-        return info
     
     def validate_subsetting_parameters(
         self, 
@@ -332,31 +676,32 @@ class NetCDFSubsetter(DataSubsetter):
         if variables:
             if not isinstance(variables, list):
                 errors.append("Variables must be a list")
-            else:
-                for var in variables:
-                    if not isinstance(var, str):
-                        errors.append(f"Variable {var} must be a string")
+            elif not all(isinstance(var, str) for var in variables):
+                invalid = [var for var in variables if not isinstance(var, str)]
+                errors.append(f"Variables must be strings: {invalid}")
         
         # Validate levels
         if levels:
             if not isinstance(levels, list):
                 errors.append("Levels must be a list")
-            else:
-                for level in levels:
-                    if not isinstance(level, str):
-                        errors.append(f"Level {level} must be a string")
+            elif not all(isinstance(level, str) for level in levels):
+                invalid = [level for level in levels if not isinstance(level, str)]
+                errors.append(f"Levels must be strings: {invalid}")
         
         # Validate bounds
         if bounds:
             if not isinstance(bounds, dict):
                 errors.append("Bounds must be a dictionary")
             else:
-                required_bounds = ['lon_min', 'lon_max', 'lat_min', 'lat_max']
-                for bound in required_bounds:
-                    if bound not in bounds:
-                        errors.append(f"Missing required bound: {bound}")
-                    elif not isinstance(bounds[bound], (int, float)):
-                        errors.append(f"Bound {bound} must be a number")
+                missing = [bound for bound in REQUIRED_BOUNDS if bound not in bounds]
+                if missing:
+                    errors.append(f"Missing required bounds: {missing}")
+                if not all(isinstance(bounds.get(bound, 0), (int, float)) for bound in REQUIRED_BOUNDS):
+                    invalid = [
+                        bound for bound in REQUIRED_BOUNDS
+                        if bound in bounds and not isinstance(bounds[bound], (int, float))
+                    ]
+                    errors.append(f"Bounds must be numbers: {invalid}")
         
         # Validate time range
         if time_range:
@@ -371,3 +716,18 @@ class NetCDFSubsetter(DataSubsetter):
                     errors.append("frequency must be a string")
         
         return len(errors) == 0, errors
+
+
+# Subsetter of the current worker process, built once by _init_subset_worker
+_worker_subsetter: Optional[NetCDFSubsetter] = None
+
+
+def _init_subset_worker(variable_mapper: VariableMapper) -> None:
+    """Create the subsetter used by a subset_many worker process."""
+    global _worker_subsetter
+    _worker_subsetter = NetCDFSubsetter(variable_mapper)
+
+
+def _subset_file_in_worker(job: Tuple[Path, Path], subset_kwargs: Dict[str, Any]) -> Path:
+    """Subset one file with the worker process subsetter."""
+    return _worker_subsetter._subset_file(job, subset_kwargs)
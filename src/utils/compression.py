@@ -5,25 +5,117 @@ This module provides utilities for NetCDF compression and optimization
 to reduce storage requirements and improve performance.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
+import functools
+import logging
+import threading
+import dask
+import netCDF4
+import numpy as np
 import xarray as xr
+from dask.delayed import Delayed
 from pathlib import Path
 
+# Goes through the handlers LoggingManager installs (file writes run on its
+# queue listener) without building a manager on import
+logger = logging.getLogger('weather_downloader')
+
 
 class CompressionManager:
     """Utilities for NetCDF compression and optimization."""
     
+    # Blosc shuffle mode that shuffles bits rather than bytes
+    BLOSC_BITSHUFFLE = 2
+    
+    # Smallest chunk 'auto' chunking aims for; smaller chunks starve the
+    # compressor and multiply per-chunk I/O
+    TARGET_CHUNK_BYTES = 20 * 1024 ** 2  # 20 MiB
+    
+    # Chunk sizes of the fixed strategies as (time, other dimensions)
+    CHUNKING_STRATEGIES = {
+        'time': (1, None),      # One whole field per time step
+        'space': (None, 100),   # Spatial tiles over the whole time axis
+        'balanced': (10, 200),
+    }
+    
+    # Held while a file is written. netCDF-C is not thread-safe, and xarray's
+    # read and write locks can be taken in opposite orders on different
+    # threads, so files are written one at a time, each on a single thread.
+    _WRITE_LOCK = threading.Lock()
+    
+    # Decimal digits worth keeping per variable (GRIB and standard names); the
+    # rest is quantized away so the compressor sees long runs of equal bits.
+    # Variables not listed here are stored losslessly.
+    LEAST_SIGNIFICANT_DIGITS = {
+        't2m': 2, 't': 2,           # Temperature (K)
+        'r2': 1, 'rh2m': 1,         # Relative humidity (%)
+        'u10': 1, 'u10m': 1,        # U wind component (m/s)
+        'v10': 1, 'v10m': 1,        # V wind component (m/s)
+        'orog': 0, 'hgt': 0,        # Height (m)
+    }
+    
+    @staticmethod
+    def least_significant_digit_for_tolerance(tolerance: float) -> int:
+        """
+        Get the coarsest least_significant_digit that keeps an absolute error bound.
+        
+        netCDF4 rounds to a power-of-two step no larger than 10**-digit, so the
+        error is at most half of 10**-digit.
+        
+        Args:
+            tolerance: Maximum absolute error allowed
+            
+        Returns:
+            Least significant digit to quantize to
+            
+        Raises:
+            ValueError: If the tolerance is not positive
+        """
+        if tolerance <= 0:
+            raise ValueError("Tolerance must be positive")
+        
+        return int(np.ceil(np.log10(0.5 / tolerance)))
+    
+    @staticmethod
+    def least_significant_digits_for_tolerances(tolerances: Dict[str, float]) -> Dict[str, int]:
+        """
+        Convert per-variable absolute tolerances into a ``per_var_lsd`` table.
+        
+        Args:
+            tolerances: Absolute tolerance per variable
+            
+        Returns:
+            Dictionary mapping variable names to their least significant digit
+        """
+        return {
+            var_name: CompressionManager.least_significant_digit_for_tolerance(tolerance)
+            for var_name, tolerance in tolerances.items()
+        }
+    
     @staticmethod
     def get_compression_encoding(
         compression_level: int = 6,
-        chunking: str = "auto"
+        codec: str = "blosc_zstd",
+        least_significant_digit: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Get compression encoding configuration for NetCDF files.
         
+        Blosc codecs ('blosc_lz4', 'blosc_zstd', ...) use SIMD bit-shuffling and
+        are much faster than zlib on float fields. They need the netCDF library's
+        Blosc filter; without it, zlib with byte shuffling is used instead.
+        
+        ``least_significant_digit`` quantizes float data to that many decimal
+        digits before compression. The zeroed mantissa bits compress far better
+        and faster than noise, but the right digit depends on the variable; see
+        LEAST_SIGNIFICANT_DIGITS and get_dataset_encoding.
+        
+        Chunk sizes depend on each variable's shape; see get_chunk_sizes.
+        
         Args:
             compression_level: Compression level (0-9, where 9 is maximum)
-            chunking: Chunking strategy ('auto', 'time', 'space', 'balanced')
+            codec: Compression codec ('zlib' or a netCDF4 Blosc codec name)
+            least_significant_digit: Decimal digits kept in float data (None for lossless)
             
         Returns:
             Dictionary with compression encoding configuration
@@ -31,57 +123,170 @@ class CompressionManager:
         if not 0 <= compression_level <= 9:
             raise ValueError("Compression level must be between 0 and 9")
         
-        # Base encoding with zlib compression
-        encoding = {
-            'zlib': True,
-            'complevel': compression_level,
-            'shuffle': True,  # Better compression for floating point data
-        }
+        # Fresh dict per call so callers may modify it
+        return dict(CompressionManager._encoding_items(
+            compression_level,
+            codec,
+            least_significant_digit,
+            getattr(netCDF4, '__has_blosc_support__', False)
+        ))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _encoding_items(
+        compression_level: int,
+        codec: str,
+        least_significant_digit: Optional[int],
+        blosc_supported: bool
+    ) -> Tuple[Tuple[str, Any], ...]:
+        """Build the encoding of get_compression_encoding as cached, immutable items."""
+        if codec.startswith('blosc') and blosc_supported:
+            encoding = {
+                'compression': codec,
+                'complevel': compression_level,
+                'blosc_shuffle': CompressionManager.BLOSC_BITSHUFFLE,
+            }
+        else:
+            # Base encoding with zlib compression
+            encoding = {
+                'zlib': True,
+                'complevel': compression_level,
+                'shuffle': True,  # Better compression for floating point data
+            }
+        
+        if least_significant_digit is not None:
+            encoding['least_significant_digit'] = least_significant_digit
+        
+        return tuple(encoding.items())
+    
+    @staticmethod
+    def get_chunk_sizes(
+        variable: xr.DataArray,
+        chunking: Optional[str] = "auto"
+    ) -> Optional[Tuple[int, ...]]:
+        """
+        Get the on-disk chunk sizes of a variable for a chunking strategy.
+        
+        'auto' writes time slabs: whole fields along every other dimension, with
+        enough time steps per chunk to reach TARGET_CHUNK_BYTES.
+        
+        Args:
+            variable: Variable to chunk
+            chunking: Chunking strategy ('auto', 'time', 'space', 'balanced' or None)
+            
+        Returns:
+            Chunk size per dimension, or None to leave chunking to the library
+            
+        Raises:
+            ValueError: If the chunking strategy is unknown
+        """
+        if chunking is None or variable.ndim == 0:
+            return None
         
-        # Add chunking strategy
         if chunking == "auto":
-            encoding['chunksizes'] = 'auto'
-        elif chunking == "time":
-            encoding['chunksizes'] = (1, -1, -1)  # Time dimension chunked
-        elif chunking == "space":
-            encoding['chunksizes'] = (-1, 100, 100)  # Spatial dimensions chunked
-        elif chunking == "balanced":
-            encoding['chunksizes'] = (10, 200, 200)  # Balanced approach
+            if 'time' not in variable.dims:
+                return None
+            slab_bytes = variable.dtype.itemsize * variable.size // variable.sizes['time']
+            time_chunk = -(-CompressionManager.TARGET_CHUNK_BYTES // max(slab_bytes, 1))
+            other_chunk = None
+        elif chunking in CompressionManager.CHUNKING_STRATEGIES:
+            time_chunk, other_chunk = CompressionManager.CHUNKING_STRATEGIES[chunking]
+        else:
+            raise ValueError(f"Unknown chunking strategy: {chunking}")
         
-        return encoding
+        return tuple(
+            min(size, chunk) if chunk else size
+            for dim, size in variable.sizes.items()
+            for chunk in [time_chunk if dim == 'time' else other_chunk]
+        )
     
     @staticmethod
-    def optimize_dataset_for_storage(
+    def get_dataset_encoding(
         dataset: xr.Dataset,
         compression_level: int = 6,
-        chunking: str = "auto"
-    ) -> xr.Dataset:
+        chunking: Optional[str] = "auto",
+        codec: str = "blosc_zstd",
+        least_significant_digit: Optional[int] = None,
+        per_var_lsd: Optional[Dict[str, Optional[int]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
         """
-        Optimize a dataset for storage and memory usage.
+        Get the per-variable encoding to pass to ``to_netcdf(encoding=...)``.
+        
+        Float variables are quantized with the digit ``per_var_lsd`` gives them;
+        variables it does not list fall back to ``least_significant_digit``,
+        which keeps them lossless by default.
         
         Args:
             dataset: Input dataset
             compression_level: Compression level (0-9)
             chunking: Chunking strategy
+            codec: Compression codec
+            least_significant_digit: Decimal digits kept in float variables missing
+                from per_var_lsd (None for lossless)
+            per_var_lsd: Decimal digits per variable (default: LEAST_SIGNIFICANT_DIGITS;
+                {} quantizes nothing, a None value keeps that variable lossless)
             
         Returns:
-            Optimized dataset
+            Dictionary mapping variable names to their encoding
         """
-        # Get compression encoding
         encoding = CompressionManager.get_compression_encoding(
-            compression_level, chunking
+            compression_level, codec, least_significant_digit=None
         )
+        if per_var_lsd is None:
+            per_var_lsd = CompressionManager.LEAST_SIGNIFICANT_DIGITS
         
-        # Apply encoding to all variables
-        for var_name in dataset.data_vars:
-            var = dataset[var_name]
-            
+        dataset_encoding = {}
+        for var_name, var in dataset.data_vars.items():
             # Skip variables that are already encoded
             if 'encoding' in var.attrs:
                 continue
             
-            # Apply compression encoding
-            var.encoding.update(encoding)
+            var_encoding = dict(encoding)
+            lsd = per_var_lsd.get(var_name, least_significant_digit)
+            
+            # Quantization only applies to floating point data
+            if lsd is not None and np.issubdtype(var.dtype, np.floating):
+                var_encoding['least_significant_digit'] = lsd
+            
+            chunksizes = CompressionManager.get_chunk_sizes(var, chunking)
+            if chunksizes is not None:
+                var_encoding['chunksizes'] = chunksizes
+            
+            dataset_encoding[var_name] = var_encoding
+        
+        return dataset_encoding
+    
+    @staticmethod
+    def optimize_dataset_for_storage(
+        dataset: xr.Dataset,
+        compression_level: int = 6,
+        chunking: Optional[str] = "auto",
+        codec: str = "blosc_zstd",
+        least_significant_digit: Optional[int] = None,
+        per_var_lsd: Optional[Dict[str, Optional[int]]] = None
+    ) -> xr.Dataset:
+        """
+        Optimize a dataset for storage and memory usage.
+        
+        Args:
+            dataset: Input dataset
+            compression_level: Compression level (0-9)
+            chunking: Chunking strategy
+            codec: Compression codec
+            least_significant_digit: Decimal digits kept in float variables missing
+                from per_var_lsd (None for lossless)
+            per_var_lsd: Decimal digits per variable (default: LEAST_SIGNIFICANT_DIGITS)
+            
+        Returns:
+            Optimized dataset
+        """
+        encoding = CompressionManager.get_dataset_encoding(
+            dataset, compression_level, chunking, codec, least_significant_digit, per_var_lsd
+        )
+        
+        # Apply compression encoding
+        for var_name, var_encoding in encoding.items():
+            dataset[var_name].encoding.update(var_encoding)
         
         return dataset
     
@@ -123,76 +328,159 @@ class CompressionManager:
         target_chunk_size_bytes = target_chunk_size_mb * 1024 * 1024
         
         # Get dataset dimensions
-        dims = dataset.dims
+        dims = dataset.sizes
+        if not dims:
+            return {}
         
-        # Calculate total elements
-        total_elements = 1
-        for dim_size in dims.values():
-            total_elements *= dim_size
+        sizes = np.fromiter(dims.values(), dtype=np.int64, count=len(dims))
         
         # Calculate elements per chunk
         elements_per_chunk = target_chunk_size_bytes / 8  # Assuming 8 bytes per element
         
-        # Distribute chunks across dimensions
-        chunk_sizes = {}
-        remaining_elements = elements_per_chunk
+        # Give every dimension the same share of the budget, capped at its size
+        per_dim = max(1, int(elements_per_chunk ** (1.0 / len(sizes))))
+        chunks = np.minimum(sizes, per_dim)
         
-        for dim_name, dim_size in dims.items():
-            if remaining_elements <= 1:
-                chunk_sizes[dim_name] = 1
-            else:
-                # Calculate chunk size for this dimension
-                chunk_size = max(1, int(remaining_elements ** (1 / (len(dims) - len(chunk_sizes)))))
-                chunk_size = min(chunk_size, dim_size)
-                chunk_sizes[dim_name] = chunk_size
-                remaining_elements /= chunk_size
+        # Hand the budget left by capped dimensions to the others in one step
+        unclipped = chunks < sizes
+        if unclipped.any():
+            scale = (elements_per_chunk / np.prod(chunks, dtype=np.float64)) ** (1.0 / unclipped.sum())
+            if scale > 1:
+                chunks[unclipped] = np.minimum(sizes[unclipped], chunks[unclipped] * scale)
         
-        return chunk_sizes
+        return dict(zip(dims, chunks.tolist()))
     
     @staticmethod
     def apply_compression_to_file(
         input_path: Path,
         output_path: Path,
         compression_level: int = 6,
-        chunking: str = "auto"
-    ) -> bool:
+        chunking: Optional[str] = "auto",
+        codec: str = "blosc_zstd",
+        defer: bool = False,
+        least_significant_digit: Optional[int] = None,
+        per_var_lsd: Optional[Dict[str, Optional[int]]] = None
+    ) -> Union[bool, Delayed]:
         """
         Apply compression to a NetCDF file.
         
+        The input is opened lazily, one time step per chunk. With ``defer=True``
+        nothing is written yet: a delayed write is returned so that writes of
+        many files can be computed together (see apply_compression_to_files).
+        
         Args:
             input_path: Path to input NetCDF file
             output_path: Path for compressed output file
             compression_level: Compression level (0-9)
             chunking: Chunking strategy
+            codec: Compression codec
+            defer: Return a delayed write instead of writing now
+            least_significant_digit: Decimal digits kept in float variables missing
+                from per_var_lsd (None for lossless)
+            per_var_lsd: Decimal digits per variable (default: LEAST_SIGNIFICANT_DIGITS)
             
         Returns:
-            True if successful, False otherwise
+            True if successful, False otherwise; with defer, a delayed object
+            that writes the file and yields True or False
         """
+        dataset = None
         try:
-            # Load dataset
-            dataset = xr.open_dataset(input_path)
+            # Open lazily so the data is streamed into the output
+            dataset = xr.open_dataset(input_path, chunks={'time': 1})
             
-            # Optimize for storage
-            optimized_dataset = CompressionManager.optimize_dataset_for_storage(
-                dataset, compression_level, chunking
-            )
-            
-            # Save with compression
-            optimized_dataset.to_netcdf(
+            # Save with compression, passing the encoding for all variables at once
+            write = dataset.to_netcdf(
                 output_path,
                 engine='netcdf4',
-                encoding=optimized_dataset.encoding
+                encoding=CompressionManager.get_dataset_encoding(
+                    dataset, compression_level, chunking, codec, least_significant_digit, per_var_lsd
+                ),
+                compute=False
             )
             
-            # Close dataset
-            dataset.close()
-            optimized_dataset.close()
-            
-            return True
-            
         except Exception as e:
-            print(f"Error applying compression: {e}")
+            if dataset is not None:
+                dataset.close()
+                Path(output_path).unlink(missing_ok=True)  # May already be created
+            logger.error("Error applying compression: %s", e)
             return False
+        
+        if defer:
+            # Wrapped in a partial so dask does not run the write as a dependency:
+            # the task computes it itself and turns a failure into False
+            return dask.delayed(functools.partial(
+                CompressionManager._finish_write, write, dataset, output_path
+            ), pure=False)()
+        
+        return CompressionManager._finish_write(write, dataset, output_path)
+    
+    @staticmethod
+    def _finish_write(write: Delayed, dataset: xr.Dataset, output_path: Path) -> bool:
+        """
+        Run a delayed NetCDF write without raising.
+        
+        Files are written one at a time, chunk by chunk on the calling thread.
+        The input dataset is always closed, and a partially written output is
+        removed when the write fails.
+        
+        Args:
+            write: Delayed write returned by ``to_netcdf(compute=False)``
+            dataset: Input dataset the write reads from
+            output_path: Path being written
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        with CompressionManager._WRITE_LOCK:
+            try:
+                write.compute(scheduler='synchronous')
+                return True
+            except Exception as e:
+                Path(output_path).unlink(missing_ok=True)
+                logger.error("Error applying compression: %s", e)
+                return False
+            finally:
+                dataset.close()
+    
+    @staticmethod
+    def apply_compression_to_files(
+        files: List[Tuple[Path, Path]],
+        compression_level: int = 6,
+        chunking: Optional[str] = "auto",
+        codec: str = "blosc_zstd",
+        least_significant_digit: Optional[int] = None,
+        per_var_lsd: Optional[Dict[str, Optional[int]]] = None
+    ) -> List[bool]:
+        """
+        Apply compression to several NetCDF files in one batched computation.
+        
+        Each file is written by its own task, so a failing file neither stops
+        nor discards the others. The files are written in turn; see _WRITE_LOCK.
+        
+        Args:
+            files: List of (input path, output path) tuples
+            compression_level: Compression level (0-9)
+            chunking: Chunking strategy
+            codec: Compression codec
+            least_significant_digit: Decimal digits kept in float variables missing
+                from per_var_lsd (None for lossless)
+            per_var_lsd: Decimal digits per variable (default: LEAST_SIGNIFICANT_DIGITS)
+            
+        Returns:
+            True/False per file, in input order
+        """
+        writes = [
+            CompressionManager.apply_compression_to_file(
+                input_path, output_path, compression_level, chunking, codec,
+                defer=True,
+                least_significant_digit=least_significant_digit,
+                per_var_lsd=per_var_lsd
+            )
+            for input_path, output_path in files
+        ]
+        
+        # Files that failed to open are already False and pass through unchanged
+        return list(dask.compute(*writes, scheduler='synchronous'))
     
     @staticmethod
     def get_compression_stats(
@@ -230,5 +518,5 @@ class CompressionManager:
             }
             
         except Exception as e:
-            print(f"Error getting compression stats: {e}")
+            logger.error("Error getting compression stats: %s", e)
             return {}
@@ -5,28 +5,57 @@ This module provides utilities for common file operations including
 file validation, directory creation, and file management.
 """
 
+import errno
+import fnmatch
+import mmap
 import os
 import shutil
+import threading
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 import hashlib
 
 
 class FileOperations:
     """Utilities for file operations."""
     
+    # Bytes fed to the hasher per update when hashing a mapped file
+    HASH_WINDOW_BYTES = 1 << 20  # 1 MiB
+    
+    # Absolute paths of directories this process has already created
+    _created_directories: set = set()
+    _created_directories_lock = threading.Lock()
+    
     @staticmethod
     def ensure_directory(path: Path) -> Path:
         """
         Ensure a directory exists, creating it if necessary.
         
+        Directories created once are remembered (with their ancestors), so
+        repeated calls for the same download tree cost a single stat instead of
+        a mkdir walk. A remembered directory that has since been removed (e.g.
+        by shutil.rmtree or another process) is forgotten and created again.
+        
         Args:
             path: Path to the directory
             
         Returns:
             Path to the created/existing directory
         """
+        key = os.path.abspath(path)
+        if key in FileOperations._created_directories:
+            if os.path.isdir(key):
+                return path
+            FileOperations._forget_directories(path)
+        
         path.mkdir(parents=True, exist_ok=True)
+        
+        with FileOperations._created_directories_lock:
+            created = FileOperations._created_directories
+            while key not in created:
+                created.add(key)
+                key = os.path.dirname(key)
+        
         return path
     
     @staticmethod
@@ -44,11 +73,24 @@ class FileOperations:
             if path.is_file():
                 path.unlink()
             elif path.is_dir():
+                FileOperations._forget_directories(path)
                 shutil.rmtree(path)
             return True
         except (OSError, PermissionError):
             return False
     
+    @staticmethod
+    def _forget_directories(path: Path):
+        """Drop a directory and everything below it from the created-directory cache."""
+        key = os.path.abspath(path)
+        prefix = os.path.join(key, "")
+        
+        with FileOperations._created_directories_lock:
+            FileOperations._created_directories = {
+                created for created in FileOperations._created_directories
+                if created != key and not created.startswith(prefix)
+            }
+    
     @staticmethod
     def get_file_size(path: Path) -> Optional[int]:
         """
@@ -66,24 +108,42 @@ class FileOperations:
             return None
     
     @staticmethod
-    def calculate_file_hash(path: Path, algorithm: str = "md5") -> Optional[str]:
+    def calculate_file_hash(path: Path, algorithm: str = "sha256") -> Optional[str]:
         """
         Calculate file hash.
         
+        SHA-256 is the default since OpenSSL runs it on the CPU's SHA
+        extensions, which makes it faster than MD5 on current hardware.
+        The file is memory-mapped and hashed in windows straight from the page
+        cache, with sequential readahead requested from the kernel.
+        
         Args:
             path: Path to the file
-            algorithm: Hash algorithm to use
+            algorithm: Hash algorithm to use (any name known to hashlib, e.g. 'md5')
             
         Returns:
             File hash as hex string, or None if error
         """
+        window = FileOperations.HASH_WINDOW_BYTES
+        
         try:
-            hash_func = getattr(hashlib, algorithm)()
+            hasher = hashlib.new(algorithm)
             with open(path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_func.update(chunk)
-            return hash_func.hexdigest()
-        except (OSError, AttributeError):
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    # Empty files cannot be mapped
+                    return hasher.hexdigest()
+                
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                        memoryview(mapped) as view:
+                    for offset in range(0, size, window):
+                        hasher.update(view[offset:offset + window])
+            
+            return hasher.hexdigest()
+        except (OSError, ValueError):
             return None
     
     @staticmethod
@@ -91,25 +151,57 @@ class FileOperations:
         directory: Path, 
         pattern: str = "*", 
         recursive: bool = False
-    ) -> List[Path]:
+    ) -> Iterator[Path]:
         """
         List files in a directory matching a pattern.
         
+        Uses os.scandir, whose entries carry their file type from the directory
+        read, so only matching files are turned into Path objects. Symlinked
+        directories are not followed when recursing.
+        
         Args:
             directory: Directory to search
-            pattern: File pattern to match
+            pattern: File name pattern to match (case-sensitive)
             recursive: Whether to search recursively
             
-        Returns:
-            List of matching file paths
+        Yields:
+            Matching file paths
+        """
+        pending = [os.fspath(directory)]
+        
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if recursive and entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif fnmatch.fnmatchcase(entry.name, pattern) and entry.is_file():
+                            yield Path(entry.path)
+            except OSError:
+                # Missing, unreadable or not a directory
+                continue
+    
+    @staticmethod
+    def list_files_into(
+        out: List[Path],
+        directory: Path,
+        pattern: str = "*",
+        recursive: bool = False
+    ) -> List[Path]:
         """
-        if not directory.exists() or not directory.is_dir():
-            return []
+        Append files in a directory matching a pattern to an existing list.
         
-        if recursive:
-            return list(directory.rglob(pattern))
-        else:
-            return list(directory.glob(pattern))
+        Args:
+            out: List to extend
+            directory: Directory to search
+            pattern: File name pattern to match (case-sensitive)
+            recursive: Whether to search recursively
+            
+        Returns:
+            The extended list
+        """
+        out.extend(FileOperations.list_files(directory, pattern, recursive))
+        return out
     
     @staticmethod
     def get_file_extension(path: Path) -> str:
@@ -154,11 +246,54 @@ class FileOperations:
         
         backup_path = path.with_suffix(path.suffix + backup_suffix)
         try:
-            shutil.copy2(path, backup_path)
+            if not FileOperations._copy_file_range(path, backup_path):
+                shutil.copyfile(path, backup_path)
+            shutil.copystat(path, backup_path)
             return backup_path
         except (OSError, PermissionError):
             return None
     
+    @staticmethod
+    def _copy_file_range(source: Path, destination: Path) -> bool:
+        """
+        Copy a file inside the kernel with copy_file_range.
+        
+        On copy-on-write filesystems (btrfs, XFS) this shares extents instead
+        of copying bytes; elsewhere it still avoids copies through user space.
+        
+        Args:
+            source: File to copy
+            destination: File to create or overwrite
+            
+        Returns:
+            True if copied, False if copy_file_range is unavailable for these files
+            
+        Raises:
+            OSError: If the copy stops short after part of the file was copied
+        """
+        if not hasattr(os, 'copy_file_range'):
+            return False
+        
+        with open(source, 'rb') as fsrc, open(destination, 'wb') as fdst:
+            size = remaining = os.fstat(fsrc.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        # Some filesystems report no progress instead of an error
+                        # when they do not support the call
+                        if remaining == size:
+                            return False
+                        raise OSError(f"Copy of {source} stopped with {remaining} bytes left")
+                    remaining -= copied
+            except OSError as e:
+                # Cross-device copies or filesystems without support
+                if e.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                    return False
+                raise
+        
+        return True
+    
     @staticmethod
     def get_disk_usage(path: Path) -> Optional[int]:
         """
@@ -8,8 +8,12 @@ This module provides a centralized logging system that combines:
 - Log levels and formatting
 """
 
+import atexit
 import logging
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional, Dict, Any
 from rich.console import Console
@@ -54,12 +58,21 @@ class LoggingManager:
         self.file_level = file_level
         self.enable_rich = enable_rich
         
+        # Resolve level names once
+        self._console_level_no = self._resolve_level(console_level)
+        self._file_level_no = self._resolve_level(file_level)
+        
         # Initialize Rich console
         self.console = Console(theme=self._create_theme())
         
         # Setup logging
         self._setup_logging()
     
+    @staticmethod
+    def _resolve_level(level: str) -> int:
+        """Get the numeric value of a log level name."""
+        return logging.getLevelNamesMapping()[level.upper()]
+    
     def _create_theme(self) -> Theme:
         """Create Rich theme with consistent colors."""
         return Theme({
@@ -75,10 +88,15 @@ class LoggingManager:
         """Setup logging configuration."""
         # Create logger
         self.logger = logging.getLogger('weather_downloader')
-        self.logger.setLevel(logging.DEBUG)
+        
+        # Records below every handler's level are dropped before they are built
+        self.logger.setLevel(
+            min(self._console_level_no, self._file_level_no)
+            if self.log_file else self._console_level_no
+        )
         
         # Clear existing handlers
-        self.logger.handlers.clear()
+        self.close()
         
         # Console handler with Rich formatting
         if self.enable_rich:
@@ -91,30 +109,53 @@ class LoggingManager:
         else:
             console_handler = logging.StreamHandler(sys.stdout)
         
-        console_handler.setLevel(getattr(logging, self.console_level.upper()))
+        console_handler.setLevel(self._console_level_no)
         self.logger.addHandler(console_handler)
         
         # File handler (if log file specified)
         if self.log_file:
             self.log_file.parent.mkdir(parents=True, exist_ok=True)
             file_handler = logging.FileHandler(self.log_file)
-            file_handler.setLevel(getattr(logging, self.file_level.upper()))
+            file_handler.setLevel(self._file_level_no)
             file_formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
-        
-        # File handler (if log file specified)
-        if self.log_file:
-            self.log_file.parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.FileHandler(self.log_file)
-            file_handler.setLevel(getattr(logging, self.file_level.upper()))
-            file_formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            
+            # Write to disk on a background thread so callers never wait on I/O
+            queue_handler = QueueHandler(queue.SimpleQueue())
+            queue_handler.setLevel(file_handler.level)
+            queue_handler.listener = QueueListener(
+                queue_handler.queue, file_handler, respect_handler_level=True
             )
-            file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            queue_handler.listener.start()
+            atexit.register(self._close_handler, queue_handler)
+            self.logger.addHandler(queue_handler)
+        
+        self._log_methods = {
+            'DEBUG': self.logger.debug,
+            'INFO': self.logger.info,
+            'WARNING': self.logger.warning,
+            'ERROR': self.logger.error,
+            'CRITICAL': self.logger.critical,
+        }
+    
+    def close(self):
+        """Flush pending file writes and close all handlers."""
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+            self._close_handler(handler)
+    
+    @staticmethod
+    def _close_handler(handler: logging.Handler):
+        """Close a handler, draining and stopping its queue listener if any."""
+        listener = getattr(handler, 'listener', None)
+        if listener is not None:
+            handler.listener = None
+            listener.stop()
+            for target in listener.handlers:
+                target.close()
+        handler.close()
     
     def _get_color(self, level: str) -> str:
         """Get color for log level."""
@@ -122,20 +163,16 @@ class LoggingManager:
     
     def _log_with_color(self, level: str, message: str, **kwargs):
         """Log message with appropriate color."""
-        color = self._get_color(level)
+        level = level.upper()
         
-        # Log to file/structured logging
-        if level.upper() == 'SUCCESS':
+        if level == 'SUCCESS':
+            # Log to file/structured logging, then print in color
+            color = self._get_color(level)
             self.logger.info(f"SUCCESS: {message}")
-        else:
-            getattr(self.logger, level.lower())(message)
-        
-        # Console output with color
-        if level.upper() == 'SUCCESS':
             self.console.print(f"[{color}]{message}[/{color}]")
         else:
             # Rich handler will handle colors automatically
-            pass
+            self._log_methods[level](message)
     
     def debug(self, message: str, **kwargs):
         """Log debug message."""
@@ -174,25 +211,29 @@ class LoggingManager:
         self.console.print(*args, **kwargs)
 
 
-# Global logging manager instance
+# Global logging manager instance, created on first use
 _logging_manager: Optional[LoggingManager] = None
+_logging_manager_lock = threading.Lock()
 
 
 def get_logger() -> LoggingManager:
     """Get global logging manager instance."""
     global _logging_manager
     
-    if _logging_manager is None:
-        # Default configuration
-        log_file = Path("logs/weather_downloader.log")
-        _logging_manager = LoggingManager(
-            log_file=log_file,
-            console_level='INFO',
-            file_level='DEBUG',
-            enable_rich=True
-        )
-    
-    return _logging_manager
+    manager = _logging_manager
+    if manager is None:
+        # Only one thread builds the default manager; the rest wait and reuse it
+        with _logging_manager_lock:
+            if _logging_manager is None:
+                _logging_manager = LoggingManager(
+                    log_file=Path("logs/weather_downloader.log"),
+                    console_level='INFO',
+                    file_level='DEBUG',
+                    enable_rich=True
+                )
+            manager = _logging_manager
+    
+    return manager
 
 
 def setup_logging(log_file: Optional[Path] = None, 
@@ -201,11 +242,12 @@ def setup_logging(log_file: Optional[Path] = None,
     """Setup global logging configuration."""
     global _logging_manager
     
-    _logging_manager = LoggingManager(
-        log_file=log_file,
-        console_level=console_level,
-        file_level=file_level,
-        enable_rich=True
-    )
-    
-    return _logging_manager
+    with _logging_manager_lock:
+        _logging_manager = LoggingManager(
+            log_file=log_file,
+            console_level=console_level,
+            file_level=file_level,
+            enable_rich=True
+        )
+        
+        return _logging_manager
@@ -5,10 +5,11 @@ This module provides utilities for managing temporal aspects of weather data,
 including date ranges, forecast cycles, and forecast hours.
 """
 
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
-import re
+from itertools import chain
 from pathlib import Path
+import numpy as np
 
 
 class TimeRangeManager:
@@ -53,14 +54,11 @@ class TimeRangeManager:
             List of dates in YYYYMMDD format
         """
         start_dt, end_dt = TimeRangeManager.parse_date_range(start_date, end_date)
-        dates = []
-        current_dt = start_dt
         
-        while current_dt <= end_dt:
-            dates.append(current_dt.strftime("%Y%m%d"))
-            current_dt += timedelta(days=1)
-            
-        return dates
+        return [
+            (start_dt + timedelta(days=i)).strftime("%Y%m%d")
+            for i in range((end_dt - start_dt).days + 1)
+        ]
     
     @staticmethod
     def validate_date_format(date: str) -> bool:
@@ -73,7 +71,8 @@ class TimeRangeManager:
         Returns:
             True if valid, False otherwise
         """
-        if not re.match(r'^\d{8}$', date):
+        # strptime also accepts unpadded fields ("2025111"), so check the shape first
+        if len(date) != 8 or not (date.isascii() and date.isdigit()):
             return False
         
         try:
@@ -87,6 +86,7 @@ class CycleManager:
     """Manages forecast cycles for weather models."""
     
     DEFAULT_CYCLES = ["00", "06", "12", "18"]
+    _CYCLE_SET = frozenset(DEFAULT_CYCLES)
     
     @staticmethod
     def validate_cycle(cycle: str) -> bool:
@@ -99,7 +99,7 @@ class CycleManager:
         Returns:
             True if valid, False otherwise
         """
-        return cycle in CycleManager.DEFAULT_CYCLES
+        return cycle in CycleManager._CYCLE_SET
     
     @staticmethod
     def parse_cycles(cycles_str: str) -> List[str]:
@@ -120,9 +120,9 @@ class CycleManager:
             
         cycles = [c.strip() for c in cycles_str.split(",")]
         
-        for cycle in cycles:
-            if not CycleManager.validate_cycle(cycle):
-                raise ValueError(f"Invalid cycle: {cycle}")
+        if not CycleManager._CYCLE_SET.issuperset(cycles):
+            invalid = [c for c in cycles if c not in CycleManager._CYCLE_SET]
+            raise ValueError(f"Invalid cycle: {', '.join(invalid)}")
                 
         return cycles
     
@@ -158,6 +158,8 @@ class CycleManager:
 class ForecastManager:
     """Manages forecast hours for weather models."""
     
+    MAX_FORECAST_HOUR = 240  # GFS goes up to 240 hours
+    
     @staticmethod
     def validate_forecast_hour(forecast_hour: int) -> bool:
         """
@@ -169,7 +171,7 @@ class ForecastManager:
         Returns:
             True if valid, False otherwise
         """
-        return 0 <= forecast_hour <= 240  # GFS goes up to 240 hours
+        return 0 <= forecast_hour <= ForecastManager.MAX_FORECAST_HOUR
     
     @staticmethod
     def parse_forecast_hours(forecasts_str: str) -> List[int]:
@@ -233,15 +235,42 @@ class ForecastManager:
         Returns:
             Dictionary with forecast information
         """
-        if not ForecastManager.validate_forecast_hour(forecast_hour):
-            raise ValueError(f"Invalid forecast hour: {forecast_hour}")
+        info = ForecastManager.get_forecast_info_batch([forecast_hour])
+        return {key: values[0].item() for key, values in info.items()}
+    
+    @staticmethod
+    def get_forecast_info_batch(forecast_hours: Sequence[int]) -> Dict[str, np.ndarray]:
+        """
+        Get information about many forecast hours as one array per field.
+        
+        Args:
+            forecast_hours: Forecast hours
+            
+        Returns:
+            Dictionary with the fields of get_forecast_info, each an array
+            aligned with forecast_hours
             
+        Raises:
+            ValueError: If any forecast hour is not an integer or is out of range
+        """
+        hours = np.asarray(forecast_hours)
+        
+        # Floats, strings and bools are rejected rather than silently converted
+        if hours.size and hours.dtype.kind not in 'iu':
+            raise ValueError(f"Invalid forecast hour: {hours.flat[0]!r} is not an integer")
+        hours = hours.astype(np.int64)
+        
+        valid = (hours >= 0) & (hours <= ForecastManager.MAX_FORECAST_HOUR)
+        if not valid.all():
+            raise ValueError(f"Invalid forecast hour: {hours[~valid][0]}")
+        
+        hours = hours.astype(np.int16)
         return {
-            "forecast_hour": forecast_hour,
-            "description": f"F{forecast_hour:03d}",
-            "is_analysis": forecast_hour == 0,
-            "is_short_range": 0 <= forecast_hour <= 48,
-            "is_medium_range": 48 < forecast_hour <= 240
+            "forecast_hour": hours,
+            "description": np.char.mod("F%03d", hours),  # Unlike zfill, also handles an empty batch
+            "is_analysis": hours == 0,
+            "is_short_range": hours <= 48,
+            "is_medium_range": hours > 48
         }
     
     @staticmethod
@@ -287,21 +316,16 @@ class ForecastManager:
                 first_cycle = list(model_config['cycle_forecast_ranges'].keys())[0]
                 ranges = model_config['cycle_forecast_ranges'][first_cycle]
                 
-                # Generate sequence based on model's actual frequency
-                forecast_hours = []
-                
-                # Generate all valid forecast hours for the model
-                all_valid_hours = []
-                for start, end, freq in ranges:
-                    for hour in range(start, end + 1, freq):
-                        all_valid_hours.append(hour)
-                
-                # Filter to only include hours in our requested range
-                for hour in all_valid_hours:
-                    if start_hour <= hour <= end_hour:
-                        forecast_hours.append(hour)
-                
-                return sorted(forecast_hours)
+                # Generate the model's valid hours inside the requested range only,
+                # keeping each range on its own step grid (ranges may share ends)
+                return sorted(set(chain.from_iterable(
+                    range(
+                        start + max(0, -(-(start_hour - start) // freq)) * freq,
+                        min(end, end_hour) + 1,
+                        freq
+                    )
+                    for start, end, freq in ranges
+                )))
             else:
                 # Fallback: generate every hour for short range, every 3h for longer
                 if end_hour <= 120:
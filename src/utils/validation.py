@@ -6,8 +6,63 @@ and configurations.
 """
 
 from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from itertools import filterfalse
 from pathlib import Path
 import re
+import string
+
+
+# Allow alphanumeric characters, dots, and underscores
+_MODEL_CHARS = frozenset(string.ascii_letters + string.digits + '._-')
+
+# Allow uppercase letters and numbers (as bytes, for bytes.translate)
+_VAR_BYTES = (string.ascii_uppercase + string.digits + '_').encode('ascii')
+
+# Allow alphanumeric characters, spaces, and common separators
+_LEVEL_CHARS = frozenset(string.ascii_letters + string.digits + string.whitespace + '._-')
+
+# Required keys, in the order missing ones are reported
+_REQUIRED_KEYS = ('models', 'processing', 'storage')
+_REQUIRED_MODEL_KEYS = ('name', 'resolution', 'base_url')
+_REQUIRED_KEY_SET = frozenset(_REQUIRED_KEYS)
+_REQUIRED_MODEL_KEY_SET = frozenset(_REQUIRED_MODEL_KEYS)
+
+# Accepted compression levels (zlib/blosc range)
+_VALID_COMPRESSION_LEVELS = frozenset(range(10))
+
+# Basic URL validation
+_URL_SCHEMES = ('http://', 'https://')
+_URL_RE = re.compile(r"""
+    ^https?://      # scheme
+    [^\s/$.?#]      # host must start with a regular character
+    .[^\s]*$        # rest of the URL, without whitespace
+""", re.VERBOSE)
+
+
+# Model, variable and level names come from a small, fixed vocabulary, so their
+# results are cached; URLs differ per date/cycle/hour and are not
+
+@lru_cache(maxsize=256)
+def _is_valid_model_name(model_name: str) -> bool:
+    """Check a non-empty string against the model name characters."""
+    return _MODEL_CHARS.issuperset(model_name)
+
+
+@lru_cache(maxsize=256)
+def _is_valid_variable_name(variable: str) -> bool:
+    """Check a non-empty string against the variable name characters."""
+    # Deleting every allowed byte in one C pass must leave nothing behind
+    return variable.isascii() and not variable.encode('ascii').translate(None, _VAR_BYTES)
+
+
+@lru_cache(maxsize=256)
+def _is_valid_level_name(level: str) -> bool:
+    """Check a non-empty string against the level name characters."""
+    # Non-ASCII whitespace is allowed too, but rare enough for the slow path
+    return _LEVEL_CHARS.issuperset(level) or all(
+        char in _LEVEL_CHARS or char.isspace() for char in level
+    )
 
 
 class DataValidator:
@@ -27,9 +82,7 @@ class DataValidator:
         if not model_name or not isinstance(model_name, str):
             return False
         
-        # Allow alphanumeric characters, dots, and underscores
-        pattern = r'^[a-zA-Z0-9._-]+$'
-        return bool(re.match(pattern, model_name))
+        return _is_valid_model_name(model_name)
     
     @staticmethod
     def validate_variable_name(variable: str) -> bool:
@@ -45,9 +98,7 @@ class DataValidator:
         if not variable or not isinstance(variable, str):
             return False
         
-        # Allow uppercase letters and numbers
-        pattern = r'^[A-Z0-9_]+$'
-        return bool(re.match(pattern, variable))
+        return _is_valid_variable_name(variable)
     
     @staticmethod
     def validate_level_name(level: str) -> bool:
@@ -63,9 +114,7 @@ class DataValidator:
         if not level or not isinstance(level, str):
             return False
         
-        # Allow alphanumeric characters, spaces, and common separators
-        pattern = r'^[a-zA-Z0-9\s._-]+$'
-        return bool(re.match(pattern, level))
+        return _is_valid_level_name(level)
     
     @staticmethod
     def validate_url(url: str) -> bool:
@@ -81,14 +130,18 @@ class DataValidator:
         if not url or not isinstance(url, str):
             return False
         
-        # Basic URL validation
-        pattern = r'^https?://[^\s/$.?#].[^\s]*$'
-        return bool(re.match(pattern, url))
+        # Most invalid URLs lack the scheme; reject those without the regex
+        if not url.startswith(_URL_SCHEMES):
+            return False
+        
+        return bool(_URL_RE.match(url))
     
     @staticmethod
     def validate_file_path(path: Union[str, Path]) -> bool:
         """
-        Validate file path.
+        Validate file path syntax without touching the filesystem.
+        
+        The path does not need to exist; use validate_file_path_exists for that.
         
         Args:
             path: Path to validate
@@ -97,10 +150,30 @@ class DataValidator:
             True if valid, False otherwise
         """
         try:
-            path_obj = Path(path)
-            # Check if path is absolute or can be resolved
-            return path_obj.is_absolute() or path_obj.resolve() is not None
-        except (OSError, RuntimeError):
+            path_str = str(Path(path))
+        except (TypeError, ValueError):
+            return False
+        
+        # Paths cannot contain null bytes on any supported platform
+        return bool(path_str) and '\x00' not in path_str
+    
+    @staticmethod
+    def validate_file_path_exists(path: Union[str, Path]) -> bool:
+        """
+        Validate that a file path is valid and exists.
+        
+        Args:
+            path: Path to validate
+            
+        Returns:
+            True if valid and existing, False otherwise
+        """
+        if not DataValidator.validate_file_path(path):
+            return False
+        
+        try:
+            return Path(path).exists()
+        except OSError:
             return False
     
     @staticmethod
@@ -114,7 +187,8 @@ class DataValidator:
         Returns:
             True if valid, False otherwise
         """
-        return isinstance(level, int) and 0 <= level <= 9
+        # Exact type check: bool is an int subclass but True is not a level
+        return type(level) is int and level in _VALID_COMPRESSION_LEVELS
     
     @staticmethod
     def validate_config_structure(config: Dict[str, Any]) -> tuple[bool, List[str]]:
@@ -128,14 +202,11 @@ class DataValidator:
             Tuple of (is_valid, list_of_errors)
         """
         errors = []
-        required_keys = ['models', 'processing', 'storage']
         
         # Check required top-level keys
-        for key in required_keys:
-            if key not in config:
-                errors.append(f"Missing required key: {key}")
-        
-        if errors:
+        missing = _REQUIRED_KEY_SET.difference(config)
+        if missing:
+            errors.extend(f"Missing required key: {key}" for key in _REQUIRED_KEYS if key in missing)
             return False, errors
         
         # Validate models section
@@ -143,15 +214,20 @@ class DataValidator:
             if not isinstance(config['models'], dict):
                 errors.append("'models' must be a dictionary")
             else:
+                # Check all model names in one pass
+                errors.extend(
+                    f"Invalid model name: {model_name}"
+                    for model_name in filterfalse(DataValidator.validate_model_name, config['models'])
+                )
+                
                 for model_name, model_config in config['models'].items():
-                    if not DataValidator.validate_model_name(model_name):
-                        errors.append(f"Invalid model name: {model_name}")
-                    
                     if isinstance(model_config, dict):
-                        required_model_keys = ['name', 'resolution', 'base_url']
-                        for req_key in required_model_keys:
-                            if req_key not in model_config:
-                                errors.append(f"Missing required key in {model_name}: {req_key}")
+                        missing = _REQUIRED_MODEL_KEY_SET.difference(model_config)
+                        if missing:
+                            errors.extend(
+                                f"Missing required key in {model_name}: {req_key}"
+                                for req_key in _REQUIRED_MODEL_KEYS if req_key in missing
+                            )
         
         # Validate processing section
         if 'processing' in config:
@@ -14,6 +14,7 @@ import yaml
 import xarray as xr
 import numpy as np
 import pandas as pd
+import re
 
 # ============================================================================
 # FIXTURES GLOBALES
@@ -102,22 +103,55 @@ def mock_variables_mapping():
         }
     }
 
+@pytest.fixture(scope="session")
+def simple_model_config():
+    """Hourly 0-72h forecast ranges for every cycle (read-only, shared)"""
+    return {
+        'cycle_forecast_ranges': {
+            '00': [[0, 72, 1]],  # 0-72h every hour
+            '06': [[0, 72, 1]],
+            '12': [[0, 72, 1]],
+            '18': [[0, 72, 1]]
+        }
+    }
+
+@pytest.fixture(scope="session")
+def gfs_model_config():
+    """Realistic GFS forecast ranges for every cycle (read-only, shared)"""
+    return {
+        'cycle_forecast_ranges': {
+            '00': [[0, 120, 1], [123, 240, 3]],
+            '06': [[0, 120, 1], [123, 240, 3]],
+            '12': [[0, 120, 1], [123, 240, 3]],
+            '18': [[0, 120, 1], [123, 240, 3]]
+        }
+    }
+
 @pytest.fixture
 def sample_xarray_dataset():
     """Sample xarray dataset for testing"""
     # Fixed random seed for reproducible tests
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     time = pd.date_range('2025-01-01T00:00:00', periods=5, freq='h')
     lat = np.linspace(15, -60, 76)  # South America latitudes
     lon = np.linspace(-90, -30, 61)  # South America longitudes
     
-    # Create realistic weather data
-    temp_data = 280 + 10 * np.random.random((5, 76, 61))  # Temperature: 280-290K
-    rh_data = 20 + 60 * np.random.random((5, 76, 61))     # RH: 20-80%
-    u_data = 5 * np.random.random((5, 76, 61)) - 2.5      # U wind: -2.5 to 2.5 m/s
-    v_data = 5 * np.random.random((5, 76, 61)) - 2.5      # V wind: -2.5 to 2.5 m/s
-    height_data = 1000 * np.random.random((76, 61))       # Height: 0-1000m
+    # Create realistic weather data: one float32 draw (GRIB's decoded precision)
+    # for all fields, scaled in place through per-variable views. The static
+    # height field takes the last (76, 61) slab of the same buffer.
+    block = rng.random(21 * 76 * 61, dtype=np.float32)
+    temp_data, rh_data, u_data, v_data = block[:20 * 76 * 61].reshape(4, 5, 76, 61)
+    height_data = block[20 * 76 * 61:].reshape(76, 61)
+    temp_data *= 10
+    temp_data += 280                     # Temperature: 280-290K
+    rh_data *= 60
+    rh_data += 20                        # RH: 20-80%
+    u_data *= 5
+    u_data -= 2.5                        # U wind: -2.5 to 2.5 m/s
+    v_data *= 5
+    v_data -= 2.5                        # V wind: -2.5 to 2.5 m/s
+    height_data *= 1000                  # Height: 0-1000m
     
     dataset = xr.Dataset({
         't2m': (['time', 'latitude', 'longitude'], temp_data),
@@ -139,15 +173,16 @@ def sample_xarray_dataset():
     
     return dataset
 
+# Mock binary content (GRIB2 magic bytes + dummy data), built once
+_MOCK_GRIB_CONTENT = b'GRIB' + bytes(100) + b'7777'  # GRIB2 format
+
 @pytest.fixture
 def sample_grib_files(tmp_path):
     """Create mock GRIB files for testing"""
     grib_files = []
     for i in range(3):
         grib_file = tmp_path / f"gfs.t00z.pgrb2.0p25.f{i:03d}"
-        # Create mock binary content (GRIB2 magic bytes + dummy data)
-        mock_content = b'GRIB' + b'\x00' * 100 + b'7777'  # GRIB2 format
-        grib_file.write_bytes(mock_content)
+        grib_file.write_bytes(_MOCK_GRIB_CONTENT)
         grib_files.append(grib_file)
     return grib_files
 
@@ -183,23 +218,75 @@ def no_network():
         mock_session.return_value.get.side_effect = Exception("Network access not allowed in unit tests")
         yield
 
+@pytest.fixture
+def default_mock_response():
+    """Per-test copy of the shared default MockResponse"""
+    from tests.helpers.mocks import default_mock_response
+    return default_mock_response()
+
+@pytest.fixture
+def fake_path():
+    """FakePath class with its instance log cleared for this test"""
+    from tests.helpers.mocks import FakePath
+    FakePath.reset()
+    return FakePath
+
+@pytest.fixture
+def patched_requests_get(monkeypatch):
+    """requests.get replaced by a Mock returning a default MockResponse"""
+    from tests.helpers.mocks import patch_requests_get
+    return patch_requests_get(monkeypatch)
+
+@pytest.fixture
+def patched_open_mfdataset(monkeypatch):
+    """xarray.open_mfdataset replaced by a Mock returning a MockXarrayDataset"""
+    from tests.helpers.mocks import patch_xarray_open_mfdataset
+    return patch_xarray_open_mfdataset(monkeypatch)
+
+@pytest.fixture
+def patched_pathlib(monkeypatch):
+    """pathlib.Path file operations replaced by no-op stand-ins"""
+    from tests.helpers.mocks import patch_pathlib_operations
+    patch_pathlib_operations(monkeypatch)
+
+@pytest.fixture
+def patched_yaml_load(monkeypatch, mock_config):
+    """yaml.safe_load replaced to return the mock_config fixture"""
+    from tests.helpers.mocks import patch_yaml_load
+    patch_yaml_load(monkeypatch, mock_config)
+    return mock_config
+
+# Emit YAML with libyaml when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
+# YAML text of config dicts already dumped this session, keyed by repr so
+# tests that override or modify the config fixtures still get their own dump
+_YAML_DUMPS = {}
+
+def _dump_yaml(data):
+    """Dump a config dict to YAML, reusing earlier dumps of equal dicts"""
+    key = repr(data)
+    if key not in _YAML_DUMPS:
+        _YAML_DUMPS[key] = yaml.dump(data, Dumper=_YamlDumper)
+    return _YAML_DUMPS[key]
+
 @pytest.fixture
 def mock_config_files(tmp_path, mock_config, mock_models_config, mock_variables_mapping):
     """Create mock configuration files"""
     # Create config.yaml
     config_file = tmp_path / "config.yaml"
-    with open(config_file, 'w') as f:
-        yaml.dump(mock_config, f)
+    config_file.write_text(_dump_yaml(mock_config))
     
     # Create models_config.yaml
     models_config_file = tmp_path / "models_config.yaml"
-    with open(models_config_file, 'w') as f:
-        yaml.dump(mock_models_config, f)
+    models_config_file.write_text(_dump_yaml(mock_models_config))
     
     # Create variables_mapping.yaml
     variables_file = tmp_path / "variables_mapping.yaml"
-    with open(variables_file, 'w') as f:
-        yaml.dump(mock_variables_mapping, f)
+    variables_file.write_text(_dump_yaml(mock_variables_mapping))
     
     return {
         'config': config_file,
@@ -220,27 +307,42 @@ def pytest_configure(config):
         sys.path.insert(0, str(project_root))
         sys._pytest_configured = True
 
+# Test name keywords that mark tests as slow or as using the network
+_SLOW_RE = re.compile(r'download|process|integration')
+_NETWORK_RE = re.compile(r'download|http|request')
+
+# Marker decorators built once instead of per collected item
+_UNIT_MARK = pytest.mark.unit
+_INTEGRATION_MARK = pytest.mark.integration
+_SLOW_MARK = pytest.mark.slow
+_CLI_MARK = pytest.mark.cli
+_NETWORK_MARK = pytest.mark.network
+
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers automatically"""
     for item in items:
+        # item.path is the pathlib path; item.fspath would build a legacy py.path first
+        fspath = str(item.path)
+        name = item.name.lower()
+        
         # Add 'unit' marker to all tests in unit/ directory
-        if 'unit/' in str(item.fspath):
-            item.add_marker(pytest.mark.unit)
+        if 'unit/' in fspath:
+            item.add_marker(_UNIT_MARK)
         # Add 'integration' marker to integration tests
-        elif 'integration/' in str(item.fspath):
-            item.add_marker(pytest.mark.integration)
+        elif 'integration/' in fspath:
+            item.add_marker(_INTEGRATION_MARK)
         
         # Add 'slow' marker to tests that might be slow
-        if any(keyword in item.name.lower() for keyword in ['download', 'process', 'integration']):
-            item.add_marker(pytest.mark.slow)
+        if _SLOW_RE.search(name):
+            item.add_marker(_SLOW_MARK)
         
         # Add 'cli' marker to CLI tests
-        if 'cli/' in str(item.fspath):
-            item.add_marker(pytest.mark.cli)
+        if 'cli/' in fspath:
+            item.add_marker(_CLI_MARK)
         
         # Add 'network' marker to tests that use network
-        if any(keyword in item.name.lower() for keyword in ['download', 'http', 'request']):
-            item.add_marker(pytest.mark.network)
+        if _NETWORK_RE.search(name):
+            item.add_marker(_NETWORK_MARK)
 
 # ============================================================================
 # CUSTOM ASSERTIONS
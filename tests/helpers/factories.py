@@ -1,165 +1,174 @@
 """
 Test data factories for creating mock objects and datasets.
 
-These factories provide consistent test data generation using factory_boy.
+These factories provide consistent test data generation as plain functions.
 """
 
-import factory
 import numpy as np
 import xarray as xr
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, timedelta
 
-class MockDatasetFactory(factory.Factory):
-    """Factory for creating mock xarray datasets"""
+# (scale, offset) mapping uniform [0, 1) samples onto realistic ranges
+VARIABLE_RANGES = {
+    't2m': (15.0, 285.0), 't': (15.0, 285.0),                # Temperature: 285-300K
+    'r2': (100.0, 0.0), 'rh2m': (100.0, 0.0),                # Relative humidity: 0-100%
+    'u10': (20.0, -10.0), 'v10': (20.0, -10.0),              # Wind components: -10 to 10 m/s
+    'u10m': (20.0, -10.0), 'v10m': (20.0, -10.0),
+    'orog': (3000.0, 0.0), 'hgt': (3000.0, 0.0),             # Surface height: 0-3000m
+    'msl': (6000.0, 98000.0), 'prmsl': (6000.0, 98000.0),    # Mean sea level pressure: 980-1040 hPa
+}
+
+# Variables without a time dimension
+STATIC_VARIABLES = frozenset({'orog', 'hgt'})
+
+def make_mock_dataset(
+    time_periods=5,
+    freq='1H',
+    lat_size=76,
+    lon_size=61,
+    variables=('t2m', 'r2', 'u10', 'v10'),
+    start_date='2025-01-01T00:00:00'
+):
+    """Create a mock dataset with specified parameters"""
+    # Create coordinates
+    time = pd.date_range(start_date, periods=time_periods, freq=freq.replace('H', 'h'))
+    lat = np.linspace(15, -60, lat_size)   # South America bounds
+    lon = np.linspace(-90, -30, lon_size)  # South America bounds
     
-    class Meta:
-        model = xr.Dataset
+    # Create realistic data with fixed seed for reproducibility
+    rng = np.random.default_rng(42)
+    data_vars = {}
     
-    @classmethod
-    def create(cls, **kwargs):
-        """Create a mock dataset with specified parameters"""
-        # Default parameters
-        time_periods = kwargs.get('time_periods', 5)
-        freq = kwargs.get('freq', '1H')
-        lat_size = kwargs.get('lat_size', 76)
-        lon_size = kwargs.get('lon_size', 61)
-        variables = kwargs.get('variables', ['t2m', 'r2', 'u10', 'v10'])
-        start_date = kwargs.get('start_date', '2025-01-01T00:00:00')
-        
-        # Create coordinates
-        time = pd.date_range(start_date, periods=time_periods, freq=freq.replace('H', 'h'))
-        lat = np.linspace(15, -60, lat_size)   # South America bounds
-        lon = np.linspace(-90, -30, lon_size)  # South America bounds
-        
-        # Create realistic data with fixed seed for reproducibility
-        np.random.seed(42)
-        data_vars = {}
-        
-        for var in variables:
-            if var in ['t2m', 't']:
-                # Temperature: 270-300K range
-                data = 285 + 15 * np.random.random((time_periods, lat_size, lon_size))
-            elif var in ['r2', 'rh2m']:
-                # Relative humidity: 0-100%
-                data = 100 * np.random.random((time_periods, lat_size, lon_size))
-            elif var in ['u10', 'v10', 'u10m', 'v10m']:
-                # Wind components: -10 to 10 m/s
-                data = 20 * np.random.random((time_periods, lat_size, lon_size)) - 10
-            elif var in ['orog', 'hgt']:
-                # Surface height: 0-3000m (time-independent)
-                data = 3000 * np.random.random((lat_size, lon_size))
-                data_vars[var] = (['latitude', 'longitude'], data)
-                continue
-            elif var in ['msl', 'prmsl']:
-                # Mean sea level pressure: 980-1040 hPa
-                data = 98000 + 6000 * np.random.random((time_periods, lat_size, lon_size))
-            else:
-                # Generic variable
-                data = np.random.random((time_periods, lat_size, lon_size))
-            
-            data_vars[var] = (['time', 'latitude', 'longitude'], data)
-        
-        # Create dataset
-        dataset = xr.Dataset(data_vars, coords={
-            'time': time, 'latitude': lat, 'longitude': lon
-        })
+    # One float32 draw (GRIB's decoded precision) for all time-dependent
+    # variables, sliced into per-variable views
+    time_vars = [var for var in variables if var not in STATIC_VARIABLES]
+    fields = dict(zip(
+        time_vars,
+        rng.random((len(time_vars), time_periods, lat_size, lon_size), dtype=np.float32)
+    ))
+    
+    for var in variables:
+        scale, offset = VARIABLE_RANGES.get(var, (1.0, 0.0))
         
-        # Add realistic attributes
-        dataset.attrs.update({
-            'source': 'Mock test dataset',
-            'model': 'test-model',
-            'created': datetime.now().isoformat(),
-            'conventions': 'CF-1.6'
-        })
+        if var in STATIC_VARIABLES:
+            data = rng.random((lat_size, lon_size), dtype=np.float32)
+            dims = ['latitude', 'longitude']
+        else:
+            data = fields[var]
+            dims = ['time', 'latitude', 'longitude']
         
-        return dataset
-
-class MockConfigFactory(factory.DictFactory):
-    """Factory for creating mock configurations"""
-    
-    output_dir = "test_data"
+        data *= scale
+        data += offset
+        data_vars[var] = (dims, data)
     
-    spatial_bounds = factory.Dict({
-        'lon_min': -90.0, 'lon_max': -30.0,
-        'lat_min': -60.0, 'lat_max': 15.0
+    # Create dataset
+    dataset = xr.Dataset(data_vars, coords={
+        'time': time, 'latitude': lat, 'longitude': lon
     })
     
-    processing = factory.Dict({
-        'target_frequency': '1H',
-        'workers': 2,
-        'chunk_size': '100MB',
-        'compression': {'enabled': True, 'level': 5},
-        'netcdf': {'chunking': True, 'shuffle': True, 'fletcher32': True}
+    # Add realistic attributes
+    dataset.attrs.update({
+        'source': 'Mock test dataset',
+        'model': 'test-model',
+        'created': datetime.now().isoformat(),
+        'conventions': 'CF-1.6'
     })
     
-    download = factory.Dict({
-        'retry_attempts': 3,
-        'timeout': 30,
-        'concurrent_downloads': 2
-    })
+    return dataset
 
-class MockModelsConfigFactory(factory.DictFactory):
-    """Factory for creating mock model configurations"""
-    
-    @classmethod
-    def gfs_config(cls):
-        """Create GFS model configuration"""
-        return {
-            'gfs.0p25': {
-                'name': 'GFS 0.25 Degree',
-                'resolution': '0.25°',
-                'base_url': 'https://nomads.ncep.noaa.gov',
-                'data_source': 'NOMADS',
-                'cycles': ['00', '06', '12', '18'],
-                'cycle_forecast_ranges': {
-                    '00': [[0, 120, 1], [123, 240, 3]],
-                    '06': [[0, 120, 1], [123, 240, 3]],
-                    '12': [[0, 120, 1], [123, 240, 3]], 
-                    '18': [[0, 120, 1], [123, 240, 3]]
-                },
-                'max_forecast_hours': 240,
-                'availability_delays': {
-                    '00': 300, '06': 300, '12': 300, '18': 300
-                },
-                'download_format': 'grib2',
-                'file_extension': '.grb2',
-                'final_format': 'netcdf'
-            }
+def make_mock_config(**overrides):
+    """Create a mock configuration (a fresh dict on every call)"""
+    config = {
+        'output_dir': "test_data",
+        'spatial_bounds': {
+            'lon_min': -90.0, 'lon_max': -30.0,
+            'lat_min': -60.0, 'lat_max': 15.0
+        },
+        'processing': {
+            'target_frequency': '1H',
+            'workers': 2,
+            'chunk_size': '100MB',
+            'compression': {'enabled': True, 'level': 5},
+            'netcdf': {'chunking': True, 'shuffle': True, 'fletcher32': True}
+        },
+        'download': {
+            'retry_attempts': 3,
+            'timeout': 30,
+            'concurrent_downloads': 2
         }
+    }
+    config.update(overrides)
+    return config
 
-class MockGRIBFileFactory(factory.Factory):
-    """Factory for creating mock GRIB files"""
+def make_gfs_models_config():
+    """Create GFS model configuration"""
+    return {
+        'gfs.0p25': {
+            'name': 'GFS 0.25 Degree',
+            'resolution': '0.25°',
+            'base_url': 'https://nomads.ncep.noaa.gov',
+            'data_source': 'NOMADS',
+            'cycles': ['00', '06', '12', '18'],
+            'cycle_forecast_ranges': {
+                '00': [[0, 120, 1], [123, 240, 3]],
+                '06': [[0, 120, 1], [123, 240, 3]],
+                '12': [[0, 120, 1], [123, 240, 3]], 
+                '18': [[0, 120, 1], [123, 240, 3]]
+            },
+            'max_forecast_hours': 240,
+            'availability_delays': {
+                '00': 300, '06': 300, '12': 300, '18': 300
+            },
+            'download_format': 'grib2',
+            'file_extension': '.grb2',
+            'final_format': 'netcdf'
+        }
+    }
+
+# Realistic GRIB2 file structure, built once: GRIB2 files start with "GRIB"
+# and end with "7777"
+MOCK_GRIB_CONTENT = (
+    b'GRIB'          # GRIB2 indicator
+    + bytes(21)      # Identification section
+    + bytes(72)      # Grid definition section
+    + bytes(34)      # Product definition section
+    + bytes(23)      # Data representation section
+    + bytes(6)       # Bit map section
+    + bytes(1000)    # Data section (mock data)
+    + b'7777'        # End section
+)
+
+def make_mock_grib_file(file_path=None, forecast_hour=0):
+    """Create a mock GRIB file"""
+    if file_path is None:
+        file_path = Path(f"gfs.t00z.pgrb2.0p25.f{forecast_hour:03d}")
     
-    class Meta:
-        model = Path
+    # Write to file
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(MOCK_GRIB_CONTENT)
     
-    @classmethod
-    def create(cls, file_path=None, forecast_hour=0, **kwargs):
-        """Create a mock GRIB file"""
-        if file_path is None:
-            file_path = Path(f"gfs.t00z.pgrb2.0p25.f{forecast_hour:03d}")
-        
-        # Create realistic GRIB2 file structure
-        # GRIB2 files start with "GRIB" and end with "7777"
-        header = b'GRIB'  # GRIB2 indicator
-        section1 = b'\x00' * 21  # Identification section
-        section3 = b'\x00' * 72  # Grid definition section
-        section4 = b'\x00' * 34  # Product definition section
-        section5 = b'\x00' * 23  # Data representation section
-        section6 = b'\x00' * 6   # Bit map section
-        section7 = b'\x00' * 1000  # Data section (mock data)
-        footer = b'7777'  # End section
-        
-        mock_content = header + section1 + section3 + section4 + section5 + section6 + section7 + footer
-        
-        # Write to file
-        file_path = Path(file_path)
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_path.write_bytes(mock_content)
-        
-        return file_path
+    return file_path
+
+# Factory-style names kept for existing tests
+
+class MockDatasetFactory:
+    """Factory for creating mock xarray datasets"""
+    create = staticmethod(make_mock_dataset)
+
+class MockConfigFactory:
+    """Factory for creating mock configurations"""
+    create = build = staticmethod(make_mock_config)
+
+class MockModelsConfigFactory:
+    """Factory for creating mock model configurations"""
+    gfs_config = staticmethod(make_gfs_models_config)
+
+class MockGRIBFileFactory:
+    """Factory for creating mock GRIB files"""
+    create = staticmethod(make_mock_grib_file)
 
 def create_sample_forecast_hours(model='gfs', cycle='00', max_hours=240):
     """Generate realistic forecast hours for testing"""
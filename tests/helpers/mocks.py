@@ -5,8 +5,10 @@ This module provides reusable mock objects and utilities for testing
 various components of the weather data downloader.
 """
 
-from unittest.mock import Mock, MagicMock, patch
+import copy
+from unittest.mock import Mock, MagicMock
 from pathlib import Path
+from types import SimpleNamespace
 import requests
 import xarray as xr
 import numpy as np
@@ -23,6 +25,13 @@ class MockResponse:
         self.ok = status_code < 400
         self.text = content.decode('utf-8', errors='ignore')
     
+    def __copy__(self):
+        """Shallow copy with its own headers dict"""
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.headers = dict(self.headers)
+        return clone
+    
     def raise_for_status(self):
         """Raise HTTPError for bad status codes"""
         if not self.ok:
@@ -56,6 +65,46 @@ class MockGRIBFile:
         """Mock writing bytes to file"""
         self.size = len(data)
 
+class FakePath:
+    """Minimal pathlib.Path stand-in that records every instance and call"""
+    
+    instances = []
+    existing = True
+    
+    def __init__(self, *parts):
+        self.path = '/'.join(map(str, parts))
+        self.calls = []
+        FakePath.instances.append(self)
+    
+    @classmethod
+    def reset(cls):
+        """Forget instances recorded by previous tests"""
+        cls.instances = []
+    
+    def __truediv__(self, other):
+        return type(self)(self.path, other)
+    
+    def __str__(self):
+        return self.path
+    
+    @property
+    def name(self):
+        return self.path.rsplit('/', 1)[-1]
+    
+    def exists(self):
+        """Report the class-level existence flag"""
+        self.calls.append(('exists',))
+        return self.existing
+    
+    def glob(self, pattern):
+        """Record the pattern; nothing ever matches"""
+        self.calls.append(('glob', pattern))
+        return []
+    
+    def unlink(self, missing_ok=False):
+        """Record the removal"""
+        self.calls.append(('unlink',))
+
 class MockXarrayDataset:
     """Mock xarray dataset for testing data processing"""
     
@@ -64,19 +113,18 @@ class MockXarrayDataset:
         self.time_size = time_size
         self.spatial_shape = spatial_shape
         
-        # Create mock data_vars
-        self.data_vars = {}
-        for var in self.variables:
-            mock_var = Mock()
-            mock_var.dims = ('time', 'latitude', 'longitude')
-            mock_var.shape = (time_size,) + spatial_shape
-            self.data_vars[var] = mock_var
+        # Create mock data_vars (plain attribute holders; nothing asserts calls on them)
+        shape = (time_size,) + spatial_shape
+        self.data_vars = {
+            var: SimpleNamespace(dims=('time', 'latitude', 'longitude'), shape=shape)
+            for var in self.variables
+        }
         
         # Create mock coordinates
         self.coords = {
-            'time': Mock(),
-            'latitude': Mock(), 
-            'longitude': Mock()
+            'time': SimpleNamespace(size=time_size),
+            'latitude': SimpleNamespace(size=spatial_shape[0]), 
+            'longitude': SimpleNamespace(size=spatial_shape[1])
         }
         
         # Mock dimensions
@@ -87,9 +135,18 @@ class MockXarrayDataset:
         }
         
         # Mock time coordinate
-        self.time = Mock()
-        self.time.size = time_size
+        self.time = self.coords['time']
         
+    def __copy__(self):
+        """Shallow copy with its own variable, coordinate and dimension dicts"""
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.variables = list(self.variables)
+        clone.data_vars = dict(self.data_vars)
+        clone.coords = dict(self.coords)
+        clone.dims = dict(self.dims)
+        return clone
+    
     def sel(self, **kwargs):
         """Mock spatial selection"""
         return MockXarrayDataset(
@@ -174,76 +231,91 @@ class MockGRIBProcessor:
             'compression_ratio': 6.5
         }
 
+# Default stand-ins, built once and copied per use
+_DEFAULT_RESPONSE = MockResponse()
+_DEFAULT_DATASET = MockXarrayDataset()
+
+def default_mock_response():
+    """Return a copy of the default MockResponse"""
+    return copy.copy(_DEFAULT_RESPONSE)
+
+def default_mock_dataset():
+    """Return a copy of the default MockXarrayDataset"""
+    return copy.copy(_DEFAULT_DATASET)
+
 # ============================================================================
-# CONTEXT MANAGERS AND DECORATORS
+# MONKEYPATCH HELPERS
 # ============================================================================
 
-def mock_requests_get(response=None, side_effect=None):
-    """Context manager for mocking requests.get"""
+def patch_requests_get(monkeypatch, response=None, side_effect=None):
+    """Patch requests.get for the current test and return the stand-in mock"""
     if response is None:
-        response = MockResponse()
+        response = default_mock_response()
     
-    return patch('requests.get', return_value=response, side_effect=side_effect)
+    mock_get = Mock(return_value=response, side_effect=side_effect)
+    monkeypatch.setattr('requests.get', mock_get)
+    return mock_get
 
-def mock_xarray_open_mfdataset(dataset=None, side_effect=None):
-    """Context manager for mocking xarray.open_mfdataset"""
+def patch_xarray_open_mfdataset(monkeypatch, dataset=None, side_effect=None):
+    """Patch xarray.open_mfdataset for the current test and return the stand-in mock"""
     if dataset is None:
-        dataset = MockXarrayDataset()
+        dataset = default_mock_dataset()
     
-    return patch('xarray.open_mfdataset', return_value=dataset, side_effect=side_effect)
+    mock_open = Mock(return_value=dataset, side_effect=side_effect)
+    monkeypatch.setattr('xarray.open_mfdataset', mock_open)
+    return mock_open
 
-def mock_pathlib_operations():
-    """Context manager for mocking pathlib operations"""
-    return patch.multiple(
-        'pathlib.Path',
-        exists=Mock(return_value=True),
-        mkdir=Mock(),
-        unlink=Mock(),
-        write_bytes=Mock(),
-        stat=Mock(return_value=Mock(st_size=1024))
-    )
+def patch_pathlib_operations(monkeypatch, size=1024):
+    """Patch pathlib.Path file operations so nothing touches the disk"""
+    stat_result = SimpleNamespace(st_size=size)
+    monkeypatch.setattr(Path, 'exists', lambda self: True)
+    monkeypatch.setattr(Path, 'mkdir', lambda self, *args, **kwargs: None)
+    monkeypatch.setattr(Path, 'unlink', lambda self, *args, **kwargs: None)
+    monkeypatch.setattr(Path, 'write_bytes', lambda self, data: len(data))
+    monkeypatch.setattr(Path, 'stat', lambda self, *args, **kwargs: stat_result)
 
-def mock_yaml_load(config_data):
-    """Context manager for mocking YAML file loading"""
-    return patch('yaml.safe_load', return_value=config_data)
+def patch_yaml_load(monkeypatch, config_data):
+    """Patch yaml.safe_load to return config_data for the current test"""
+    monkeypatch.setattr('yaml.safe_load', lambda *args, **kwargs: config_data)
 
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
+# GRIB2 files have specific structure; built once since the content is fixed
+_MOCK_GRIB_CONTENT = b''.join([
+    b'GRIB',                                # GRIB indicator
+    b'\x00\x00',                            # Reserved
+    b'\x00',                                # Discipline
+    b'\x02',                                # GRIB edition number (2)
+    b'\x00\x00\x00\x00\x00\x00\x04\x00',    # Total message length
+    # Simplified sections (normally much more complex)
+    bytes(21),                              # Identification section
+    bytes(72),                              # Grid definition section
+    bytes(34),                              # Product definition section
+    bytes(23),                              # Data representation section
+    bytes(6),                               # Bit map section
+    bytes(500),                             # Data section
+    b'7777',                                # End section
+])
+
+# Very simplified NetCDF (HDF5) header
+_MOCK_NETCDF_CONTENT = b'\x89HDF\r\n\x1a\n' + bytes(1000)
+
 def create_mock_grib_content():
     """Create realistic mock GRIB2 file content"""
-    # GRIB2 files have specific structure
-    header = b'GRIB'              # GRIB indicator
-    reserved = b'\x00\x00'        # Reserved
-    discipline = b'\x00'          # Discipline
-    edition = b'\x02'             # GRIB edition number (2)
-    total_length = b'\x00\x00\x00\x00\x00\x00\x04\x00'  # Total message length
-    
-    # Simplified sections (normally much more complex)
-    section1 = b'\x00' * 21       # Identification section
-    section3 = b'\x00' * 72       # Grid definition section  
-    section4 = b'\x00' * 34       # Product definition section
-    section5 = b'\x00' * 23       # Data representation section
-    section6 = b'\x00' * 6        # Bit map section
-    section7 = b'\x00' * 500      # Data section
-    
-    footer = b'7777'              # End section
-    
-    return header + reserved + discipline + edition + total_length + \
-           section1 + section3 + section4 + section5 + section6 + section7 + footer
+    return _MOCK_GRIB_CONTENT
 
 def create_mock_netcdf_content():
     """Create simple mock NetCDF content"""
-    # Very simplified NetCDF header
-    return b'\x89HDF\r\n\x1a\n' + b'\x00' * 1000
+    return _MOCK_NETCDF_CONTENT
 
 def assert_mock_called_with_pattern(mock_obj, pattern):
     """Assert that mock was called with arguments matching pattern"""
-    for call in mock_obj.call_args_list:
-        args, kwargs = call
-        if any(pattern in str(arg) for arg in args):
-            return True
-        if any(pattern in str(val) for val in kwargs.values()):
+    # One substring scan per call; the NUL separator keeps matches from
+    # spanning two arguments
+    for args, kwargs in mock_obj.call_args_list:
+        blob = '\0'.join(map(str, (*args, *kwargs.values())))
+        if pattern in blob:
             return True
     return False
@@ -5,7 +5,7 @@ Tests the utility functions and internal logic of the CLI module.
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, MagicMock
 from pathlib import Path
 from datetime import datetime
 
@@ -20,325 +20,290 @@ from src.cli.main import (
 )
 
 
-class TestModelNameMapping:
-    """Test model name mapping functionality"""
-    
-    def test_get_full_model_name_all_models(self):
-        """Test mapping for all defined models"""
-        # Test all models in mapping
-        for cli_name, full_name in MODEL_NAME_MAPPING.items():
-            assert get_full_model_name(cli_name) == full_name
-    
-    def test_get_full_model_name_case_insensitive(self):
-        """Test case insensitive mapping"""
-        assert get_full_model_name('GFS') == 'gfs.0p25'
-        assert get_full_model_name('Gfs') == 'gfs.0p25'
-        assert get_full_model_name('gFs') == 'gfs.0p25'
-        
-        assert get_full_model_name('ECMWF') == 'ecmwf.0p25'
-        assert get_full_model_name('EcMwF') == 'ecmwf.0p25'
-    
-    def test_get_full_model_name_unknown_model(self):
-        """Test behavior with unknown model"""
-        assert get_full_model_name('unknown') == 'unknown'
-        assert get_full_model_name('custom_model') == 'custom_model'
-        assert get_full_model_name('') == ''
-    
-    def test_model_name_mapping_constants(self):
-        """Test that mapping constants are correctly defined"""
-        assert 'gfs' in MODEL_NAME_MAPPING
-        assert 'ecmwf' in MODEL_NAME_MAPPING
-        assert 'gem' in MODEL_NAME_MAPPING
-        
-        assert MODEL_NAME_MAPPING['gfs'] == 'gfs.0p25'
-        assert MODEL_NAME_MAPPING['ecmwf'] == 'ecmwf.0p25'
-        assert MODEL_NAME_MAPPING['gem'] == 'gem.0p1'
-
-
-class TestForecastHoursCalculation:
-    """Test forecast hours calculation from days"""
-    
-    def setup_method(self):
-        """Setup test data"""
-        self.simple_model_config = {
-            'cycle_forecast_ranges': {
-                '00': [[0, 72, 1]],  # 0-72h every hour
-                '06': [[0, 72, 1]],
-                '12': [[0, 72, 1]],
-                '18': [[0, 72, 1]]
-            }
-        }
-        
-        self.gfs_model_config = {
-            'cycle_forecast_ranges': {
-                '00': [[0, 120, 1], [123, 240, 3]],  # Realistic GFS
-                '06': [[0, 120, 1], [123, 240, 3]],
-                '12': [[0, 120, 1], [123, 240, 3]],
-                '18': [[0, 120, 1], [123, 240, 3]]
-            }
-        }
-    
-    @pytest.mark.parametrize("days,expected_max_hour", [
-        (0.5, 12),   # Half day
-        (1.0, 24),   # One day  
-        (2.0, 48),   # Two days
-        (3.0, 72),   # Three days (at model limit)
-    ])
-    def test_calculate_forecast_hours_simple_model(self, days, expected_max_hour):
-        """Test calculation with simple hourly model"""
-        result = calculate_forecast_hours_from_days(days, self.simple_model_config)
-        
-        # Should generate hours from 0 to expected_max_hour
-        expected_hours = list(range(0, min(expected_max_hour + 1, 73)))
-        assert result == expected_hours
-    
-    def test_calculate_forecast_hours_gfs_half_day(self):
-        """Test calculation for GFS model - half day"""
-        result = calculate_forecast_hours_from_days(0.5, self.gfs_model_config)
-        expected = list(range(0, 13))  # 0-12h
-        assert result == expected
-    
-    def test_calculate_forecast_hours_gfs_one_day(self):
-        """Test calculation for GFS model - one day"""
-        result = calculate_forecast_hours_from_days(1.0, self.gfs_model_config)
-        expected = list(range(0, 25))  # 0-24h
-        assert result == expected
-    
-    def test_calculate_forecast_hours_gfs_five_days(self):
-        """Test calculation for GFS model - five days (at boundary)"""
-        result = calculate_forecast_hours_from_days(5.0, self.gfs_model_config)
-        expected = list(range(0, 121))  # 0-120h hourly
-        assert result == expected
-    
-    def test_calculate_forecast_hours_gfs_six_days(self):
-        """Test calculation for GFS model - six days (crosses to 3-hourly)"""
-        result = calculate_forecast_hours_from_days(6.0, self.gfs_model_config)
-        
-        # Should get 0-120h hourly, then 123, 126, 129, 132, 135, 138, 141, 144
-        hourly_part = list(range(0, 121))
-        three_hourly_part = [123, 126, 129, 132, 135, 138, 141, 144]
-        expected = hourly_part + three_hourly_part
-        
-        assert result == expected
-    
-    def test_calculate_forecast_hours_gfs_ten_days(self):
-        """Test calculation for GFS model - ten days (full range)"""
-        result = calculate_forecast_hours_from_days(10.0, self.gfs_model_config)
-        
-        # Should get 0-120h hourly, then 123-240h every 3h
-        hourly_part = list(range(0, 121))
-        three_hourly_part = list(range(123, 241, 3))
-        expected = hourly_part + three_hourly_part
-        
-        assert result == expected
-    
-    def test_calculate_forecast_hours_decimal_days(self):
-        """Test calculation with decimal days"""
-        # 1.5 days = 36 hours
-        result = calculate_forecast_hours_from_days(1.5, self.simple_model_config)
-        expected = list(range(0, 37))  # 0-36h
-        assert result == expected
-        
-        # 0.25 days = 6 hours
-        result = calculate_forecast_hours_from_days(0.25, self.simple_model_config)
-        expected = list(range(0, 7))  # 0-6h
-        assert result == expected
-    
-    def test_calculate_forecast_hours_edge_cases(self):
-        """Test edge cases"""
-        # Zero days
-        result = calculate_forecast_hours_from_days(0.0, self.simple_model_config)
-        expected = [0]  # Just hour 0
-        assert result == expected
-        
-        # Very large number of days (should be limited by model max)
-        result = calculate_forecast_hours_from_days(100.0, self.simple_model_config)
-        expected = list(range(0, 73))  # Limited to model max
-        assert result == expected
-    
-    def test_calculate_forecast_hours_complex_model(self):
-        """Test with more complex model configuration"""
-        complex_config = {
-            'cycle_forecast_ranges': {
-                '00': [[0, 24, 1], [27, 72, 3], [78, 168, 6]],
-                '12': [[0, 48, 1], [51, 120, 3]]
-            }
-        }
-        
-        # 1 day (24 hours) - should be hourly
-        result = calculate_forecast_hours_from_days(1.0, complex_config)
-        expected = list(range(0, 25))  # 0-24h
-        assert result == expected
-        
-        # 2 days (48 hours) - crosses into 3-hourly
-        result = calculate_forecast_hours_from_days(2.0, complex_config)
-        expected = list(range(0, 25)) + [27, 30, 33, 36, 39, 42, 45, 48]
-        assert result == expected
-
-
-class TestCleanupFunctionality:
-    """Test file cleanup functionality"""
-    
-    def setup_method(self):
-        """Setup mock data"""
-        self.test_config = {
-            'output_dir': 'test_data',
-            'models': {
-                'gfs.0p25': {'out_file': 'gfs.0p25'}
-            }
+# ============================================================================
+# MODEL NAME MAPPING
+# ============================================================================
+
+@pytest.mark.parametrize("cli_name,full_name", list(MODEL_NAME_MAPPING.items()))
+def test_get_full_model_name_all_models(cli_name, full_name):
+    """Test mapping for all defined models"""
+    assert get_full_model_name(cli_name) == full_name
+
+@pytest.mark.parametrize("cli_name,full_name", [
+    ('GFS', 'gfs.0p25'),
+    ('Gfs', 'gfs.0p25'),
+    ('gFs', 'gfs.0p25'),
+    ('ECMWF', 'ecmwf.0p25'),
+    ('EcMwF', 'ecmwf.0p25'),
+])
+def test_get_full_model_name_case_insensitive(cli_name, full_name):
+    """Test case insensitive mapping"""
+    assert get_full_model_name(cli_name) == full_name
+
+def test_get_full_model_name_unknown_model():
+    """Test behavior with unknown model"""
+    assert get_full_model_name('unknown') == 'unknown'
+    assert get_full_model_name('custom_model') == 'custom_model'
+    assert get_full_model_name('') == ''
+
+def test_model_name_mapping_constants():
+    """Test that mapping constants are correctly defined"""
+    assert 'gfs' in MODEL_NAME_MAPPING
+    assert 'ecmwf' in MODEL_NAME_MAPPING
+    assert 'gem' in MODEL_NAME_MAPPING
+
+    assert MODEL_NAME_MAPPING['gfs'] == 'gfs.0p25'
+    assert MODEL_NAME_MAPPING['ecmwf'] == 'ecmwf.0p25'
+    assert MODEL_NAME_MAPPING['gem'] == 'gem.0p1'
+
+
+# ============================================================================
+# FORECAST HOURS CALCULATION FROM DAYS
+# ============================================================================
+
+@pytest.mark.parametrize("days,expected_max_hour", [
+    (0.5, 12),   # Half day
+    (1.0, 24),   # One day  
+    (2.0, 48),   # Two days
+    (3.0, 72),   # Three days (at model limit)
+])
+def test_calculate_forecast_hours_simple_model(simple_model_config, days, expected_max_hour):
+    """Test calculation with simple hourly model"""
+    result = calculate_forecast_hours_from_days(days, simple_model_config)
+
+    # Should generate hours from 0 to expected_max_hour
+    expected_hours = list(range(0, min(expected_max_hour + 1, 73)))
+    assert result == expected_hours
+
+@pytest.mark.parametrize("days,expected", [
+    (0.5, list(range(0, 13))),    # Half day: 0-12h
+    (1.0, list(range(0, 25))),    # One day: 0-24h
+    (5.0, list(range(0, 121))),   # Five days: 0-120h hourly (at boundary)
+    # Six days crosses to 3-hourly: 123, 126, ..., 144
+    (6.0, list(range(0, 121)) + [123, 126, 129, 132, 135, 138, 141, 144]),
+    # Ten days: full range, 123-240h every 3h
+    (10.0, list(range(0, 121)) + list(range(123, 241, 3))),
+])
+def test_calculate_forecast_hours_gfs(gfs_model_config, days, expected):
+    """Test calculation for GFS model across the hourly/3-hourly boundary"""
+    result = calculate_forecast_hours_from_days(days, gfs_model_config)
+    assert result == expected
+
+def test_calculate_forecast_hours_returns_independent_lists(gfs_model_config):
+    """Test cached results are copied so callers can't corrupt each other"""
+    first = calculate_forecast_hours_from_days(1.0, gfs_model_config)
+    first.append(999)
+
+    second = calculate_forecast_hours_from_days(1.0, gfs_model_config)
+    assert second == list(range(0, 25))
+
+def test_calculate_forecast_hours_decimal_days(simple_model_config):
+    """Test calculation with decimal days"""
+    # 1.5 days = 36 hours
+    result = calculate_forecast_hours_from_days(1.5, simple_model_config)
+    expected = list(range(0, 37))  # 0-36h
+    assert result == expected
+
+    # 0.25 days = 6 hours
+    result = calculate_forecast_hours_from_days(0.25, simple_model_config)
+    expected = list(range(0, 7))  # 0-6h
+    assert result == expected
+
+def test_calculate_forecast_hours_edge_cases(simple_model_config):
+    """Test edge cases"""
+    # Zero days
+    result = calculate_forecast_hours_from_days(0.0, simple_model_config)
+    expected = [0]  # Just hour 0
+    assert result == expected
+
+    # Very large number of days (should be limited by model max)
+    result = calculate_forecast_hours_from_days(100.0, simple_model_config)
+    expected = list(range(0, 73))  # Limited to model max
+    assert result == expected
+
+def test_calculate_forecast_hours_complex_model():
+    """Test with more complex model configuration"""
+    complex_config = {
+        'cycle_forecast_ranges': {
+            '00': [[0, 24, 1], [27, 72, 3], [78, 168, 6]],
+            '12': [[0, 48, 1], [51, 120, 3]]
         }
-    
-    @patch('src.cli.main.Path')
-    def test_cleanup_existing_files_structure(self, mock_path_class):
-        """Test that cleanup creates correct directory structure"""
-        mock_path = Mock()
-        mock_path.exists.return_value = True
-        mock_path.glob.return_value = []
-        mock_path_class.return_value = mock_path
-        
-        mock_variable_mapper = Mock()
-        cleanup_existing_files('gfs.0p25', '20250828', '00', [0, 1, 2], mock_variable_mapper)
-        
-        # Should check for base raw directory
-        expected_base_path = 'test_data/gfs.0p25/20250828/00/raw'
-        mock_path_class.assert_called()
-    
-    # TODO: Re-implement complex cleanup tests with proper Path mocking
-    # @patch('src.cli.main.Path')
-    # def test_cleanup_existing_files_removes_files(self, mock_path_class):
-    #     """Test that cleanup removes existing files"""
-    #     # Complex Path mocking - implement later
-    #     pass
-    
-    # @patch('src.cli.main.Path')  
-    # def test_cleanup_existing_files_creates_directories(self, mock_path_class):
-    #     """Test that cleanup creates necessary directories"""
-    #     # Complex Path mocking - implement later
-    #     pass
-
-
-class TestProcessDownloadedFiles:
-    """Test processing of downloaded files"""
-    
-    # TODO: Re-implement complex process tests with proper mocking
-    # @patch('src.core.processors.grib_processor.GRIBProcessor')
-    # @patch('src.cli.main.Path')
-    # def test_process_downloaded_files_basic(self, mock_path_class, mock_processor_class):
-    #     """Test basic file processing functionality"""
-    #     # Complex processing mocking - implement later
-    #     pass
-    
-    # @patch('src.core.processors.grib_processor.GRIBProcessor')
-    # @patch('src.cli.main.Path')
-    # def test_process_downloaded_files_no_files_found(self, mock_path_class, mock_processor_class):
-    #     """Test behavior when no files are found"""
-    #     # Complex processing mocking - implement later
-    #     pass
-
-
-class TestFilenamePatterns:
-    """Test filename pattern constants and usage"""
-    
-    def test_filename_pattern_constants(self):
-        """Test that filename patterns are correctly defined"""
-        assert '{out_file}' in OUTPUT_FILENAME_PATTERN
-        assert '{date}' in OUTPUT_FILENAME_PATTERN
-        assert '{cycle}' in OUTPUT_FILENAME_PATTERN
-        assert '{extension}' in OUTPUT_FILENAME_PATTERN
-        
-        assert '{date}' in DATE_CYCLE_SUFFIX
-        assert '{cycle}' in DATE_CYCLE_SUFFIX
-    
-    def test_filename_pattern_formatting(self):
-        """Test filename pattern formatting"""
-        test_pattern = OUTPUT_FILENAME_PATTERN.format(
-            out_file='gfs.0p25',
-            date='20250828',
-            cycle='00',
-            extension='nc'
-        )
-        
-        assert 'gfs.0p25' in test_pattern
-        assert '20250828' in test_pattern
-        assert '00' in test_pattern
-        assert 'nc' in test_pattern
-
-
-class TestErrorHandling:
-    """Test error handling in helper functions"""
-    
-    # TODO: Fix invalid config test - function logs empty list causing IndexError
-    # def test_calculate_forecast_hours_invalid_config(self):
-    #     """Test behavior with invalid model config"""
-    #     invalid_config = {}  # Missing required keys
-    #     
-    #     # Function currently has logging issue with empty list
-    #     # Need to fix logging before re-enabling this test
-    #     pass
-    
-    def test_calculate_forecast_hours_malformed_ranges(self):
-        """Test behavior with malformed forecast ranges"""
-        malformed_config = {
-            'cycle_forecast_ranges': {
-                '00': [['invalid', 'range', 'format']]
-            }
+    }
+
+    # 1 day (24 hours) - should be hourly
+    result = calculate_forecast_hours_from_days(1.0, complex_config)
+    expected = list(range(0, 25))  # 0-24h
+    assert result == expected
+
+    # 2 days (48 hours) - crosses into 3-hourly
+    result = calculate_forecast_hours_from_days(2.0, complex_config)
+    expected = list(range(0, 25)) + [27, 30, 33, 36, 39, 42, 45, 48]
+    assert result == expected
+
+
+# ============================================================================
+# FILE CLEANUP
+# ============================================================================
+
+def test_cleanup_existing_files_structure(monkeypatch, fake_path):
+    """Test that cleanup creates correct directory structure"""
+    monkeypatch.setattr('src.cli.main.Path', fake_path)
+
+    mock_variable_mapper = Mock()
+    cleanup_existing_files('gfs.0p25', '20250828', '00', [0, 1, 2], mock_variable_mapper)
+
+    # Should check for base raw directory
+    expected_base_path = 'data/gfs.0p25/20250828/00/raw'
+    base_dirs = [p for p in fake_path.instances if str(p) == expected_base_path]
+    assert base_dirs
+    assert ('exists',) in base_dirs[0].calls
+    assert ('glob', 'gfs.t00z.pgrb2.0p25.f002.20250828.nc') in base_dirs[0].calls
+
+# TODO: Re-implement complex cleanup tests with proper Path mocking
+# @patch('src.cli.main.Path')
+# def test_cleanup_existing_files_removes_files(mock_path_class):
+#     """Test that cleanup removes existing files"""
+#     # Complex Path mocking - implement later
+#     pass
+
+# @patch('src.cli.main.Path')  
+# def test_cleanup_existing_files_creates_directories(mock_path_class):
+#     """Test that cleanup creates necessary directories"""
+#     # Complex Path mocking - implement later
+#     pass
+
+
+# ============================================================================
+# PROCESSING OF DOWNLOADED FILES
+# ============================================================================
+
+# TODO: Re-implement complex process tests with proper mocking
+# @patch('src.core.processors.grib_processor.GRIBProcessor')
+# @patch('src.cli.main.Path')
+# def test_process_downloaded_files_basic(mock_path_class, mock_processor_class):
+#     """Test basic file processing functionality"""
+#     # Complex processing mocking - implement later
+#     pass
+
+# @patch('src.core.processors.grib_processor.GRIBProcessor')
+# @patch('src.cli.main.Path')
+# def test_process_downloaded_files_no_files_found(mock_path_class, mock_processor_class):
+#     """Test behavior when no files are found"""
+#     # Complex processing mocking - implement later
+#     pass
+
+
+# ============================================================================
+# FILENAME PATTERN CONSTANTS AND USAGE
+# ============================================================================
+
+def test_filename_pattern_constants():
+    """Test that filename patterns are correctly defined"""
+    assert '{out_file}' in OUTPUT_FILENAME_PATTERN
+    assert '{date}' in OUTPUT_FILENAME_PATTERN
+    assert '{cycle}' in OUTPUT_FILENAME_PATTERN
+    assert '{extension}' in OUTPUT_FILENAME_PATTERN
+
+    assert '{date}' in DATE_CYCLE_SUFFIX
+    assert '{cycle}' in DATE_CYCLE_SUFFIX
+
+def test_filename_pattern_formatting():
+    """Test filename pattern formatting"""
+    test_pattern = OUTPUT_FILENAME_PATTERN.format(
+        out_file='gfs.0p25',
+        date='20250828',
+        cycle='00',
+        extension='nc'
+    )
+
+    assert 'gfs.0p25' in test_pattern
+    assert '20250828' in test_pattern
+    assert '00' in test_pattern
+    assert 'nc' in test_pattern
+
+
+# ============================================================================
+# ERROR HANDLING IN HELPER FUNCTIONS
+# ============================================================================
+
+# TODO: Fix invalid config test - function logs empty list causing IndexError
+# def test_calculate_forecast_hours_invalid_config():
+#     """Test behavior with invalid model config"""
+#     invalid_config = {}  # Missing required keys
+#     
+#     # Function currently has logging issue with empty list
+#     # Need to fix logging before re-enabling this test
+#     pass
+
+def test_calculate_forecast_hours_malformed_ranges():
+    """Test behavior with malformed forecast ranges"""
+    malformed_config = {
+        'cycle_forecast_ranges': {
+            '00': [['invalid', 'range', 'format']]
         }
-        
-        with pytest.raises((ValueError, TypeError)):
-            calculate_forecast_hours_from_days(1.0, malformed_config)
-    
-    # TODO: Re-implement permission error test with proper Path mocking
-    # @patch('src.cli.main.Path')
-    # def test_cleanup_files_permission_error(self, mock_path_class):
-    #     """Test cleanup behavior with permission errors"""
-    #     # Complex error handling mocking - implement later
-    #     pass
-
-
-class TestIntegrationHelpers:
-    """Test integration between helper functions"""
-    
-    def test_model_name_mapping_with_cleanup(self):
-        """Test that model name mapping works with cleanup"""
-        cli_name = 'gfs'
-        full_name = get_full_model_name(cli_name)
-        
-        assert full_name == 'gfs.0p25'
-        
-        # This full name should be usable in cleanup
-        with patch('src.cli.main.Path') as mock_path:
-            mock_path.return_value.exists.return_value = False
-            
-            # Should not raise error
-            cleanup_existing_files(full_name, '20250828', '00', [0, 1, 2], Mock())
-    
-    def test_forecast_hours_realistic_workflow(self):
-        """Test forecast hours calculation in realistic workflow"""
-        # Simulate realistic GFS config
-        gfs_config = {
-            'cycle_forecast_ranges': {
-                '00': [[0, 120, 1], [123, 240, 3]]
-            }
+    }
+
+    with pytest.raises((ValueError, TypeError)):
+        calculate_forecast_hours_from_days(1.0, malformed_config)
+
+# TODO: Re-implement permission error test with proper Path mocking
+# @patch('src.cli.main.Path')
+# def test_cleanup_files_permission_error(mock_path_class):
+#     """Test cleanup behavior with permission errors"""
+#     # Complex error handling mocking - implement later
+#     pass
+
+
+# ============================================================================
+# INTEGRATION BETWEEN HELPER FUNCTIONS
+# ============================================================================
+
+def test_model_name_mapping_with_cleanup(monkeypatch, fake_path):
+    """Test that model name mapping works with cleanup"""
+    cli_name = 'gfs'
+    full_name = get_full_model_name(cli_name)
+
+    assert full_name == 'gfs.0p25'
+
+    # This full name should be usable in cleanup
+    monkeypatch.setattr('src.cli.main.Path', fake_path)
+    monkeypatch.setattr(fake_path, 'existing', False)
+
+    # Should not raise error
+    cleanup_existing_files(full_name, '20250828', '00', [0, 1, 2], Mock())
+
+    # Nothing exists, so nothing is searched or removed
+    assert fake_path.instances
+    assert not any(call[0] in ('glob', 'unlink')
+                   for p in fake_path.instances for call in p.calls)
+
+def test_forecast_hours_realistic_workflow():
+    """Test forecast hours calculation in realistic workflow"""
+    # Simulate realistic GFS config
+    gfs_config = {
+        'cycle_forecast_ranges': {
+            '00': [[0, 120, 1], [123, 240, 3]]
         }
-        
-        # Test various realistic scenarios
-        test_cases = [
-            (0.5, 'Quick forecast'),    # 12 hours
-            (1.0, 'Daily forecast'),    # 24 hours  
-            (3.0, 'Extended forecast'), # 72 hours
-            (7.0, 'Weekly forecast'),   # 168 hours
-        ]
-        
-        for days, description in test_cases:
-            result = calculate_forecast_hours_from_days(days, gfs_config)
-            
-            # Should return valid list of integers
-            assert isinstance(result, list)
-            assert all(isinstance(h, int) for h in result)
-            assert all(h >= 0 for h in result)
-            
-            # Should start with 0
-            assert result[0] == 0
-            
-            # Should be sorted
-            assert result == sorted(result)
+    }
+
+    # Test various realistic scenarios
+    test_cases = [
+        (0.5, 'Quick forecast'),    # 12 hours
+        (1.0, 'Daily forecast'),    # 24 hours  
+        (3.0, 'Extended forecast'), # 72 hours
+        (7.0, 'Weekly forecast'),   # 168 hours
+    ]
+
+    for days, description in test_cases:
+        result = calculate_forecast_hours_from_days(days, gfs_config)
+
+        # Should return valid list of integers
+        assert isinstance(result, list)
+        assert all(isinstance(h, int) for h in result)
+        assert all(h >= 0 for h in result)
+
+        # Should start with 0
+        assert result[0] == 0
+
+        # Should be sorted
+        assert result == sorted(result)
@@ -9,7 +9,16 @@ import yaml
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
 
-from src.core.mapping.yaml_variable_mapper import YAMLVariableMapper
+from src.core.mapping import yaml_variable_mapper
+from src.core.mapping.yaml_variable_mapper import YAMLVariableMapper, _load_yaml_cached
+
+
+@pytest.fixture(autouse=True)
+def clear_yaml_cache():
+    """Keep parses made under a patched yaml.safe_load from leaking between tests"""
+    yaml_variable_mapper._yaml_cache.clear()
+    yield
+    yaml_variable_mapper._yaml_cache.clear()
 
 
 class TestYAMLVariableMapperBasic:
@@ -229,6 +238,23 @@ class TestYAMLVariableMapperForecastHours:
             # If it fails due to model/cycle not being supported, that's acceptable
             pass
     
+    def test_get_forecast_hours_for_model_merges_cycles_sorted(self):
+        """Test forecast hours from overlapping cycle ranges come back sorted and unique"""
+        self.mapper.models_config = {
+            'models': {
+                'gfs.0p25': {
+                    'cycle_forecast_ranges': {
+                        '00': [[0, 6, 1], [9, 24, 3]],
+                        '12': [[0, 12, 2]]
+                    }
+                }
+            }
+        }
+
+        result = self.mapper.get_forecast_hours_for_model('gfs', max_forecast=18)
+
+        assert result == [0, 1, 2, 3, 4, 5, 6, 8, 9, 10, 12, 15, 18]
+
     def test_get_forecast_hours_unknown_model(self):
         """Test forecast hours for unknown model"""
         # Should handle unknown models gracefully
@@ -300,4 +326,81 @@ class TestYAMLVariableMapperIntegration:
                 mapper.validate_variables(['test_var'], 'gfs')
             except (KeyError, ValueError, AttributeError):
                 # These exceptions are acceptable for missing configuration
-                pass
\ No newline at end of file
+                pass
+
+class TestYAMLVariableMapperTryGet:
+    """Test non-raising lookups"""
+    
+    def setup_method(self):
+        """Setup with a small mapping"""
+        mapping = {'standard_variables': {
+            't2m': {'gfs': 'TMP', 'ecmwf': '2t'},
+            'tmp_alias': {'gfs': 'TMP'},
+            'rh2m': {'gfs': 'RH'},
+        }}
+        with patch.object(YAMLVariableMapper, '_load_mapping', return_value=mapping), \
+             patch('builtins.open', mock_open()), \
+             patch('src.core.mapping.yaml_variable_mapper.yaml.safe_load', return_value={'models': {}}):
+            
+            self.mapper = YAMLVariableMapper(Path("test.yaml"))
+    
+    def test_try_get_model_variable_code(self):
+        """Test mapped codes are returned and misses give None"""
+        assert self.mapper.try_get_model_variable_code('t2m', 'ecmwf') == '2t'
+        assert self.mapper.try_get_model_variable_code('rh2m', 'ecmwf') is None
+        assert self.mapper.try_get_model_variable_code('unknown', 'gfs') is None
+    
+    def test_try_get_standard_variable_name_keeps_first_match(self):
+        """Test the reverse lookup returns the first standard name per code"""
+        assert self.mapper.try_get_standard_variable_name('TMP', 'gfs') == 't2m'
+        assert self.mapper.try_get_standard_variable_name('RH', 'gfs') == 'rh2m'
+        assert self.mapper.try_get_standard_variable_name('RH', 'ecmwf') is None
+        assert self.mapper.get_standard_variable_name('2t', 'ecmwf') == 't2m'
+        
+        with pytest.raises(ValueError, match="Unknown model code"):
+            self.mapper.get_standard_variable_name('XYZ', 'gfs')
+
+
+class TestYAMLCache:
+    """Test the in-memory YAML cache used by the mapper"""
+    
+    def test_parse_reused_for_unchanged_text(self, tmp_path):
+        """Test identical YAML text is parsed once and reused afterwards"""
+        yaml_file = tmp_path / "mapping.yaml"
+        yaml_file.write_text("standard_variables:\n  t2m:\n    gfs: TMP\n")
+        
+        first = _load_yaml_cached(yaml_file)
+        
+        with patch('src.core.mapping.yaml_variable_mapper.yaml.safe_load') as mock_load:
+            second = _load_yaml_cached(yaml_file)
+            mock_load.assert_not_called()
+        
+        assert first == second == {'standard_variables': {'t2m': {'gfs': 'TMP'}}}
+        assert not list(tmp_path.glob("*.pkl"))
+    
+    def test_cache_invalidated_when_yaml_changes(self, tmp_path):
+        """Test editing the YAML file bypasses the stale cache"""
+        yaml_file = tmp_path / "mapping.yaml"
+        yaml_file.write_text("value: 1\n")
+        _load_yaml_cached(yaml_file)
+        
+        yaml_file.write_text("value: 2\n")
+        
+        assert _load_yaml_cached(yaml_file) == {'value': 2}
+    
+    def test_callers_get_independent_copies(self, tmp_path):
+        """Test mutating one loaded config does not leak into later loads"""
+        yaml_file = tmp_path / "mapping.yaml"
+        yaml_file.write_text("models:\n  gfs:\n    cycles: ['00']\n")
+        
+        _load_yaml_cached(yaml_file)['models']['gfs']['cycles'].append('06')
+        
+        assert _load_yaml_cached(yaml_file) == {'models': {'gfs': {'cycles': ['00']}}}
+    
+    def test_sidecar_pickle_is_never_loaded(self, tmp_path):
+        """Test a file dropped next to the YAML is not deserialized"""
+        yaml_file = tmp_path / "mapping.yaml"
+        yaml_file.write_text("value: 1\n")
+        (tmp_path / "mapping.yaml.pkl").write_bytes(b"not a pickle")
+        
+        assert _load_yaml_cached(yaml_file) == {'value': 1}
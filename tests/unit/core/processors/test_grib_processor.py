@@ -4,7 +4,13 @@ Unit tests for GRIB processor.
 Simplified tests focusing on basic functionality and initialization.
 """
 
+import threading
+import time
 import pytest
+import numpy as np
+import pandas as pd
+import xarray as xr
+import netCDF4
 from unittest.mock import Mock, patch
 from pathlib import Path
 
@@ -100,7 +106,29 @@ class TestGRIBProcessorConfiguration:
         
         # Should return original dataset when no config
         assert result == mock_dataset
-    
+
+    def test_filter_config_variables_resolves_codes_once(self):
+        """Test configured variables are kept and mapper lookups are reused across loads"""
+        codes = {'t2m': 'TMP', 'rh2m': 'RH'}
+        mock_mapper = Mock()
+        mock_mapper.get_supported_variables.return_value = list(codes)
+        mock_mapper.get_model_variable_code.side_effect = lambda std_var, model: codes[std_var]
+        processor = GRIBProcessor(
+            variable_mapper=mock_mapper,
+            user_config={'variables': ['t2m', 'rh2m', 'unknown']}
+        )
+        dataset = xr.Dataset({
+            name: (('latitude',), np.zeros(2)) for name in ['t', 't2m', 'r2', 'u10']
+        })
+
+        first = processor._filter_config_variables(dataset)
+        second = processor._filter_config_variables(dataset)
+
+        assert list(first.data_vars) == ['t2m', 'r2']
+        assert list(second.data_vars) == ['t2m', 'r2']
+        mock_mapper.get_supported_variables.assert_called_once_with('gfs')
+        assert mock_mapper.get_model_variable_code.call_count == 2
+
     def test_standardize_variable_names_no_mapper(self):
         """Test variable name standardization without mapper"""
         processor = GRIBProcessor()
@@ -120,6 +148,102 @@ class TestGRIBProcessorConfiguration:
         
         # Should return original dataset when no bounds
         assert result == mock_dataset
+    
+    def test_compression_defaults_to_zstd(self):
+        """Test Zstandard is used when no codec is configured"""
+        with patch('src.core.processors.grib_processor.netCDF4.__has_zstandard_support__', True, create=True):
+            processor = GRIBProcessor()
+        
+        assert processor._compression_encoding['compression'] == 'zstd'
+        assert 'zlib' not in processor._compression_encoding
+    
+    def test_compression_zlib_codec_from_config(self):
+        """Test zlib can be selected through the processing config"""
+        config = {'processing': {'compression': {'codec': 'zlib'}}}
+        processor = GRIBProcessor(user_config=config)
+        
+        assert processor._compression_encoding['zlib'] is True
+        assert 'compression' not in processor._compression_encoding
+    
+    def test_compression_level_from_config(self):
+        """Test the configured level is used, with a per-codec default otherwise"""
+        config = {'processing': {'compression': {'codec': 'zlib', 'level': 2}}}
+        
+        assert GRIBProcessor(user_config=config)._compression_encoding['complevel'] == 2
+        with patch('src.core.processors.grib_processor.netCDF4.__has_zstandard_support__', True, create=True):
+            assert GRIBProcessor()._compression_encoding['complevel'] == 3
+    
+    def test_compression_falls_back_to_zlib_without_zstd_support(self):
+        """Test zlib is used when the netCDF library lacks the zstd filter"""
+        with patch('src.core.processors.grib_processor.netCDF4.__has_zstandard_support__', False, create=True):
+            processor = GRIBProcessor()
+        
+        assert processor._compression_encoding['zlib'] is True
+    
+    def test_checksums_only_when_requested(self):
+        """Test Fletcher32 checksums are opt-in through the netcdf config"""
+        config = {'processing': {'netcdf': {'verify_checksums': True}}}
+        
+        assert 'fletcher32' not in GRIBProcessor()._compression_encoding
+        assert GRIBProcessor(user_config=config)._compression_encoding['fletcher32'] is True
+
+
+class TestGRIBProcessorCoordinateNames:
+    """Test coordinate renaming and dimension ordering"""
+
+    def setup_method(self):
+        """Setup for each test"""
+        self.processor = GRIBProcessor()
+
+    def test_standardize_coordinate_names_keeps_ordered_dataset(self):
+        """Test an already ordered dataset is returned without being rebuilt"""
+        dataset = xr.Dataset({
+            't2m': (('time', 'latitude', 'longitude'), np.zeros((2, 3, 4))),
+            'orog': (('latitude', 'longitude'), np.zeros((3, 4))),
+        })
+
+        result = self.processor._standardize_coordinate_names(dataset)
+
+        assert result is dataset
+
+    def test_standardize_coordinate_names_reorders_dimensions(self):
+        """Test renamed coordinates are moved to time, latitude, longitude order"""
+        dataset = xr.Dataset(
+            {'t2m': (('lon', 'level', 'time', 'lat'), np.zeros((4, 5, 2, 3)))},
+            coords={'lat': np.arange(3.0), 'lon': np.arange(4.0)}
+        )
+        dataset.t2m.encoding['dtype'] = 'float32'
+
+        result = self.processor._standardize_coordinate_names(dataset)
+
+        assert result.t2m.dims == ('time', 'latitude', 'longitude', 'level')
+        assert result.t2m.encoding['dtype'] == 'float32'
+
+    def test_standardize_dataset_matches_step_by_step_result(self):
+        """Test the fused pass equals coordinate, filter and rename steps applied in turn"""
+        codes = {'t2m': 'TMP', 'rh2m': 'RH', 'hgt': 'HGT'}
+        mock_mapper = Mock()
+        mock_mapper.get_supported_variables.return_value = list(codes)
+        mock_mapper.get_model_variable_code.side_effect = lambda std_var, model: codes[std_var]
+        processor = GRIBProcessor(variable_mapper=mock_mapper, user_config={'variables': list(codes)})
+        dataset = xr.Dataset(
+            {
+                't2m': (('lat', 'lon', 'time'), np.random.rand(3, 4, 2)),
+                'r2': (('time', 'lat', 'lon'), np.random.rand(2, 3, 4)),
+                'u10': (('time', 'lat', 'lon'), np.random.rand(2, 3, 4)),
+                'orog': (('lat', 'lon'), np.random.rand(3, 4)),
+            },
+            coords={'lat': np.arange(3.0), 'lon': np.arange(4.0), 'time': [0, 1]}
+        )
+        
+        fused = processor._standardize_dataset(dataset)
+        stepwise = processor._standardize_variable_names(
+            processor._filter_config_variables(processor._standardize_coordinate_names(dataset))
+        )
+        
+        xr.testing.assert_identical(fused, stepwise)
+        assert set(fused.data_vars) == {'t2m', 'rh2m', 'hgt'}
+        assert fused['t2m'].dims == ('time', 'latitude', 'longitude')
 
 
 class TestGRIBProcessorValidation:
@@ -148,6 +272,22 @@ class TestGRIBProcessorValidation:
             self.processor.validate_data(mock_dataset)
 
 
+    def test_validate_data_reports_nan_counts_per_variable(self):
+        """Test NaN counts are reported only for variables containing NaNs"""
+        data = np.ones((2, 3, 4))
+        data[0, 0, :2] = np.nan
+        dataset = xr.Dataset({
+            't2m': (('time', 'latitude', 'longitude'), data),
+            'r2': (('time', 'latitude', 'longitude'), np.ones((2, 3, 4))),
+        }).chunk({'time': 1})
+        
+        with patch('src.core.processors.grib_processor.logger') as mock_logger:
+            self.processor.validate_data(dataset)
+        
+        mock_logger.warning.assert_called_once()
+        assert "t2m has 2 NaN values" in mock_logger.warning.call_args[0][0]
+
+
 class TestGRIBProcessorProcessMethod:
     """Test main process method with error handling"""
     
@@ -169,6 +309,299 @@ class TestGRIBProcessorProcessMethod:
         except Exception as e:
             # If it raises an exception, that's also expected behavior
             assert len(str(e)) > 0
+    
+    def test_process_writes_both_outputs_from_single_load(self, tmp_path):
+        """Test processed and interpolated outputs are built from one loaded dataset"""
+        times = pd.date_range('2025-01-01', periods=3, freq='3h')
+        dataset = xr.Dataset(
+            {'t2m': (('time', 'latitude', 'longitude'), np.random.random((3, 4, 5)).astype('float32'))},
+            coords={'time': times, 'latitude': np.linspace(10, -10, 4), 'longitude': np.linspace(280, 300, 5)}
+        ).chunk({'time': 1})
+        input_file = tmp_path / "input.grb2"
+        input_file.write_bytes(b'GRIB')
+        output_path = tmp_path / "processed" / "output.nc"
+        
+        with patch.object(GRIBProcessor, '_load_grib_files', return_value=dataset) as mock_load:
+            metadata = self.processor.process([input_file], output_path)
+        
+        mock_load.assert_called_once()
+        assert metadata['outputs']['processed'].exists()
+        assert metadata['outputs']['interpolated'].exists()
+        with xr.open_dataset(metadata['outputs']['interpolated']) as interpolated:
+            assert interpolated.sizes['time'] == 7
+    
+    def test_process_persists_with_configured_workers(self, tmp_path):
+        """Test the shared dataset is persisted once on the configured thread pool"""
+        processor = GRIBProcessor(user_config={'processing': {'workers': 3}})
+        dataset = xr.Dataset(
+            {'t2m': (('time', 'latitude', 'longitude'), np.zeros((2, 4, 5), dtype='float32'))},
+            coords={'time': pd.date_range('2025-01-01', periods=2, freq='h'),
+                    'latitude': np.linspace(10, -10, 4), 'longitude': np.linspace(280, 300, 5)}
+        ).chunk({'time': 1})
+        input_file = tmp_path / "input.grb2"
+        input_file.write_bytes(b'GRIB')
+        
+        with patch.object(GRIBProcessor, '_load_grib_files', return_value=dataset), \
+             patch.object(xr.Dataset, 'persist', autospec=True, side_effect=lambda ds, **kwargs: ds) as mock_persist:
+            processor.process([input_file], tmp_path / "output.nc")
+        
+        mock_persist.assert_called_once()
+        assert mock_persist.call_args.kwargs == {'scheduler': 'threads', 'num_workers': 3}
+    
+    def test_process_computes_int16_packing_once(self, tmp_path):
+        """Test both outputs share the packing taken from the persisted dataset"""
+        processor = GRIBProcessor(user_config={'processing': {'compression': {'pack_int16': True}}})
+        dataset = xr.Dataset(
+            {'t2m': (('time', 'latitude', 'longitude'), np.random.random((3, 4, 5)).astype('float32'))},
+            coords={'time': pd.date_range('2025-01-01', periods=3, freq='3h'),
+                    'latitude': np.linspace(10, -10, 4), 'longitude': np.linspace(280, 300, 5)}
+        ).chunk({'time': 1})
+        input_file = tmp_path / "input.grb2"
+        input_file.write_bytes(b'GRIB')
+        
+        with patch.object(GRIBProcessor, '_load_grib_files', return_value=dataset), \
+             patch.object(GRIBProcessor, '_get_int16_packing', wraps=processor._get_int16_packing) as mock_packing:
+            metadata = processor.process([input_file], tmp_path / "output.nc")
+        
+        mock_packing.assert_called_once()
+        assert mock_packing.call_args.args[0].sizes['time'] == 3
+        with xr.open_dataset(metadata['outputs']['interpolated'], mask_and_scale=False) as interpolated:
+            assert interpolated['t2m'].dtype == np.int16
+
+
+class TestGRIBProcessorFallbackLoading:
+    """Test the per-level fallback used when open_mfdataset fails"""
+    
+    @staticmethod
+    def _level_dataset(file_path, level_filter):
+        hour = int(Path(file_path).name[-3:])
+        var_name = {'surface': 'orog', 2: 't2m', 10: 'u10'}[level_filter.get('level', level_filter['typeOfLevel'])]
+        return xr.Dataset(
+            {var_name: (('latitude', 'longitude'), np.full((2, 3), hour, dtype='float32'))},
+            coords={
+                'time': np.datetime64('2025-01-01T00'),
+                'valid_time': np.datetime64('2025-01-01T00') + np.timedelta64(hour, 'h'),
+                'latitude': [1.0, 0.0],
+                'longitude': [0.0, 1.0, 2.0],
+            }
+        )
+    
+    def test_fallback_opens_all_files_and_levels(self):
+        """Test every file/level pair is opened and combined in time order"""
+        files = [Path("gfs.t00z.pgrb2.0p25.f003"), Path("gfs.t00z.pgrb2.0p25.f000")]
+        
+        with patch('src.core.processors.grib_processor.xr.open_mfdataset', side_effect=Exception("boom")), \
+             patch('src.core.processors.grib_processor.xr.open_dataset',
+                   side_effect=lambda path, **kwargs: self._level_dataset(path, kwargs['backend_kwargs']['filter_by_keys'])) as mock_open:
+            dataset = GRIBProcessor()._load_grib_files(files)
+        
+        assert mock_open.call_count == 6
+        assert set(dataset.data_vars) == {'orog', 't2m', 'u10'}
+        assert dataset.sizes['time'] == 2
+        assert list(dataset['t2m'].isel(latitude=0, longitude=0).values) == [0, 3]
+    
+    def test_fallback_opens_levels_of_a_file_sequentially(self):
+        """Test no two level filters of the same file are opened at once (shared cfgrib index)"""
+        files = [Path(f"gfs.t00z.pgrb2.0p25.f00{hour}") for hour in range(4)]
+        lock = threading.Lock()
+        active = set()
+        overlaps = []
+        
+        def open_level(path, **kwargs):
+            with lock:
+                if path in active:
+                    overlaps.append(path)
+                active.add(path)
+            time.sleep(0.01)
+            with lock:
+                active.discard(path)
+            return self._level_dataset(path, kwargs['backend_kwargs']['filter_by_keys'])
+        
+        with patch('src.core.processors.grib_processor.xr.open_mfdataset', side_effect=Exception("boom")), \
+             patch('src.core.processors.grib_processor.xr.open_dataset', side_effect=open_level) as mock_open:
+            GRIBProcessor()._load_grib_files(files)
+        
+        assert mock_open.call_count == 12
+        assert overlaps == []
+    
+    def test_fallback_skips_levels_that_fail(self):
+        """Test a level that cannot be opened does not abort the file"""
+        def open_level(path, **kwargs):
+            level_filter = kwargs['backend_kwargs']['filter_by_keys']
+            if level_filter.get('level') == 10:
+                raise ValueError("no messages")
+            return self._level_dataset(path, level_filter)
+        
+        with patch('src.core.processors.grib_processor.xr.open_mfdataset', side_effect=Exception("boom")), \
+             patch('src.core.processors.grib_processor.xr.open_dataset', side_effect=open_level):
+            dataset = GRIBProcessor()._load_grib_files([Path("gfs.t00z.pgrb2.0p25.f000")])
+        
+        assert set(dataset.data_vars) == {'orog', 't2m'}
+
+
+class TestGRIBProcessorChunking:
+    """Test NetCDF chunk size selection"""
+    
+    def setup_method(self):
+        """Setup for each test"""
+        self.processor = GRIBProcessor()
+    
+    def test_small_grid_packs_all_time_steps(self):
+        """Test small grids stack time steps instead of writing tiny chunks"""
+        data_array = xr.DataArray(np.zeros((30, 10, 10), dtype='float32'), dims=('time', 'latitude', 'longitude'))
+        
+        assert self.processor._get_optimal_chunks(data_array) == (30, 10, 10)
+    
+    def test_large_grid_time_chunk_reaches_target_size(self):
+        """Test the time chunk grows until the chunk reaches the target size"""
+        data_array = xr.DataArray(np.zeros((10, 300, 240), dtype='float32'), dims=('time', 'latitude', 'longitude'))
+        
+        chunks = self.processor._get_optimal_chunks(data_array)
+        
+        assert chunks[1:] == (300, 240)
+        assert chunks[0] * 300 * 240 * 4 >= GRIBProcessor.TARGET_CHUNK_BYTES
+        assert (chunks[0] - 1) * 300 * 240 * 4 < GRIBProcessor.TARGET_CHUNK_BYTES
+    
+    def test_static_field_keeps_spatial_plane(self):
+        """Test time-independent fields keep the full spatial plane"""
+        data_array = xr.DataArray(np.zeros((76, 61)), dims=('latitude', 'longitude'))
+        
+        assert self.processor._get_optimal_chunks(data_array) == (76, 61)
+    
+    def test_chunks_are_memoized_by_layout(self):
+        """Test variables sharing dims, shape and dtype reuse the cached chunk sizes"""
+        GRIBProcessor._chunks_for.cache_clear()
+        dims = ('time', 'latitude', 'longitude')
+        first = xr.DataArray(np.zeros((5, 20, 30), dtype='float32'), dims=dims)
+        second = xr.DataArray(np.ones((5, 20, 30), dtype='float32'), dims=dims)
+        wider = xr.DataArray(np.ones((5, 20, 30), dtype='float64'), dims=dims)
+        
+        self.processor._get_optimal_chunks(first)
+        self.processor._get_optimal_chunks(second)
+        self.processor._get_optimal_chunks(wider)
+        
+        info = GRIBProcessor._chunks_for.cache_info()
+        assert (info.hits, info.misses) == (1, 2)
+
+
+class TestGRIBProcessorStorageEncoding:
+    """Test per-variable storage encoding"""
+    
+    @pytest.fixture(autouse=True)
+    def compress_small_outputs(self, monkeypatch):
+        """Compress the small test datasets instead of storing them contiguously"""
+        monkeypatch.setattr(GRIBProcessor, 'CONTIGUOUS_MAX_BYTES', 0)
+    
+    def _dataset(self):
+        values = np.linspace(270, 290, 24, dtype='float32').reshape(2, 3, 4)
+        return xr.Dataset({
+            't2m': (('time', 'latitude', 'longitude'), values),
+            'custom': (('time', 'latitude', 'longitude'), values.copy()),
+        }).chunk({'time': 1})
+    
+    def test_known_variables_are_quantized(self):
+        """Test known variables are quantized like netCDF4 would and others are left alone"""
+        original = self._dataset()
+        dataset = GRIBProcessor().optimize_storage(original)
+        
+        expected = np.asarray(netCDF4.utils._quantize(original['t2m'].values, 2)).astype('float32')
+        np.testing.assert_array_equal(dataset['t2m'].values, expected)
+        assert dataset['t2m'].dtype == np.float32
+        assert dataset['t2m'].attrs['least_significant_digit'] == 2
+        assert dataset['t2m'].chunks is not None
+        np.testing.assert_array_equal(dataset['custom'].values, original['custom'].values)
+        assert 'least_significant_digit' not in dataset['custom'].attrs
+        
+        # The input dataset is left untouched for the interpolated output
+        assert not np.array_equal(original['t2m'].values, expected)
+    
+    def test_encoding_replaces_source_encoding(self):
+        """Test inherited GRIB encoding is replaced by the storage encoding"""
+        original = self._dataset()
+        original['custom'].encoding = {'source': 'gfs.grib2', 'chunksizes': (1, 1, 1)}
+        
+        dataset = GRIBProcessor().optimize_storage(original)
+        
+        assert 'source' not in dataset['custom'].encoding
+        assert dataset['custom'].encoding['chunksizes'] == (2, 3, 4)
+        assert dataset['custom'].encoding['shuffle'] is True
+    
+    def test_int16_packing_round_trips(self, tmp_path):
+        """Test opt-in int16 packing stays within half a packing step after a round trip"""
+        config = {'processing': {'compression': {'pack_int16': True}}}
+        processor = GRIBProcessor(user_config=config)
+        original = self._dataset()
+        original['empty'] = original['custom'] * np.nan
+        
+        dataset = processor.optimize_storage(original)
+        processor._save_netcdf(dataset, tmp_path / "packed.nc")
+        
+        encoding = dataset['t2m'].encoding
+        assert encoding['dtype'] == 'int16'
+        assert 'least_significant_digit' not in dataset['t2m'].attrs
+        assert 'scale_factor' not in dataset['empty'].encoding
+        with xr.open_dataset(tmp_path / "packed.nc") as saved:
+            assert saved['t2m'].dtype == np.float32
+            error = float(abs(saved['t2m'] - original['t2m']).max())
+            assert error <= encoding['scale_factor'] / 2 + 1e-5
+    
+    def test_small_output_is_stored_contiguously(self, tmp_path, monkeypatch):
+        """Test outputs under the size threshold skip chunking and compression"""
+        monkeypatch.setattr(GRIBProcessor, 'CONTIGUOUS_MAX_BYTES', 16 << 20)
+        processor = GRIBProcessor()
+        
+        dataset = processor.optimize_storage(self._dataset())
+        processor._save_netcdf(dataset, tmp_path / "small.nc")
+        
+        assert dataset['t2m'].encoding == {'contiguous': True}
+        assert dataset['t2m'].attrs['least_significant_digit'] == 2
+        with netCDF4.Dataset(tmp_path / "small.nc") as saved:
+            assert saved['t2m'].chunking() == 'contiguous'
+            assert not saved.dimensions['time'].isunlimited()
+    
+    def test_small_output_keeps_int16_packing(self, tmp_path, monkeypatch):
+        """Test contiguous small outputs are still packed when packing is enabled"""
+        monkeypatch.setattr(GRIBProcessor, 'CONTIGUOUS_MAX_BYTES', 16 << 20)
+        config = {'processing': {'compression': {'pack_int16': True}}}
+        processor = GRIBProcessor(user_config=config)
+        
+        dataset = processor.optimize_storage(self._dataset())
+        processor._save_netcdf(dataset, tmp_path / "small.nc")
+        
+        encoding = dataset['t2m'].encoding
+        assert encoding['contiguous'] is True
+        assert encoding['dtype'] == 'int16'
+        assert 'chunksizes' not in encoding and 'zlib' not in encoding
+        with netCDF4.Dataset(tmp_path / "small.nc") as saved:
+            assert saved['t2m'].dtype == np.int16
+            assert saved['t2m'].chunking() == 'contiguous'
+    
+    def test_quantization_can_be_disabled(self):
+        """Test quantization is skipped when disabled in the config"""
+        config = {'processing': {'compression': {'quantize': False}}}
+        original = self._dataset()
+        dataset = GRIBProcessor(user_config=config).optimize_storage(original)
+        
+        np.testing.assert_array_equal(dataset['t2m'].values, original['t2m'].values)
+        assert 'least_significant_digit' not in dataset['t2m'].attrs
+    
+    def test_tolerances_bound_quantization_error(self):
+        """Test configured absolute tolerances set the digits of their variables"""
+        config = {'processing': {'compression': {'quantize': False, 'tolerances': {'custom': 0.05}}}}
+        original = self._dataset()
+        dataset = GRIBProcessor(user_config=config).optimize_storage(original)
+        
+        assert dataset['custom'].attrs['least_significant_digit'] == 1
+        assert not np.array_equal(dataset['custom'].values, original['custom'].values)
+        np.testing.assert_allclose(dataset['custom'].values, original['custom'].values, rtol=0, atol=0.05)
+        np.testing.assert_array_equal(dataset['t2m'].values, original['t2m'].values)
+    
+    def test_invalid_tolerance_is_rejected(self):
+        """Test non-positive tolerances fail when the processor is created"""
+        config = {'processing': {'compression': {'tolerances': {'t2m': 0}}}}
+        
+        with pytest.raises(ValueError, match="positive"):
+            GRIBProcessor(user_config=config)
 
 
 class TestGRIBProcessorFileOperations:
@@ -178,8 +611,9 @@ class TestGRIBProcessorFileOperations:
         """Setup for each test"""
         self.processor = GRIBProcessor()
     
+    @patch('src.core.processors.grib_processor.os.replace')
     @patch('pathlib.Path.mkdir')
-    def test_save_netcdf_creates_directory(self, mock_mkdir):
+    def test_save_netcdf_creates_directory(self, mock_mkdir, mock_replace):
         """Test that save_netcdf creates parent directories"""
         mock_dataset = Mock()
         output_path = Path("test_dir/output.nc")
@@ -198,6 +632,35 @@ class TestGRIBProcessorFileOperations:
             
             # Should call to_netcdf
             mock_dataset.to_netcdf.assert_called_once()
+            
+            # Should move the temporary file into place
+            mock_replace.assert_called_once_with(Path("test_dir/.output.nc.tmp"), output_path)
+
+    def test_save_netcdf_writes_atomically(self, tmp_path):
+        """Test the final file appears only after a complete write"""
+        dataset = xr.Dataset(
+            {'t2m': (('time', 'latitude'), np.ones((2, 3), dtype='float32'))},
+            coords={'time': pd.date_range('2025-01-01', periods=2, freq='h'), 'latitude': np.arange(3.0)}
+        ).chunk({'time': 1})
+        output_path = tmp_path / "out" / "output.nc"
+
+        self.processor._save_netcdf(dataset, output_path)
+
+        assert [p.name for p in output_path.parent.iterdir()] == ["output.nc"]
+        with xr.open_dataset(output_path) as saved:
+            assert float(saved.t2m.sum()) == 6.0
+
+    def test_save_netcdf_removes_partial_file_on_failure(self, tmp_path):
+        """Test a failed write leaves neither the target nor a temporary file"""
+        output_path = tmp_path / "output.nc"
+        mock_dataset = Mock()
+        mock_dataset.to_netcdf.side_effect = lambda path, **kwargs: path.touch()
+        
+        with patch('src.core.processors.grib_processor.dask.compute', side_effect=RuntimeError("disk full")):
+            with pytest.raises(RuntimeError):
+                self.processor._save_netcdf(mock_dataset, output_path)
+
+        assert list(tmp_path.iterdir()) == []
 
 
 class TestGRIBProcessorEdgeCases:
@@ -220,7 +683,29 @@ class TestGRIBProcessorEdgeCases:
         # Should handle error gracefully
         result = processor.apply_spatial_subsetting(mock_dataset)
         assert result == mock_dataset
-    
+
+    def test_spatial_subsetting_matches_label_selection(self):
+        """Test positional subsetting selects the same cells as sel and reuses slices"""
+        config = {
+            'spatial_bounds': {
+                'lon_min': -90.0, 'lon_max': -30.0,
+                'lat_min': -60.0, 'lat_max': 15.0
+            }
+        }
+        processor = GRIBProcessor(user_config=config)
+        dataset = xr.Dataset(
+            {'t2m': (('latitude', 'longitude'), np.random.rand(721, 1440))},
+            coords={'latitude': np.linspace(90, -90, 721), 'longitude': np.arange(1440) * 0.25}
+        )
+
+        first = processor.apply_spatial_subsetting(dataset)
+        second = processor.apply_spatial_subsetting(dataset.copy())
+
+        expected = dataset.sel(longitude=slice(270.0, 330.0), latitude=slice(15.0, -60.0))
+        xr.testing.assert_identical(first, expected)
+        xr.testing.assert_identical(second, expected)
+        assert len(processor._subset_slices) == 1
+
     def test_standardize_variable_names_with_mapper_error(self):
         """Test variable standardization handles mapper errors"""
         mock_mapper = Mock()
@@ -259,6 +744,129 @@ class TestGRIBProcessorInterpolation:
             # If it fails, that's also acceptable for complex operations
             assert len(str(e)) > 0
 
+    def test_interpolate_temporal_matches_linear_interp(self):
+        """Test blended interpolation matches xarray's linear interp on uneven steps"""
+        times = pd.to_datetime(['2025-01-01T00', '2025-01-01T01', '2025-01-01T04', '2025-01-01T10'])
+        rng = np.random.default_rng(0)
+        dataset = xr.Dataset(
+            {
+                't2m': (('time', 'latitude', 'longitude'), rng.random((4, 3, 5)).astype('float32'), {'units': 'K'}),
+                'orog': (('latitude', 'longitude'), rng.random((3, 5)).astype('float32')),
+            },
+            coords={
+                'time': times,
+                'step': ('time', (times - times[0]).values),
+                'latitude': np.arange(3.0),
+                'longitude': np.arange(5.0),
+            }
+        )
+
+        result = self.processor.interpolate_temporal(dataset)
+        expected = dataset.interp(time=result.time.values, method='linear')
+
+        assert len(result.time) == 11
+        assert result.t2m.dtype == np.float32
+        assert result.t2m.attrs == {'units': 'K'}
+        np.testing.assert_allclose(result.t2m.values, expected.t2m.values, rtol=1e-6)
+        np.testing.assert_array_equal(result.step.values, result.time.values - times[0].to_datetime64())
+        xr.testing.assert_identical(result.orog, dataset.orog)
+
+    def test_interpolate_temporal_blends_integer_variables(self):
+        """Test integer variables are interpolated as floats instead of repeating values"""
+        dataset = xr.Dataset(
+            {
+                'count': (('time', 'latitude'), np.array([[0], [30]], dtype='int32')),
+                't2m': (('time', 'latitude'), np.array([[0], [30]], dtype='float32')),
+            },
+            coords={'time': pd.date_range('2025-01-01', periods=2, freq='3h'), 'latitude': [0.0]}
+        )
+
+        result = self.processor.interpolate_temporal(dataset)
+
+        assert np.issubdtype(result['count'].dtype, np.floating)
+        np.testing.assert_allclose(result['count'].values[:, 0], [0, 10, 20, 30])
+        assert result['t2m'].dtype == np.float32
+        np.testing.assert_allclose(result['t2m'].values[:, 0], [0, 10, 20, 30])
+
+    def test_interpolate_temporal_blends_multidimensional_time_coords(self):
+        """Test coordinates along time and another dimension are blended, not dropped"""
+        times = pd.date_range('2025-01-01', periods=3, freq='3h')
+        dataset = xr.Dataset(
+            {'t2m': (('time', 'latitude'), np.zeros((3, 2), dtype='float32'))},
+            coords={
+                'time': times,
+                'latitude': np.arange(2.0),
+                'offset': (('latitude', 'time'), np.array([[0.0, 3.0, 6.0], [0.0, 6.0, 12.0]]), {'units': 'h'}),
+            }
+        )
+
+        result = self.processor.interpolate_temporal(dataset)
+
+        assert result.offset.dims == ('latitude', 'time')
+        assert result.offset.attrs == {'units': 'h'}
+        np.testing.assert_allclose(result.offset.values, [np.arange(7.0), np.arange(7.0) * 2])
+
+    @pytest.mark.parametrize('times', [
+        ['2025-01-01T00', '2025-01-01T03', '2025-01-01T03'],
+        ['2025-01-01T06', '2025-01-01T00', '2025-01-01T03'],
+    ])
+    def test_interpolate_temporal_rejects_unordered_times(self, times):
+        """Test repeated or unsorted time steps raise instead of producing NaN weights"""
+        dataset = xr.Dataset(
+            {'t2m': (('time', 'latitude'), np.zeros((3, 2), dtype='float32'))},
+            coords={'time': pd.to_datetime(times), 'latitude': np.arange(2.0)}
+        )
+
+        with pytest.raises(ValueError, match="strictly increasing"):
+            self.processor._interpolate_linear_in_time(
+                dataset, pd.date_range('2025-01-01', periods=4, freq='h').values
+            )
+
+    def test_interpolate_temporal_rejects_non_numeric_time_coords(self):
+        """Test coordinates along time that cannot be blended raise"""
+        dataset = xr.Dataset(
+            {'t2m': (('time', 'latitude'), np.zeros((2, 2), dtype='float32'))},
+            coords={
+                'time': pd.date_range('2025-01-01', periods=2, freq='3h'),
+                'latitude': np.arange(2.0),
+                'label': ('time', ['a', 'b']),
+            }
+        )
+
+        with pytest.raises(ValueError, match="label"):
+            self.processor.interpolate_temporal(dataset)
+
+    def test_interpolate_temporal_keeps_time_resolution(self):
+        """Test hourly steps are built in the input's datetime unit and single steps pass through"""
+        times = pd.date_range('2025-01-01', periods=3, freq='6h').values.astype('datetime64[ns]')
+        dataset = xr.Dataset(
+            {'t2m': (('time', 'latitude'), np.zeros((3, 2), dtype='float32'))},
+            coords={'time': times, 'latitude': np.arange(2.0)}
+        )
+
+        result = self.processor.interpolate_temporal(dataset)
+        single = self.processor.interpolate_temporal(dataset.isel(time=[0]))
+
+        assert result.time.dtype == times.dtype
+        assert result.time.values[0] == times[0]
+        assert result.time.values[-1] == times[-1]
+        assert len(result.time) == 13
+        assert len(single.time) == 1
+
+    def test_interpolate_temporal_stays_lazy_on_dask_input(self):
+        """Test dask-backed input yields a lazy result chunked like the NetCDF output"""
+        times = pd.date_range('2025-01-01', periods=9, freq='3h')
+        dataset = xr.Dataset(
+            {'t2m': (('time', 'latitude', 'longitude'), np.ones((9, 300, 240), dtype='float32'))},
+            coords={'time': times, 'latitude': np.arange(300.0), 'longitude': np.arange(240.0)}
+        ).chunk({'time': 1})
+
+        result = self.processor.interpolate_temporal(dataset)
+
+        assert result.t2m.chunks is not None
+        assert result.t2m.chunks[0][0] == self.processor._get_optimal_chunks(result.t2m)[0]
+        assert float(result.t2m.sum()) == 25 * 300 * 240
+
 
 class TestGRIBProcessorIntegration:
     """Test basic integration scenarios"""
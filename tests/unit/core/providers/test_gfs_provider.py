@@ -6,9 +6,19 @@ Tests GFS-specific weather model provider implementation.
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import parse_qs, urlencode, urlparse
 
-from src.core.providers.gfs_provider import GFSProvider
+from src.core.interfaces.variable_mapper import VariableMapper
+from src.core.providers.gfs_provider import GFSProvider, _encode_query
+
+
+def _mock_mapper():
+    """Create a mapper mock whose try_get lookups go through get_model_variable_code."""
+    mapper = Mock()
+    mapper.try_get_model_variable_code.side_effect = (
+        lambda var, model: VariableMapper.try_get_model_variable_code(mapper, var, model)
+    )
+    return mapper
 
 
 class TestGFSProviderInitialization:
@@ -39,7 +49,7 @@ class TestGFSProviderInitialization:
     
     def test_init_with_variable_mapper(self):
         """Test initialization with variable mapper"""
-        mock_mapper = Mock()
+        mock_mapper = _mock_mapper()
         provider = GFSProvider(variable_mapper=mock_mapper)
         
         assert provider.variable_mapper == mock_mapper
@@ -148,6 +158,21 @@ class TestGFSProviderValidation:
             # If it raises ValueError, that's acceptable
             pass
     
+    def test_validate_parameters_uses_cycle_forecast_ranges(self):
+        """Test forecast hours are checked against the union of all cycle ranges"""
+        provider = GFSProvider(config={
+            'base_url': 'https://test.com',
+            'cycle_forecast_ranges': {
+                '00': [[0, 12, 1], [15, 24, 3]],
+                '06': [[0, 6, 6]]
+            }
+        })
+        
+        assert provider._valid_forecast_hours == frozenset(range(0, 13)) | {15, 18, 21, 24}
+        assert provider.validate_parameters("20250828", "00", 11)
+        assert provider.validate_parameters("20250828", "06", 21)
+        assert not provider.validate_parameters("20250828", "00", 13)
+    
     def test_validate_parameters_date_format(self):
         """Test parameter validation with date format"""
         # Test various date formats
@@ -179,7 +204,7 @@ class TestGFSProviderURLGeneration:
         }
         
         # Mock variable mapper
-        self.mock_mapper = Mock()
+        self.mock_mapper = _mock_mapper()
         self.mock_mapper.get_model_variable_code.side_effect = lambda var, model: {
             't2m': 'TMP',
             'rh2m': 'RH', 
@@ -203,6 +228,62 @@ class TestGFSProviderURLGeneration:
         assert '20250828' in url
         assert '00' in url
     
+    def test_default_variables_resolved_once(self):
+        """Test default variable codes are looked up once and reused across URLs"""
+        for forecast_hour in (0, 3, 6):
+            url = self.provider.get_download_url(date="20250828", cycle="00", forecast_hour=forecast_hour)
+        
+        params = parse_qs(urlparse(url).query)
+        assert {'var_TMP', 'var_RH', 'var_UGRD', 'var_VGRD'} <= set(params)
+        assert self.mock_mapper.get_model_variable_code.call_count == 4
+    
+    def test_default_url_reuses_static_query(self):
+        """Test default URLs only differ in file/dir and match the explicit-level URL"""
+        with patch.object(GFSProvider, '_get_spatial_params', wraps=self.provider._get_spatial_params) as mock_bounds:
+            url_a = self.provider.get_download_url(date="20250828", cycle="00", forecast_hour=0)
+            url_b = self.provider.get_download_url(date="20250828", cycle="00", forecast_hour=3)
+        
+        # The static part of the query is only built for the first URL
+        mock_bounds.assert_called_once()
+        params_a = parse_qs(urlparse(url_a).query)
+        params_b = parse_qs(urlparse(url_b).query)
+        assert params_a['file'] == ['gfs.t00z.pgrb2.0p25.f000']
+        assert params_b['file'] == ['gfs.t00z.pgrb2.0p25.f003']
+        assert params_a['leftlon'] == ['-90.0'] and params_a['toplat'] == ['15.0']
+        
+        explicit = self.provider.get_download_url(
+            date="20250828", cycle="00", forecast_hour=0,
+            levels=['2_m_above_ground', '10_m_above_ground', 'surface']
+        )
+        assert parse_qs(urlparse(explicit).query) == params_a
+    
+    def test_encode_query_matches_urlencode(self):
+        """Test the fast query encoder gives the same result as urlencode"""
+        params = {
+            'file': 'gfs.t00z.pgrb2.0p25.f003',
+            'dir': '/gfs.20250828/00/atmos',
+            'leftlon': -90.0,
+            'toplat': 15,
+            'var_TMP': 'on',
+            'lev_2_m_above_ground': 'on',
+            'lev_entire atmosphere': 'on',
+        }
+        
+        assert _encode_query(params) == urlencode(params)
+    
+    def test_get_download_urls_matches_single_urls(self):
+        """Test batched URLs are identical to individually generated ones"""
+        requests = [("20250828", cycle, hour) for cycle in ("00", "12") for hour in (0, 3, 120)]
+        
+        urls = list(self.provider.get_download_urls(requests))
+        
+        assert urls == [self.provider.get_download_url(*request) for request in requests]
+    
+    def test_get_download_urls_invalid_request_raises(self):
+        """Test an invalid request in the batch raises"""
+        with pytest.raises(ValueError, match="Invalid parameters"):
+            list(self.provider.get_download_urls([("20250828", "00", 0), ("20250828", "03", 0)]))
+    
     def test_get_download_url_with_variables(self):
         """Test URL generation with specific variables"""
         url = self.provider.get_download_url(
@@ -220,6 +301,28 @@ class TestGFSProviderURLGeneration:
         # Should include mapped variables
         assert any('TMP' in str(params) for param in params if 'var_' in param)
     
+    @patch('src.core.providers.gfs_provider.logger')
+    def test_unmapped_variables_warned_once(self, mock_logger):
+        """Test unmapped variables are skipped with a single warning"""
+        def get_model_variable_code(var, model):
+            if var != 't2m':
+                raise ValueError(f"Unknown variable: {var}")
+            return 'TMP'
+        
+        self.mock_mapper.get_model_variable_code.side_effect = get_model_variable_code
+        
+        url = self.provider.get_download_url(
+            date="20250828",
+            cycle="00",
+            forecast_hour=24,
+            variables=['t2m', 'bogus1', 'bogus2']
+        )
+        
+        params = parse_qs(urlparse(url).query)
+        assert 'var_TMP' in params
+        mock_logger.warning.assert_called_once()
+        assert mock_logger.warning.call_args[0][1] == ['bogus1', 'bogus2']
+    
     def test_get_download_url_with_levels(self):
         """Test URL generation with specific levels"""
         url = self.provider.get_download_url(
@@ -301,6 +404,16 @@ class TestGFSProviderMetadata:
         
         # Should include forecast-related info
         assert 'max_forecast_hours' in metadata or 'forecast_frequency' in metadata
+    
+    def test_metadata_built_once(self):
+        """Test metadata is cached and callers cannot modify the cache"""
+        with patch.object(self.provider, '_build_metadata', wraps=self.provider._build_metadata) as mock_build:
+            first = self.provider.get_metadata()
+            first['model_name'] = 'changed'
+            second = self.provider.get_metadata()
+        
+        mock_build.assert_called_once()
+        assert second['model_name'] == "GFS 0.25 Degree"
 
 
 class TestGFSProviderPrivateMethods:
@@ -376,7 +489,7 @@ class TestGFSProviderEdgeCases:
     
     def test_variable_mapper_error_handling(self):
         """Test handling of variable mapper errors"""
-        mock_mapper = Mock()
+        mock_mapper = _mock_mapper()
         mock_mapper.get_model_variable_code.side_effect = ValueError("Mapping error")
         
         provider = GFSProvider(variable_mapper=mock_mapper)
@@ -412,7 +525,7 @@ class TestGFSProviderIntegration:
             }
         }
         
-        mock_mapper = Mock()
+        mock_mapper = _mock_mapper()
         mock_mapper.get_model_variable_code.return_value = 'TMP'
         
         provider = GFSProvider(config=config, variable_mapper=mock_mapper)
@@ -442,7 +555,7 @@ class TestGFSProviderIntegration:
     
     def test_multi_variable_multi_level_download(self):
         """Test downloading multiple variables and levels"""
-        mock_mapper = Mock()
+        mock_mapper = _mock_mapper()
         mock_mapper.get_model_variable_code.side_effect = lambda var, model: {
             't2m': 'TMP',
             'rh2m': 'RH',
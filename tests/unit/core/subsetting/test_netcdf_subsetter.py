@@ -0,0 +1,538 @@
+"""
+Unit tests for NetCDF subsetter.
+
+Tests extraction of variables, levels, regions and time ranges from datasets.
+"""
+
+import pytest
+import numpy as np
+import xarray as xr
+from unittest.mock import Mock, patch
+
+from src.core.interfaces.variable_mapper import VariableMapper
+from src.core.subsetting.netcdf_subsetter import NetCDFSubsetter
+
+
+class _CodeMapper:
+    """Picklable variable mapper for tests that run in worker processes."""
+
+    CODES = {'TMP': 't2m', 'RH': 'rh2m'}
+
+    def try_get_standard_variable_name(self, model_code, model):
+        return self.CODES.get(model_code)
+
+
+def _make_mapper():
+    """Create a variable mapper mock that knows the TMP and RH codes."""
+    mapper = Mock()
+    codes = {'TMP': 't2m', 'RH': 'rh2m'}
+
+    def get_standard_variable_name(model_code, model):
+        if model_code in codes:
+            return codes[model_code]
+        raise ValueError(f"Unknown model code: {model_code} for model: {model}")
+
+    mapper.get_standard_variable_name.side_effect = get_standard_variable_name
+    mapper.try_get_standard_variable_name.side_effect = (
+        lambda model_code, model: VariableMapper.try_get_standard_variable_name(mapper, model_code, model)
+    )
+    return mapper
+
+
+class TestNetCDFSubsetterVariables:
+    """Test variable subsetting"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.mapper = _make_mapper()
+        self.subsetter = NetCDFSubsetter(self.mapper)
+        self.dataset = xr.Dataset(
+            {
+                'TMP': (['latitude', 'longitude'], np.zeros((2, 3))),
+                'RH': (['latitude', 'longitude'], np.ones((2, 3))),
+                'Gust': (['latitude', 'longitude'], np.full((2, 3), 2.0)),
+                'wspd': (['latitude', 'longitude'], np.full((2, 3), 3.0)),
+            },
+            coords={'latitude': [0.0, 1.0], 'longitude': [0.0, 1.0, 2.0]},
+        )
+
+    def test_subset_variables_maps_and_renames(self):
+        """Test mapped, case-insensitive and direct names are resolved"""
+        result = self.subsetter.subset_variables(self.dataset, ['t2m', 'gust', 'wspd'])
+
+        assert list(result.data_vars) == ['t2m', 'gust', 'wspd']
+        np.testing.assert_array_equal(result['gust'].values, self.dataset['Gust'].values)
+        assert list(result.coords) == ['latitude', 'longitude']
+
+    def test_subset_variables_keeps_attrs_and_shares_data(self):
+        """Test renaming keeps dataset attrs and does not copy the arrays"""
+        self.dataset.attrs['title'] = 'GFS'
+
+        result = self.subsetter.subset_variables(self.dataset, ['t2m', 'rh2m'])
+
+        assert result.attrs == {'title': 'GFS'}
+        assert np.shares_memory(result['t2m'].values, self.dataset['TMP'].values)
+
+    def test_subset_variables_maps_each_dataset_variable_once(self):
+        """Test the mapper is consulted once per dataset variable"""
+        self.subsetter.subset_variables(self.dataset, ['t2m', 'rh2m', 'gust'])
+
+        assert self.mapper.get_standard_variable_name.call_count == len(self.dataset.data_vars)
+
+    def test_subset_variables_missing_raises(self):
+        """Test missing variables are reported together"""
+        with pytest.raises(ValueError, match="Variables not found in dataset"):
+            self.subsetter.subset_variables(self.dataset, ['t2m', 'unknown'])
+
+    def test_subset_variables_empty_returns_input(self):
+        """Test an empty request leaves the dataset untouched"""
+        assert self.subsetter.subset_variables(self.dataset, []) is self.dataset
+
+
+class TestNetCDFSubsetterLevels:
+    """Test level subsetting"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.subsetter = NetCDFSubsetter(_make_mapper())
+        self.dataset = xr.Dataset(
+            {'t': (['level', 'latitude'], np.arange(8.0).reshape(4, 2))},
+            coords={
+                'level': ['surface', '2_m_above_ground', '850_mb', '500_mb'],
+                'latitude': [0.0, 1.0],
+            },
+        )
+
+    def test_subset_levels_exact_match(self):
+        """Test exact level names are selected in dataset order"""
+        result = self.subsetter.subset_levels(self.dataset, ['500_mb', 'surface'])
+
+        assert list(result['level'].values) == ['surface', '500_mb']
+
+    def test_subset_levels_partial_match(self):
+        """Test partial names select the first matching level"""
+        result = self.subsetter.subset_levels(self.dataset, ['850', '_mb'])
+
+        assert list(result['level'].values) == ['850_mb']
+
+    def test_subset_levels_numeric_axis(self):
+        """Test string levels match a numeric pressure axis"""
+        dataset = xr.Dataset(
+            {'t': (['pressure'], np.arange(3.0))},
+            coords={'pressure': [1000.0, 850.0, 500.0]},
+        )
+
+        result = self.subsetter.subset_levels(dataset, ['500', '850'])
+
+        np.testing.assert_array_equal(result['pressure'].values, [850.0, 500.0])
+
+    def test_subset_levels_missing_raises(self):
+        """Test an unmatched level raises"""
+        with pytest.raises(ValueError, match="Level 925_mb not found"):
+            self.subsetter.subset_levels(self.dataset, ['surface', '925_mb'])
+
+    def test_subset_levels_without_level_dimension(self):
+        """Test datasets without a level dimension are returned as is"""
+        dataset = self.dataset.isel(level=0, drop=True)
+
+        assert self.subsetter.subset_levels(dataset, ['surface']) is dataset
+
+
+class TestNetCDFSubsetterSpatial:
+    """Test spatial subsetting"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.subsetter = NetCDFSubsetter(_make_mapper())
+        self.bounds = {'lon_min': -80.0, 'lon_max': -70.0, 'lat_min': -40.0, 'lat_max': -30.0}
+
+    def _make_dataset(self, latitudes):
+        longitudes = np.arange(-90.0, -59.0, 5.0)
+        return xr.Dataset(
+            {'t2m': (['latitude', 'longitude'], np.zeros((len(latitudes), len(longitudes))))},
+            coords={'latitude': latitudes, 'longitude': longitudes},
+        )
+
+    def test_subset_spatial_ascending_latitude(self):
+        """Test subsetting on an ascending latitude axis"""
+        dataset = self._make_dataset(np.arange(-50.0, -19.0, 5.0))
+
+        result = self.subsetter.subset_spatial(dataset, self.bounds)
+
+        np.testing.assert_array_equal(result['latitude'].values, [-40.0, -35.0, -30.0])
+        np.testing.assert_array_equal(result['longitude'].values, [-80.0, -75.0, -70.0])
+
+    def test_subset_spatial_descending_latitude(self):
+        """Test subsetting on a descending latitude axis is not empty"""
+        dataset = self._make_dataset(np.arange(-20.0, -51.0, -5.0))
+
+        result = self.subsetter.subset_spatial(dataset, self.bounds)
+
+        np.testing.assert_array_equal(result['latitude'].values, [-30.0, -35.0, -40.0])
+
+    def test_subset_spatial_missing_bounds_raises(self):
+        """Test incomplete bounds raise"""
+        dataset = self._make_dataset(np.arange(-50.0, -19.0, 5.0))
+
+        with pytest.raises(ValueError, match="Missing required bounds"):
+            self.subsetter.subset_spatial(dataset, {'lon_min': 0.0})
+
+
+class TestNetCDFSubsetterTemporal:
+    """Test temporal subsetting"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.subsetter = NetCDFSubsetter(_make_mapper())
+        times = np.arange(
+            np.datetime64('2025-08-27T00:00'), np.datetime64('2025-08-27T12:00'), np.timedelta64(1, 'h')
+        )
+        self.dataset = xr.Dataset(
+            {'t2m': (['time'], np.arange(12.0))},
+            coords={'time': times},
+        )
+
+    def test_subset_temporal_start_and_end(self):
+        """Test start and end bounds are applied together"""
+        result = self.subsetter.subset_temporal(
+            self.dataset,
+            {'start_time': '2025-08-27T02:00', 'end_time': '2025-08-27T05:00'},
+        )
+
+        np.testing.assert_array_equal(result['t2m'].values, [2.0, 3.0, 4.0, 5.0])
+
+    def test_subset_temporal_resamples_to_frequency(self):
+        """Test a coarser frequency averages the time steps"""
+        result = self.subsetter.subset_temporal(self.dataset, {'frequency': '3h'})
+
+        np.testing.assert_array_equal(result['t2m'].values, [1.0, 4.0, 7.0, 10.0])
+
+    def test_subset_temporal_skips_resample_at_native_frequency(self):
+        """Test resampling is skipped when the axis already has the frequency"""
+        with patch.object(xr.Dataset, 'resample') as mock_resample:
+            result = self.subsetter.subset_temporal(self.dataset, {'frequency': '1h'})
+
+        mock_resample.assert_not_called()
+        assert result is self.dataset
+
+    def test_subset_temporal_resamples_unaligned_native_frequency(self):
+        """Test an axis at the frequency but off the bin edges is still resampled"""
+        dataset = self.dataset.isel(time=slice(1, None, 3))  # 01, 04, 07, 10
+
+        result = self.subsetter.subset_temporal(dataset, {'frequency': '3h'})
+
+        xr.testing.assert_identical(result, dataset.resample(time='3h').mean())
+        assert result['time'].dt.hour.values.tolist() == [0, 3, 6, 9]
+
+
+class TestNetCDFSubsetterInfo:
+    """Test dimension resolution and subsetting info"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.subsetter = NetCDFSubsetter(_make_mapper())
+
+    def test_resolve_dims_prefers_first_candidate(self):
+        """Test dimension names are resolved in priority order"""
+        dataset = xr.Dataset(
+            {'t': (['time', 'lev', 'lat', 'x', 'lon'], np.zeros((1, 1, 1, 1, 1)))}
+        )
+
+        dims = NetCDFSubsetter._resolve_dims(dataset)
+
+        assert dims == ('lon', 'lat', 'lev', 'time')
+
+    def test_get_subsetting_info(self):
+        """Test subsetting capabilities reflect the dataset dimensions"""
+        dataset = xr.Dataset({'t': (['time', 'latitude', 'longitude'], np.zeros((1, 2, 2)))})
+
+        info = self.subsetter.get_subsetting_info(dataset)
+
+        assert info['spatial_subsetting'] is True
+        assert info['temporal_subsetting'] is True
+        assert info['level_subsetting'] is False
+        assert info['variables'] == ['t']
+
+
+class TestNetCDFSubsetterComprehensive:
+    """Test combined subsetting"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.subsetter = NetCDFSubsetter(_make_mapper())
+        times = np.arange(
+            np.datetime64('2025-08-27T00:00'), np.datetime64('2025-08-27T06:00'), np.timedelta64(1, 'h')
+        )
+        latitudes = np.arange(10.0, -11.0, -5.0)
+        longitudes = np.arange(-90.0, -69.0, 5.0)
+        shape = (len(times), 3, len(latitudes), len(longitudes))
+        self.dataset = xr.Dataset(
+            {
+                'TMP': (['time', 'level', 'latitude', 'longitude'], np.random.random(shape)),
+                'RH': (['time', 'level', 'latitude', 'longitude'], np.random.random(shape)),
+            },
+            coords={
+                'time': times,
+                'level': ['surface', '2_m_above_ground', '500_mb'],
+                'latitude': latitudes,
+                'longitude': longitudes,
+            },
+            attrs={'source': 'test'},
+        )
+        self.kwargs = {
+            'variables': ['t2m'],
+            'levels': ['surface', '500'],
+            'bounds': {'lon_min': -85.0, 'lon_max': -75.0, 'lat_min': -5.0, 'lat_max': 5.0},
+            'time_range': {'start_time': '2025-08-27T01:00', 'end_time': '2025-08-27T04:00'},
+        }
+
+    def _sequential(self):
+        result = self.subsetter.subset_variables(self.dataset, self.kwargs['variables'])
+        result = self.subsetter.subset_levels(result, self.kwargs['levels'])
+        result = self.subsetter.subset_spatial(result, self.kwargs['bounds'])
+        return self.subsetter.subset_temporal(result, self.kwargs['time_range'])
+
+    def test_fused_matches_sequential_subsetting(self):
+        """Test the fused path gives the same result as chaining each subset"""
+        result = self.subsetter.subset_comprehensive(self.dataset, **self.kwargs)
+
+        xr.testing.assert_identical(result, self._sequential())
+        assert result.sizes == {'time': 4, 'level': 2, 'latitude': 3, 'longitude': 3}
+        assert result.attrs == {'source': 'test'}
+
+    def test_fused_applies_a_single_isel(self):
+        """Test level, spatial and temporal selections are applied together"""
+        with patch.object(xr.Dataset, 'isel', autospec=True, side_effect=xr.Dataset.isel) as mock_isel:
+            self.subsetter.subset_comprehensive_fused(self.dataset, **self.kwargs)
+
+        mock_isel.assert_called_once()
+
+    def test_fused_resamples_after_selection(self):
+        """Test a frequency is applied to the selected time range"""
+        result = self.subsetter.subset_comprehensive(
+            self.dataset,
+            time_range={'start_time': '2025-08-27T00:00', 'end_time': '2025-08-27T03:00', 'frequency': '2h'},
+        )
+
+        assert result.sizes['time'] == 2
+
+
+class TestNetCDFSubsetterLazy:
+    """Test lazy subsetting of dask-backed datasets"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.subsetter = NetCDFSubsetter(_make_mapper())
+
+    def _write_files(self, tmp_path):
+        paths = []
+        for day in range(2):
+            times = np.arange(
+                np.datetime64(f'2025-08-2{7 + day}T00:00'),
+                np.datetime64(f'2025-08-2{7 + day}T06:00'),
+                np.timedelta64(3, 'h')
+            )
+            dataset = xr.Dataset(
+                {'t2m': (['time', 'latitude', 'longitude'], np.random.random((2, 3, 4)))},
+                coords={'time': times, 'latitude': [10.0, 0.0, -10.0], 'longitude': [0.0, 1.0, 2.0, 3.0]},
+            )
+            path = tmp_path / f'day{day}.nc'
+            dataset.to_netcdf(path)
+            paths.append(path)
+        return paths
+
+    def test_open_combines_files_lazily(self, tmp_path):
+        """Test open returns one dask-backed dataset chunked per time step"""
+        with NetCDFSubsetter.open(self._write_files(tmp_path)) as dataset:
+            assert dataset.sizes['time'] == 4
+            assert dataset['t2m'].chunks[0] == (1, 1, 1, 1)
+
+    def test_subset_stays_lazy_unless_materialized(self, tmp_path):
+        """Test subsetting keeps dask arrays until materialize is requested"""
+        bounds = {'lon_min': 1.0, 'lon_max': 2.0, 'lat_min': -5.0, 'lat_max': 10.0}
+
+        with NetCDFSubsetter.open(self._write_files(tmp_path)) as dataset:
+            lazy = self.subsetter.subset_comprehensive(dataset, bounds=bounds)
+            loaded = self.subsetter.subset_comprehensive(dataset, bounds=bounds, materialize=True)
+
+            assert lazy['t2m'].chunks is not None
+            assert loaded['t2m'].chunks is None
+            xr.testing.assert_identical(lazy.compute(), loaded)
+            assert loaded.sizes == {'time': 4, 'latitude': 2, 'longitude': 2}
+
+
+class TestNetCDFSubsetterValidation:
+    """Test subsetting parameter validation"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.subsetter = NetCDFSubsetter(_make_mapper())
+
+    def test_valid_parameters(self):
+        """Test valid parameters produce no errors"""
+        is_valid, errors = self.subsetter.validate_subsetting_parameters(
+            variables=['t2m'],
+            levels=['surface'],
+            bounds={'lon_min': -90, 'lon_max': -30.0, 'lat_min': -60, 'lat_max': 15.0},
+            time_range={'start_time': '2025-08-27', 'frequency': '3h'},
+        )
+
+        assert is_valid is True
+        assert errors == []
+
+    def test_invalid_parameters_reported_per_group(self):
+        """Test each invalid group yields a single error listing the offenders"""
+        is_valid, errors = self.subsetter.validate_subsetting_parameters(
+            variables=['t2m', 1, 2],
+            levels=['surface', None],
+            bounds={'lon_min': 'west', 'lon_max': 0.0},
+            time_range={'end_time': 5},
+        )
+
+        assert is_valid is False
+        assert errors == [
+            "Variables must be strings: [1, 2]",
+            "Levels must be strings: [None]",
+            "Missing required bounds: ['lat_min', 'lat_max']",
+            "Bounds must be numbers: ['lon_min']",
+            "end_time must be a string",
+        ]
+
+
+class TestNetCDFSubsetterMany:
+    """Test subsetting several files"""
+
+    def _write_files(self, tmp_path, count):
+        paths = []
+        for i in range(count):
+            dataset = xr.Dataset(
+                {
+                    'TMP': (['latitude', 'longitude'], np.full((3, 4), float(i))),
+                    'RH': (['latitude', 'longitude'], np.ones((3, 4))),
+                },
+                coords={'latitude': [10.0, 0.0, -10.0], 'longitude': [0.0, 1.0, 2.0, 3.0]},
+            )
+            path = tmp_path / f'gfs_{i}.nc'
+            dataset.to_netcdf(path)
+            paths.append(path)
+        return paths
+
+    @pytest.mark.parametrize('max_workers', [1, 2])
+    def test_subset_many_writes_each_file(self, tmp_path, max_workers):
+        """Test every file is subset and written in input order"""
+        subsetter = NetCDFSubsetter(_CodeMapper())
+        paths = self._write_files(tmp_path, 3)
+
+        outputs = subsetter.subset_many(
+            paths,
+            tmp_path / 'out',
+            max_workers=max_workers,
+            variables=['t2m'],
+            bounds={'lon_min': 1.0, 'lon_max': 2.0, 'lat_min': -5.0, 'lat_max': 10.0},
+        )
+
+        assert outputs == [tmp_path / 'out' / path.name for path in paths]
+        for i, output in enumerate(outputs):
+            with xr.open_dataset(output) as result:
+                assert list(result.data_vars) == ['t2m']
+                assert result.sizes == {'latitude': 2, 'longitude': 2}
+                assert float(result['t2m'].max()) == float(i)
+                assert result['t2m'].encoding['zlib'] is True
+
+    def test_subset_many_rejects_colliding_output_names(self, tmp_path):
+        """Test inputs sharing a file name are rejected before anything is written"""
+        subsetter = NetCDFSubsetter(_CodeMapper())
+        (tmp_path / 'a').mkdir()
+        (tmp_path / 'b').mkdir()
+        first, = self._write_files(tmp_path / 'a', 1)
+        second, = self._write_files(tmp_path / 'b', 1)
+
+        with pytest.raises(ValueError, match="would both be written"):
+            subsetter.subset_many([first, second], tmp_path / 'out', max_workers=1)
+
+        assert not (tmp_path / 'out').exists()
+
+    def test_subset_many_rejects_overwriting_inputs(self, tmp_path):
+        """Test writing into the source directory cannot replace an input"""
+        subsetter = NetCDFSubsetter(_CodeMapper())
+        paths = self._write_files(tmp_path, 1)
+
+        with pytest.raises(ValueError, match="overwrite its input"):
+            subsetter.subset_many(paths, tmp_path, max_workers=1)
+
+
+class TestNetCDFSubsetterRawTime:
+    """Test temporal subsetting of datasets opened without decoding"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.subsetter = NetCDFSubsetter(_make_mapper())
+
+    def test_open_fast_keeps_raw_time_and_subsets_by_date(self, tmp_path):
+        """Test string bounds select the same steps on a raw time axis"""
+        times = np.arange(
+            np.datetime64('2025-08-27T00:00'), np.datetime64('2025-08-27T12:00'), np.timedelta64(3, 'h')
+        )
+        dataset = xr.Dataset({'t2m': (['time'], np.arange(4.0))}, coords={'time': times})
+        dataset['time'].encoding['units'] = 'hours since 2025-08-27 00:00:00'
+        path = tmp_path / 'raw.nc'
+        dataset.to_netcdf(path)
+        time_range = {'start_time': '2025-08-27T03:00', 'end_time': '2025-08-27T06:00'}
+
+        with NetCDFSubsetter.open_fast(path) as raw:
+            assert np.issubdtype(raw['time'].dtype, np.number)
+
+            result = self.subsetter.subset_temporal(raw, time_range)
+            fused = self.subsetter.subset_comprehensive(raw, time_range=time_range)
+
+            np.testing.assert_array_equal(result['time'].values, [3, 6])
+            np.testing.assert_array_equal(fused['t2m'].values, [1.0, 2.0])
+
+
+class TestNetCDFSubsetterResample:
+    """Test temporal downsampling"""
+
+    def _make_dataset(self, start, count, step_hours=1):
+        times = np.datetime64(start) + np.arange(count) * np.timedelta64(step_hours, 'h')
+        return xr.Dataset(
+            {'t2m': (['time', 'x'], np.random.random((count, 2)))},
+            coords={'time': times.astype('datetime64[ns]'), 'x': [0, 1]},
+        )
+
+    def test_regular_axis_uses_coarsen(self):
+        """Test whole aligned bins are averaged with coarsen, matching resample"""
+        dataset = self._make_dataset('2025-08-27T00:00', 12)
+        expected = dataset.resample(time='3h').mean()
+
+        with patch.object(xr.Dataset, 'resample') as mock_resample:
+            result = NetCDFSubsetter._resample_mean(dataset, 'time', '3h')
+
+        mock_resample.assert_not_called()
+        xr.testing.assert_allclose(result, expected)
+
+    @pytest.mark.parametrize('start,count,frequency', [
+        ('2025-08-27T01:00', 12, '3h'),  # first bin would be partial
+        ('2025-08-27T00:00', 10, '3h'),  # last bin would be partial
+        ('2025-08-27T00:00', 12, '90min'),  # not a multiple of the step
+    ])
+    def test_irregular_cases_fall_back_to_resample(self, start, count, frequency):
+        """Test unaligned or partial bins still resample"""
+        dataset = self._make_dataset(start, count)
+
+        assert NetCDFSubsetter._coarsen_factor(dataset, 'time', frequency) is None
+        xr.testing.assert_allclose(
+            NetCDFSubsetter._resample_mean(dataset, 'time', frequency),
+            dataset.resample(time=frequency).mean(),
+        )
+
+    def test_anchored_weekly_frequency_matches_resample(self):
+        """Test 'W' keeps resample's Sunday-anchored bins instead of 7-day blocks"""
+        dataset = self._make_dataset('2024-01-03T00:00', 28, step_hours=24)  # Starts on a Wednesday
+        dataset['t2m'] = (('time', 'x'), np.repeat(np.arange(28.0), 2).reshape(28, 2))
+
+        assert NetCDFSubsetter._coarsen_factor(dataset, 'time', '1W') is None
+        assert not NetCDFSubsetter._has_time_step(dataset, 'time', '1W')
+        xr.testing.assert_identical(
+            NetCDFSubsetter(_make_mapper()).subset_temporal(dataset, {'frequency': '1W'}),
+            dataset.resample(time='1W').mean(),
+        )
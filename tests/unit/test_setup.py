@@ -7,6 +7,7 @@ These tests check that pytest, fixtures, and mocks are properly configured.
 import pytest
 import numpy as np
 import xarray as xr
+import yaml
 from pathlib import Path
 
 # Test fixtures are working
@@ -42,6 +43,18 @@ def test_sample_xarray_dataset_fixture(sample_xarray_dataset):
     assert sample_xarray_dataset.time.size == 5
     assert sample_xarray_dataset.latitude.size == 76
     assert sample_xarray_dataset.longitude.size == 61
+    
+    # Check data matches GRIB's decoded precision and stays in range
+    assert sample_xarray_dataset['t2m'].dtype == np.float32
+    assert 280 <= float(sample_xarray_dataset['t2m'].min()) <= float(sample_xarray_dataset['t2m'].max()) <= 290
+
+def test_mock_config_files_fixture(mock_config_files, mock_config, mock_models_config):
+    """Test that mock config files round-trip to the config fixtures"""
+    import yaml
+    
+    assert yaml.safe_load(mock_config_files['config'].read_text()) == mock_config
+    assert yaml.safe_load(mock_config_files['models_config'].read_text()) == mock_models_config
+    assert mock_config_files['variables_mapping'].exists()
 
 def test_temp_dir_fixture(temp_dir):
     """Test that temporary directory fixture works"""
@@ -109,6 +122,7 @@ def test_mock_dataset_factory():
     assert dataset.time.size == 3
     assert 't2m' in dataset.data_vars
     assert 'rh2m' in dataset.data_vars
+    assert dataset['t2m'].dtype == np.float32
 
 def test_mock_response_from_helpers():
     """Test MockResponse from helpers"""
@@ -131,6 +145,62 @@ def test_mock_response_from_helpers():
     with pytest.raises(Exception):
         error_response.raise_for_status()
 
+def test_patched_requests_get(patched_requests_get):
+    """Test requests.get is patched through monkeypatch"""
+    import requests
+    
+    response = requests.get("https://example.com/test.grb2")
+    
+    assert response.content == b"mock_grib_data"
+    patched_requests_get.assert_called_once_with("https://example.com/test.grb2")
+
+def test_patched_open_mfdataset(patched_open_mfdataset):
+    """Test xarray.open_mfdataset returns the mock dataset"""
+    dataset = xr.open_mfdataset(["a.grb2", "b.grb2"])
+    
+    assert dataset.dims['time'] == 5
+    assert 't2m' in dataset.data_vars
+
+def test_patched_pathlib(tmp_path, patched_pathlib):
+    """Test pathlib operations never touch the disk"""
+    missing = tmp_path / "missing" / "file.grb2"
+    
+    assert missing.exists() is True
+    missing.parent.mkdir(parents=True)
+    missing.write_bytes(b"data")
+    assert missing.stat().st_size == 1024
+    assert not any(tmp_path.iterdir())
+
+def test_patched_yaml_load(patched_yaml_load):
+    """Test yaml.safe_load returns the patched config"""
+    assert yaml.safe_load("ignored: true") is patched_yaml_load
+
+def test_default_mock_response_is_independent_copy(default_mock_response):
+    """Test default mock copies do not share mutable state"""
+    from tests.helpers.mocks import default_mock_response as make_default, default_mock_dataset
+    
+    default_mock_response.headers['content-type'] = 'text/html'
+    assert make_default().headers['content-type'] == 'application/octet-stream'
+    
+    dataset = default_mock_dataset()
+    dataset.data_vars.pop('t2m')
+    assert 't2m' in default_mock_dataset().data_vars
+
+def test_assert_mock_called_with_pattern():
+    """Test pattern matching over positional and keyword call arguments"""
+    from unittest.mock import Mock
+    from tests.helpers.mocks import assert_mock_called_with_pattern
+    
+    mock_get = Mock()
+    mock_get("https://example.com/gfs.t00z.f003", timeout=30)
+    mock_get("other", params={"var": "TMP"})
+    
+    assert assert_mock_called_with_pattern(mock_get, "f003") is True
+    assert assert_mock_called_with_pattern(mock_get, "TMP") is True
+    assert assert_mock_called_with_pattern(mock_get, "30") is True
+    assert assert_mock_called_with_pattern(mock_get, "f00330") is False
+    assert assert_mock_called_with_pattern(Mock(), "f003") is False
+
 # Test parametrize functionality
 @pytest.mark.parametrize("input_value,expected", [
     (0.5, 12),     # Half day = 12 hours
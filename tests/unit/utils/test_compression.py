@@ -0,0 +1,388 @@
+"""
+Unit tests for compression utilities.
+
+Tests NetCDF compression encodings and file compression.
+"""
+
+import pytest
+import numpy as np
+import xarray as xr
+import dask
+import dask.array
+from dask.delayed import Delayed
+from unittest.mock import patch
+
+from src.utils.compression import CompressionManager
+
+
+@pytest.fixture
+def sample_dataset():
+    """Create a small float32 dataset"""
+    return xr.Dataset(
+        {
+            't2m': (['time', 'latitude', 'longitude'], (280 + np.random.random((4, 10, 20))).astype('float32')),
+            'rh2m': (['time', 'latitude', 'longitude'], np.random.random((4, 10, 20)).astype('float32')),
+        },
+        coords={
+            'latitude': np.linspace(-60, 15, 10),
+            'longitude': np.linspace(-90, -30, 20),
+        },
+    )
+
+
+class TestCompressionEncoding:
+    """Test compression encoding configuration"""
+
+    @patch('src.utils.compression.netCDF4.__has_blosc_support__', True, create=True)
+    def test_blosc_encoding_uses_bitshuffle(self):
+        """Test Blosc codecs use bit-shuffling"""
+        encoding = CompressionManager.get_compression_encoding(
+            5, codec='blosc_lz4', least_significant_digit=None
+        )
+
+        assert encoding == {'compression': 'blosc_lz4', 'complevel': 5, 'blosc_shuffle': 2}
+
+    @patch('src.utils.compression.netCDF4.__has_blosc_support__', False, create=True)
+    def test_blosc_falls_back_to_zlib_without_support(self):
+        """Test zlib is used when the netCDF library lacks Blosc"""
+        encoding = CompressionManager.get_compression_encoding(5, least_significant_digit=None)
+
+        assert encoding == {'zlib': True, 'complevel': 5, 'shuffle': True}
+
+    def test_encoding_is_cached_but_independent(self):
+        """Test repeated calls reuse the cached items but return fresh dicts"""
+        first = CompressionManager.get_compression_encoding(3, codec='zlib')
+        first['complevel'] = 9
+        second = CompressionManager.get_compression_encoding(3, codec='zlib')
+
+        assert second['complevel'] == 3
+        assert CompressionManager._encoding_items.cache_info().hits >= 1
+
+    def test_invalid_compression_level(self):
+        """Test compression levels outside 0-9 raise"""
+        with pytest.raises(ValueError, match="between 0 and 9"):
+            CompressionManager.get_compression_encoding(10)
+
+    def test_dataset_encoding_per_variable(self, sample_dataset):
+        """Test the dataset encoding has one independent entry per variable"""
+        encoding = CompressionManager.get_dataset_encoding(
+            sample_dataset, 4, chunking=None, codec='zlib', per_var_lsd={}
+        )
+
+        assert set(encoding) == {'t2m', 'rh2m'}
+        assert encoding['t2m'] == encoding['rh2m']
+        assert encoding['t2m'] is not encoding['rh2m']
+
+    def test_encoding_is_lossless_by_default(self):
+        """Test the shared encoding does not quantize unless asked to"""
+        encoding = CompressionManager.get_compression_encoding()
+
+        assert 'least_significant_digit' not in encoding
+
+    def test_dataset_encoding_quantizes_from_shared_table(self, sample_dataset):
+        """Test known variables use the shared per-variable digits and others stay lossless"""
+        dataset = sample_dataset.assign(q=sample_dataset['rh2m'] * 0.02)
+
+        encoding = CompressionManager.get_dataset_encoding(dataset, chunking=None, codec='zlib')
+
+        assert encoding['t2m']['least_significant_digit'] == CompressionManager.LEAST_SIGNIFICANT_DIGITS['t2m']
+        assert encoding['rh2m']['least_significant_digit'] == CompressionManager.LEAST_SIGNIFICANT_DIGITS['rh2m']
+        assert 'least_significant_digit' not in encoding['q']
+
+    def test_processor_shares_the_digit_table(self):
+        """Test the GRIB processor quantizes with the same per-variable digits"""
+        from src.core.processors.grib_processor import GRIBProcessor
+
+        assert GRIBProcessor.LEAST_SIGNIFICANT_DIGITS is CompressionManager.LEAST_SIGNIFICANT_DIGITS
+
+    def test_per_variable_least_significant_digit(self, sample_dataset):
+        """Test per-variable overrides, including turning quantization off"""
+        encoding = CompressionManager.get_dataset_encoding(
+            sample_dataset, chunking=None, codec='zlib', per_var_lsd={'t2m': 1, 'rh2m': None}
+        )
+
+        assert encoding['t2m']['least_significant_digit'] == 1
+        assert 'least_significant_digit' not in encoding['rh2m']
+
+    def test_integer_variables_are_not_quantized(self, sample_dataset):
+        """Test quantization is only applied to floating point variables"""
+        dataset = sample_dataset.assign(mask=(['latitude', 'longitude'], np.ones((10, 20), dtype='int8')))
+
+        encoding = CompressionManager.get_dataset_encoding(
+            dataset, chunking=None, codec='zlib', least_significant_digit=2
+        )
+
+        assert 'least_significant_digit' not in encoding['mask']
+        assert encoding['t2m']['least_significant_digit'] == 2
+
+
+class TestChunkSizes:
+    """Test per-variable chunk layouts"""
+
+    def _variable(self, *dims, dtype='float32'):
+        return xr.DataArray(np.zeros(tuple(size for _, size in dims), dtype=dtype), dims=[dim for dim, _ in dims])
+
+    def test_auto_bumps_time_to_target(self):
+        """Test 'auto' uses whole fields and enough time steps for the target size"""
+        variable = self._variable(('time', 400), ('latitude', 181), ('longitude', 360))
+
+        chunks = CompressionManager.get_chunk_sizes(variable)
+
+        slab_bytes = 181 * 360 * 4
+        assert chunks[1:] == (181, 360)
+        assert (chunks[0] - 1) * slab_bytes < CompressionManager.TARGET_CHUNK_BYTES <= chunks[0] * slab_bytes
+
+    def test_auto_large_slab_is_one_time_step(self):
+        """Test slabs above the target get one time step per chunk"""
+        variable = xr.DataArray(
+            dask.array.zeros((3, 2, 1801, 3600), dtype='float32'),
+            dims=['time', 'level', 'latitude', 'longitude']
+        )
+
+        assert CompressionManager.get_chunk_sizes(variable) == (1, 2, 1801, 3600)
+
+    def test_auto_small_variable_is_one_chunk(self):
+        """Test variables below the target are written as a single chunk"""
+        variable = self._variable(('time', 4), ('latitude', 10), ('longitude', 20))
+
+        assert CompressionManager.get_chunk_sizes(variable) == (4, 10, 20)
+
+    def test_auto_without_time_is_left_to_library(self):
+        """Test 'auto' leaves variables without a time dimension alone"""
+        variable = self._variable(('latitude', 10), ('longitude', 20))
+
+        assert CompressionManager.get_chunk_sizes(variable) is None
+
+    @pytest.mark.parametrize('chunking, expected', [
+        ('time', (1, 150, 300)),
+        ('space', (8, 100, 100)),
+        ('balanced', (8, 150, 200)),
+        (None, None),
+    ])
+    def test_fixed_strategies_fit_the_variable(self, chunking, expected):
+        """Test fixed strategies are clipped to the variable's shape"""
+        variable = self._variable(('time', 8), ('latitude', 150), ('longitude', 300))
+
+        assert CompressionManager.get_chunk_sizes(variable, chunking) == expected
+
+    def test_unknown_strategy(self):
+        """Test unknown strategies raise"""
+        with pytest.raises(ValueError, match="Unknown chunking"):
+            CompressionManager.get_chunk_sizes(self._variable(('time', 2)), 'diagonal')
+
+    def test_dataset_encoding_has_concrete_chunks(self, sample_dataset):
+        """Test the default encoding only contains positive integer chunk sizes"""
+        encoding = CompressionManager.get_dataset_encoding(sample_dataset, codec='zlib')
+
+        assert encoding['t2m']['chunksizes'] == (4, 10, 20)
+
+    @pytest.mark.parametrize('chunking', ['auto', 'time', 'space', 'balanced'])
+    def test_strategies_write(self, tmp_path, sample_dataset, chunking):
+        """Test every strategy produces an encoding netCDF4 accepts"""
+        input_path = tmp_path / 'input.nc'
+        output_path = tmp_path / 'output.nc'
+        sample_dataset.to_netcdf(input_path)
+
+        assert CompressionManager.apply_compression_to_file(
+            input_path, output_path, chunking=chunking, codec='zlib'
+        )
+
+
+class TestErrorBoundedQuantization:
+    """Test absolute tolerances mapped onto quantization digits"""
+
+    @pytest.mark.parametrize('tolerance, digit', [(0.1, 1), (0.01, 2), (0.5, 0), (5.0, -1)])
+    def test_digit_for_tolerance(self, tolerance, digit):
+        """Test the coarsest digit within the tolerance is chosen"""
+        assert CompressionManager.least_significant_digit_for_tolerance(tolerance) == digit
+
+    def test_invalid_tolerance(self):
+        """Test non-positive tolerances raise"""
+        with pytest.raises(ValueError, match="positive"):
+            CompressionManager.least_significant_digit_for_tolerance(0)
+
+    def test_tolerances_to_digit_table(self):
+        """Test a tolerance table converts into a per_var_lsd table"""
+        digits = CompressionManager.least_significant_digits_for_tolerances({'t2m': 0.1, 'orog': 0.5})
+
+        assert digits == {'t2m': 1, 'orog': 0}
+
+    def test_round_trip_within_tolerance(self, tmp_path, sample_dataset):
+        """Test written data stays within the absolute tolerance"""
+        input_path = tmp_path / 'input.nc'
+        output_path = tmp_path / 'output.nc'
+        dataset = sample_dataset.assign(t2m=sample_dataset['t2m'] * 10)
+        dataset.to_netcdf(input_path)
+
+        assert CompressionManager.apply_compression_to_file(
+            input_path, output_path, chunking=None, codec='zlib',
+            per_var_lsd=CompressionManager.least_significant_digits_for_tolerances({'t2m': 0.1})
+        )
+
+        with xr.open_dataset(output_path) as result:
+            np.testing.assert_allclose(result['t2m'].values, dataset['t2m'].values, rtol=0, atol=0.1)
+            xr.testing.assert_equal(result['rh2m'], dataset['rh2m'])
+
+
+class TestCompressionFiles:
+    """Test compressing NetCDF files"""
+
+    @pytest.mark.parametrize('codec', ['zlib', 'blosc_zstd'])
+    def test_apply_compression_round_trip(self, tmp_path, sample_dataset, codec):
+        """Test compressed files keep the data"""
+        input_path = tmp_path / 'input.nc'
+        output_path = tmp_path / 'output.nc'
+        sample_dataset.to_netcdf(input_path)
+
+        assert CompressionManager.apply_compression_to_file(
+            input_path, output_path, compression_level=4, chunking=None, codec=codec,
+            per_var_lsd={}
+        )
+
+        with xr.open_dataset(output_path) as result:
+            xr.testing.assert_equal(result, sample_dataset)
+
+    def test_apply_compression_closes_input_on_error(self, tmp_path, sample_dataset):
+        """Test the input is closed when the write fails"""
+        input_path = tmp_path / 'input.nc'
+        sample_dataset.to_netcdf(input_path)
+
+        with patch.object(xr.Dataset, 'to_netcdf', side_effect=OSError("disk full")), \
+                patch.object(xr.Dataset, 'close', autospec=True, side_effect=xr.Dataset.close) as mock_close:
+            result = CompressionManager.apply_compression_to_file(
+                input_path, tmp_path / 'output.nc', chunking=None, codec='zlib'
+            )
+
+        assert result is False
+        mock_close.assert_called_once()
+
+    def test_apply_compression_logs_errors(self, tmp_path, caplog):
+        """Test failures are reported through the weather_downloader logger"""
+        with caplog.at_level('ERROR', logger='weather_downloader'):
+            result = CompressionManager.apply_compression_to_file(
+                tmp_path / 'missing.nc', tmp_path / 'output.nc', chunking=None, codec='zlib'
+            )
+
+        assert result is False
+        assert "Error applying compression" in caplog.text
+
+    def test_apply_compression_keeps_small_unknown_fields(self, tmp_path, sample_dataset):
+        """Test variables missing from the digit table are written losslessly by default"""
+        input_path = tmp_path / 'input.nc'
+        output_path = tmp_path / 'output.nc'
+        dataset = sample_dataset.assign(q=sample_dataset['rh2m'] * np.float32(0.02))
+        dataset.to_netcdf(input_path)
+
+        assert CompressionManager.apply_compression_to_file(
+            input_path, output_path, chunking=None, codec='zlib'
+        )
+
+        with xr.open_dataset(output_path) as result:
+            xr.testing.assert_equal(result['q'], dataset['q'])
+
+    def test_apply_compression_quantizes(self, tmp_path, sample_dataset):
+        """Test quantized files stay within the requested precision"""
+        input_path = tmp_path / 'input.nc'
+        output_path = tmp_path / 'output.nc'
+        sample_dataset.to_netcdf(input_path)
+
+        assert CompressionManager.apply_compression_to_file(
+            input_path, output_path, chunking=None, codec='zlib', least_significant_digit=2
+        )
+
+        with xr.open_dataset(output_path) as result:
+            np.testing.assert_allclose(result['t2m'].values, sample_dataset['t2m'].values, atol=0.01)
+            assert not np.array_equal(result['t2m'].values, sample_dataset['t2m'].values)
+
+
+class TestOptimalChunkSize:
+    """Test chunk size calculation"""
+
+    def _dataset(self, **sizes):
+        return xr.Dataset({'v': (list(sizes), np.zeros(tuple(sizes.values()), dtype='int8'))})
+
+    def test_small_dimensions_are_not_split(self):
+        """Test dimensions smaller than their share are taken whole"""
+        dataset = self._dataset(time=4, latitude=721, longitude=1440)
+
+        chunks = CompressionManager.get_optimal_chunk_size(dataset, target_chunk_size_mb=1.0)
+
+        assert chunks['time'] == 4
+        assert chunks['latitude'] < 721 and chunks['longitude'] < 1440
+        assert np.prod(list(chunks.values())) * 8 <= 1024 * 1024
+
+    def test_budget_larger_than_dataset(self):
+        """Test every dimension is whole when the dataset fits in one chunk"""
+        dataset = self._dataset(time=2, latitude=3, longitude=5)
+
+        assert CompressionManager.get_optimal_chunk_size(dataset) == {'time': 2, 'latitude': 3, 'longitude': 5}
+
+    def test_no_dimensions(self):
+        """Test a dataset without dimensions has no chunks"""
+        assert CompressionManager.get_optimal_chunk_size(xr.Dataset()) == {}
+
+
+class TestCompressionBatch:
+    """Test deferred and batched compression"""
+
+    def _write_inputs(self, tmp_path, dataset, count):
+        files = []
+        for i in range(count):
+            input_path = tmp_path / f'input_{i}.nc'
+            dataset.assign(t2m=dataset['t2m'] + i).to_netcdf(input_path)
+            files.append((input_path, tmp_path / f'output_{i}.nc'))
+        return files
+
+    def test_deferred_write_runs_on_compute(self, tmp_path, sample_dataset):
+        """Test defer returns a delayed write that only runs when computed"""
+        (input_path, output_path), = self._write_inputs(tmp_path, sample_dataset, 1)
+
+        write = CompressionManager.apply_compression_to_file(
+            input_path, output_path, chunking=None, codec='zlib', defer=True,
+            per_var_lsd={}
+        )
+
+        assert isinstance(write, Delayed)
+        assert write.compute() is True
+        with xr.open_dataset(output_path) as result:
+            xr.testing.assert_equal(result, sample_dataset)
+
+    def test_batch_compresses_every_file(self, tmp_path, sample_dataset):
+        """Test a batch writes all files and reports failures per file"""
+        files = self._write_inputs(tmp_path, sample_dataset, 3)
+        files.append((tmp_path / 'missing.nc', tmp_path / 'missing_out.nc'))
+
+        results = CompressionManager.apply_compression_to_files(
+            files, compression_level=3, chunking=None, codec='zlib'
+        )
+
+        assert results == [True, True, True, False]
+        for i, (_, output_path) in enumerate(files[:3]):
+            with xr.open_dataset(output_path) as result:
+                np.testing.assert_allclose(result['t2m'].values, sample_dataset['t2m'].values + i, atol=0.01)
+
+    def test_batch_isolates_a_failing_write(self, tmp_path, sample_dataset):
+        """Test one failing write neither fails nor leaks the rest of the batch"""
+        files = self._write_inputs(tmp_path, sample_dataset, 3)
+        to_netcdf = xr.Dataset.to_netcdf
+        close = xr.Dataset.close
+
+        def fail_partway(path):
+            path.write_bytes(b'partial')
+            raise OSError("disk full")
+
+        def failing_to_netcdf(dataset, path=None, *args, **kwargs):
+            if path == files[1][1]:
+                return dask.delayed(fail_partway)(path)
+            return to_netcdf(dataset, path, *args, **kwargs)
+
+        with patch.object(xr.Dataset, 'to_netcdf', autospec=True, side_effect=failing_to_netcdf), \
+                patch.object(xr.Dataset, 'close', autospec=True, side_effect=close) as mock_close:
+            results = CompressionManager.apply_compression_to_files(
+                files, chunking=None, codec='zlib'
+            )
+
+        assert results == [True, False, True]
+        assert mock_close.call_count == 3
+        assert not files[1][1].exists()
+        assert files[0][1].exists() and files[2][1].exists()
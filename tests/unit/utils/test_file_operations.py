@@ -5,7 +5,10 @@ Tests file management, validation, and utility functions.
 """
 
 import pytest
+import errno
 import hashlib
+import os
+import shutil
 from pathlib import Path
 from unittest.mock import patch, mock_open
 
@@ -46,6 +49,37 @@ class TestFileOperations:
         assert nested_dir.is_dir()
         assert result == nested_dir
     
+    def test_ensure_directory_cached(self, tmp_path):
+        """Test directories created once are not created again"""
+        nested_dir = tmp_path / "parent" / "child"
+        FileOperations.ensure_directory(nested_dir)
+        
+        with patch.object(Path, "mkdir") as mock_mkdir:
+            FileOperations.ensure_directory(nested_dir)
+            FileOperations.ensure_directory(tmp_path / "parent")
+        
+        mock_mkdir.assert_not_called()
+    
+    def test_ensure_directory_after_safe_remove(self, tmp_path):
+        """Test directories removed with safe_remove are created again"""
+        nested_dir = tmp_path / "parent" / "child"
+        FileOperations.ensure_directory(nested_dir)
+        
+        assert FileOperations.safe_remove(tmp_path / "parent")
+        FileOperations.ensure_directory(nested_dir)
+        
+        assert nested_dir.is_dir()
+    
+    def test_ensure_directory_after_external_removal(self, tmp_path):
+        """Test cached directories removed behind the cache's back are created again"""
+        nested_dir = tmp_path / "parent" / "child"
+        FileOperations.ensure_directory(nested_dir)
+        
+        shutil.rmtree(tmp_path / "parent")
+        FileOperations.ensure_directory(nested_dir)
+        
+        assert nested_dir.is_dir()
+    
     def test_safe_remove_file(self, tmp_path):
         """Test safely removing a file"""
         test_file = tmp_path / "test.txt"
@@ -118,6 +152,27 @@ class TestFileOperations:
         
         assert result == expected_hash
     
+    def test_calculate_file_hash_defaults_to_sha256(self, tmp_path):
+        """Test the default algorithm is SHA256 and large files hash fully"""
+        test_file = tmp_path / "test.bin"
+        content = bytes(range(256)) * 5000
+        test_file.write_bytes(content)
+        
+        result = FileOperations.calculate_file_hash(test_file)
+        
+        assert result == hashlib.sha256(content).hexdigest()
+    
+    @pytest.mark.parametrize("size", [0, 1, (1 << 20) - 1, 1 << 20, (3 << 20) + 7])
+    def test_calculate_file_hash_window_boundaries(self, tmp_path, size):
+        """Test files of any size relative to the hash window hash fully"""
+        test_file = tmp_path / "test.bin"
+        content = os.urandom(size)
+        test_file.write_bytes(content)
+        
+        result = FileOperations.calculate_file_hash(test_file)
+        
+        assert result == hashlib.sha256(content).hexdigest()
+    
     def test_calculate_file_hash_nonexistent(self, tmp_path):
         """Test hash of non-existent file"""
         nonexistent = tmp_path / "does_not_exist.txt"
@@ -185,6 +240,42 @@ class TestFileOperations:
         assert backup_path is not None
         assert backup_path.name == "original.txt.old"
     
+    @patch('src.utils.file_operations.os.copy_file_range', side_effect=OSError(errno.EXDEV, "Cross-device link"))
+    def test_backup_file_falls_back_to_copyfile(self, mock_copy_range, tmp_path):
+        """Test backup falls back to a regular copy and keeps file metadata"""
+        original = tmp_path / "original.nc"
+        original.write_bytes(b"netcdf" * 1000)
+        os.utime(original, (1_700_000_000, 1_700_000_000))
+        
+        backup = FileOperations.backup_file(original)
+        
+        mock_copy_range.assert_called_once()
+        assert backup.read_bytes() == original.read_bytes()
+        assert backup.stat().st_mtime == original.stat().st_mtime
+    
+    @patch('src.utils.file_operations.os.copy_file_range', return_value=0)
+    def test_backup_file_falls_back_when_nothing_copied(self, mock_copy_range, tmp_path):
+        """Test a copy_file_range that makes no progress falls back to a full copy"""
+        original = tmp_path / "original.nc"
+        original.write_bytes(b"netcdf" * 1000)
+        
+        backup = FileOperations.backup_file(original)
+        
+        mock_copy_range.assert_called_once()
+        assert backup.read_bytes() == original.read_bytes()
+    
+    @patch('src.utils.file_operations.os.copy_file_range', side_effect=[100, 0])
+    def test_copy_file_range_stopping_mid_copy_raises(self, mock_copy_range, tmp_path):
+        """Test a copy that stops part way is an error, not a truncated success"""
+        original = tmp_path / "original.nc"
+        original.write_bytes(b"netcdf" * 1000)
+        
+        with pytest.raises(OSError, match="bytes left"):
+            FileOperations._copy_file_range(original, tmp_path / "copy.nc")
+        
+        mock_copy_range.side_effect = [100, 0]
+        assert FileOperations.backup_file(original) is None
+    
     def test_backup_file_nonexistent(self, tmp_path):
         """Test backup of non-existent file"""
         nonexistent = tmp_path / "does_not_exist.txt"
@@ -193,6 +284,39 @@ class TestFileOperations:
         
         assert result is None
     
+    def test_list_files(self, tmp_path):
+        """Test listing matching files, optionally recursively"""
+        (tmp_path / "a.nc").touch()
+        (tmp_path / "b.grib2").touch()
+        (tmp_path / "dir.nc").mkdir()
+        (tmp_path / "sub" / "deep").mkdir(parents=True)
+        (tmp_path / "sub" / "c.nc").touch()
+        (tmp_path / "sub" / "deep" / "d.nc").touch()
+        
+        flat = FileOperations.list_files(tmp_path, "*.nc")
+        nested = FileOperations.list_files(tmp_path, "*.nc", recursive=True)
+        
+        assert sorted(flat) == [tmp_path / "a.nc"]
+        assert sorted(nested) == [
+            tmp_path / "a.nc",
+            tmp_path / "sub" / "c.nc",
+            tmp_path / "sub" / "deep" / "d.nc",
+        ]
+    
+    def test_list_files_nonexistent(self, tmp_path):
+        """Test listing a missing directory yields nothing"""
+        assert list(FileOperations.list_files(tmp_path / "missing")) == []
+    
+    def test_list_files_into(self, tmp_path):
+        """Test appending matches to an existing list"""
+        (tmp_path / "a.nc").touch()
+        out = [tmp_path / "existing.nc"]
+        
+        result = FileOperations.list_files_into(out, tmp_path, "*.nc")
+        
+        assert result is out
+        assert out == [tmp_path / "existing.nc", tmp_path / "a.nc"]
+    
     def test_get_disk_usage_valid_path(self, tmp_path):
         """Test getting disk usage for valid path"""
         result = FileOperations.get_disk_usage(tmp_path)
@@ -247,7 +371,7 @@ class TestFileOperationsEdgeCases:
         
         assert result is None
     
-    @patch('src.utils.file_operations.shutil.copy2')
+    @patch('src.utils.file_operations.FileOperations._copy_file_range')
     def test_backup_file_copy_error(self, mock_copy, tmp_path):
         """Test backup with copy error"""
         mock_copy.side_effect = OSError("Cannot copy")
@@ -0,0 +1,148 @@
+"""
+Unit tests for the logging manager.
+
+Tests handler setup and the global logger helpers.
+"""
+
+import logging
+import threading
+import time
+from logging.handlers import QueueHandler
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import logging_manager
+from src.utils.logging_manager import LoggingManager, get_logger, setup_logging
+
+
+class TestLoggingManager:
+    """Test LoggingManager handler setup"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.manager = None
+
+    def teardown_method(self):
+        """Close handlers opened by the test"""
+        if self.manager is not None:
+            self.manager.close()
+
+    def test_file_records_written_once(self, tmp_path):
+        """Test each record reaches the log file exactly once"""
+        log_file = tmp_path / "logs" / "test.log"
+        self.manager = LoggingManager(log_file=log_file, enable_rich=False)
+
+        self.manager.info("download started")
+        self.manager.close()
+
+        assert log_file.read_text().count("download started") == 1
+
+    def test_file_writes_go_through_queue(self, tmp_path):
+        """Test the file handler runs behind a queue listener"""
+        self.manager = LoggingManager(log_file=tmp_path / "test.log", enable_rich=False)
+
+        queue_handlers = [h for h in self.manager.logger.handlers if isinstance(h, QueueHandler)]
+
+        assert len(queue_handlers) == 1
+        assert queue_handlers[0].listener is not None
+
+    def test_file_level_respected(self, tmp_path):
+        """Test records below the file level are not written"""
+        log_file = tmp_path / "test.log"
+        self.manager = LoggingManager(log_file=log_file, file_level='WARNING', enable_rich=False)
+
+        self.manager.info("quiet")
+        self.manager.warning("loud")
+        self.manager.close()
+
+        contents = log_file.read_text()
+        assert "quiet" not in contents
+        assert "WARNING - loud" in contents
+
+    def test_reinitialize_replaces_handlers(self, tmp_path):
+        """Test a new manager replaces the handlers of the previous one"""
+        LoggingManager(log_file=tmp_path / "first.log", enable_rich=False)
+        self.manager = LoggingManager(log_file=tmp_path / "second.log", enable_rich=False)
+
+        self.manager.info("only second")
+
+        assert len(self.manager.logger.handlers) == 2  # console + file queue
+        self.manager.close()
+        assert "only second" not in (tmp_path / "first.log").read_text()
+        assert "only second" in (tmp_path / "second.log").read_text()
+
+    def test_levels_resolved_once(self):
+        """Test level names are resolved to numbers at construction"""
+        self.manager = LoggingManager(console_level='warning', file_level='debug', enable_rich=False)
+
+        assert self.manager._console_level_no == logging.WARNING
+        assert self.manager._file_level_no == logging.DEBUG
+
+    def test_invalid_level(self):
+        """Test unknown level names raise"""
+        with pytest.raises(KeyError):
+            LoggingManager(console_level='LOUD', enable_rich=False)
+
+    def test_logger_level_is_lowest_handler_level(self, tmp_path):
+        """Test records no handler would emit are filtered by the logger"""
+        self.manager = LoggingManager(console_level='INFO', enable_rich=False)
+        assert not self.manager.logger.isEnabledFor(logging.DEBUG)
+
+        self.manager = LoggingManager(
+            log_file=tmp_path / "test.log", console_level='INFO', file_level='DEBUG', enable_rich=False
+        )
+        assert self.manager.logger.isEnabledFor(logging.DEBUG)
+
+    def test_log_with_color_dispatch(self, tmp_path):
+        """Test _log_with_color routes to the logger method of the level"""
+        log_file = tmp_path / "test.log"
+        self.manager = LoggingManager(log_file=log_file, enable_rich=False)
+
+        self.manager._log_with_color('error', "broken")
+        self.manager.success("done")
+        self.manager.close()
+
+        contents = log_file.read_text()
+        assert "ERROR - broken" in contents
+        assert "INFO - SUCCESS: done" in contents
+
+
+class TestGlobalLogger:
+    """Test the global logging manager helpers"""
+
+    def setup_method(self):
+        """Reset the global manager"""
+        logging_manager._logging_manager = None
+
+    def teardown_method(self):
+        """Reset the global manager"""
+        logging_manager._logging_manager = None
+
+    def test_get_logger_builds_one_manager_across_threads(self):
+        """Test concurrent first calls share a single manager"""
+        def slow_manager(**kwargs):
+            time.sleep(0.01)
+            return object()
+
+        results = []
+        with patch('src.utils.logging_manager.LoggingManager', side_effect=slow_manager) as mock_manager:
+            threads = [threading.Thread(target=lambda: results.append(get_logger())) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert mock_manager.call_count == 1
+        assert len(results) == 8
+        assert all(result is results[0] for result in results)
+
+    def test_setup_logging_replaces_manager(self, tmp_path):
+        """Test setup_logging installs the manager get_logger returns"""
+        manager = setup_logging(log_file=tmp_path / "test.log", console_level='WARNING')
+
+        try:
+            assert get_logger() is manager
+            assert manager._console_level_no == logging.WARNING
+        finally:
+            manager.close()
@@ -5,6 +5,7 @@ Tests actual functionality from time_management.py module.
 """
 
 import pytest
+import numpy as np
 from datetime import datetime, timedelta
 
 from src.utils.time_management import ForecastManager, TimeRangeManager, CycleManager
@@ -78,6 +79,45 @@ class TestForecastManager:
         """Test invalid forecast hour for info"""
         with pytest.raises(ValueError, match="Invalid forecast hour"):
             ForecastManager.get_forecast_info(300)
+    
+    def test_get_forecast_info_plain_values(self):
+        """Test single-hour info holds plain Python values"""
+        assert ForecastManager.get_forecast_info(0) == {
+            "forecast_hour": 0,
+            "description": "F000",
+            "is_analysis": True,
+            "is_short_range": True,
+            "is_medium_range": False
+        }
+        assert type(ForecastManager.get_forecast_info(120)["forecast_hour"]) is int
+    
+    def test_get_forecast_info_batch(self):
+        """Test batch info returns one array per field"""
+        result = ForecastManager.get_forecast_info_batch([0, 48, 120])
+        
+        assert result["forecast_hour"].tolist() == [0, 48, 120]
+        assert result["description"].tolist() == ["F000", "F048", "F120"]
+        assert result["is_analysis"].tolist() == [True, False, False]
+        assert result["is_short_range"].tolist() == [True, True, False]
+        assert result["is_medium_range"].tolist() == [False, False, True]
+    
+    def test_get_forecast_info_batch_empty(self):
+        """Test an empty batch gives empty arrays"""
+        result = ForecastManager.get_forecast_info_batch([])
+        
+        assert all(values.size == 0 for values in result.values())
+        assert result["forecast_hour"].dtype == np.int16
+    
+    def test_get_forecast_info_batch_invalid(self):
+        """Test the first invalid hour is reported"""
+        with pytest.raises(ValueError, match="Invalid forecast hour: 70000"):
+            ForecastManager.get_forecast_info_batch([3, 70000, -1])
+    
+    @pytest.mark.parametrize("forecast_hour", [3.7, "24", True])
+    def test_get_forecast_info_rejects_non_integers(self, forecast_hour):
+        """Test floats, strings and bools are not converted to hours"""
+        with pytest.raises(ValueError, match="not an integer"):
+            ForecastManager.get_forecast_info(forecast_hour)
 
 
 class TestTimeRangeManager:
@@ -113,6 +153,26 @@ class TestTimeRangeManager:
         """Test multiple days sequence"""
         result = TimeRangeManager.generate_date_sequence("20250828", "20250830")
         assert result == ["20250828", "20250829", "20250830"]
+    
+    def test_generate_date_sequence_across_month(self):
+        """Test sequences spanning a month and leap day"""
+        result = TimeRangeManager.generate_date_sequence("20240228", "20240301")
+        assert result == ["20240228", "20240229", "20240301"]
+    
+    @pytest.mark.parametrize("date,expected", [
+        ("20250828", True),
+        ("20240229", True),
+        ("20250229", False),
+        ("2025111", False),
+        ("2025082", False),
+        ("202508281", False),
+        (" 2025082", False),
+        ("2025-8-1", False),
+        ("２０２５０８２８", False),
+    ])
+    def test_validate_date_format(self, date, expected):
+        """Test only real 8-digit YYYYMMDD dates are valid"""
+        assert TimeRangeManager.validate_date_format(date) == expected
 
 
 class TestCycleManager:
@@ -138,6 +198,16 @@ class TestCycleManager:
         assert "cycle" in result
         assert result["cycle"] == "00"
     
+    def test_parse_cycles(self):
+        """Test parsing keeps the given order"""
+        assert CycleManager.parse_cycles("18, 00") == ["18", "00"]
+        assert CycleManager.parse_cycles("") == CycleManager.DEFAULT_CYCLES
+    
+    def test_parse_cycles_invalid(self):
+        """Test every invalid cycle is reported"""
+        with pytest.raises(ValueError, match="Invalid cycle: 03, 24"):
+            CycleManager.parse_cycles("00,03,24")
+    
     def test_get_cycle_info_invalid(self):
         """Test invalid cycle for info"""
         with pytest.raises(ValueError, match="Invalid cycle"):
@@ -165,6 +235,24 @@ class TestParseRangeFunction:
         result = ForecastManager.parse_forecast_range("0,24", simple_config)
         expected = list(range(0, 25))  # 0-24h
         assert result == expected
+    
+    def test_parse_forecast_range_keeps_step_grid(self):
+        """Test ranges clipped by the request stay on their own step grid"""
+        gfs_config = {
+            'cycle_forecast_ranges': {
+                '00': [[0, 120, 1], [120, 384, 3]]
+            }
+        }
+        
+        result = ForecastManager.parse_forecast_range("118,130", gfs_config)
+        assert result == [118, 119, 120, 123, 126, 129]
+    
+    def test_parse_forecast_range_outside_model_ranges(self):
+        """Test requests outside every model range give no hours"""
+        config = {'cycle_forecast_ranges': {'00': [[0, 12, 3]]}}
+        
+        assert ForecastManager.parse_forecast_range("13,20", config) == []
+        assert ForecastManager.parse_forecast_range("1,7", config) == [3, 6]
 
 
 class TestIntegration:
@@ -59,6 +59,17 @@ class TestDataValidator:
         assert DataValidator.validate_url("not-a-url") is False
         assert DataValidator.validate_url("invalid_url") is False
     
+    @pytest.mark.parametrize("url,expected", [
+        ("https://nomads.ncep.noaa.gov/cgi-bin/filter_gfs_0p25.pl?file=x", True),
+        ("ftp://example.com", False),
+        ("HTTPS://example.com", False),
+        ("https://", False),
+        ("https://.example.com", False),
+    ])
+    def test_validate_url_schemes(self, url, expected):
+        """Test only http(s) URLs with a host are valid"""
+        assert DataValidator.validate_url(url) is expected
+    
     def test_validate_file_path_existing(self, tmp_path):
         """Test file path validation for existing files"""
         test_file = tmp_path / "test.txt"
@@ -76,6 +87,26 @@ class TestDataValidator:
         result = DataValidator.validate_file_path(str(test_file))
         assert isinstance(result, bool)
     
+    @pytest.mark.parametrize("path,expected", [
+        ("data/gfs", True),
+        (Path("/not/created/yet"), True),
+        ("bad\x00path", False),
+        (None, False),
+        (42, False),
+    ])
+    def test_validate_file_path_syntax(self, path, expected):
+        """Test paths are validated syntactically only"""
+        assert DataValidator.validate_file_path(path) is expected
+    
+    def test_validate_file_path_exists(self, tmp_path):
+        """Test existence checks"""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("content")
+        
+        assert DataValidator.validate_file_path_exists(test_file) is True
+        assert DataValidator.validate_file_path_exists(tmp_path / "missing.txt") is False
+        assert DataValidator.validate_file_path_exists("bad\x00path") is False
+    
     def test_validate_compression_level_valid(self):
         """Test valid compression levels"""
         assert DataValidator.validate_compression_level(1) is True
@@ -96,6 +127,32 @@ class TestDataValidator:
         assert isinstance(is_valid, bool)
         assert isinstance(errors, list)
     
+    def test_validate_config_structure_models(self):
+        """Test invalid model names and missing model keys are all reported"""
+        model = {"name": "GFS", "resolution": "0.25", "base_url": "https://example.com"}
+        config = {
+            "models": {"gfs": model, "bad name": model, "gfs/2": {"name": "GFS"}},
+            "processing": {},
+            "storage": {},
+        }
+        
+        is_valid, errors = DataValidator.validate_config_structure(config)
+        
+        assert is_valid is False
+        assert errors == [
+            "Invalid model name: bad name",
+            "Invalid model name: gfs/2",
+            "Missing required key in gfs/2: resolution",
+            "Missing required key in gfs/2: base_url",
+        ]
+    
+    def test_validate_config_structure_missing_keys_in_order(self):
+        """Test missing top-level keys are reported in a fixed order"""
+        is_valid, errors = DataValidator.validate_config_structure({"processing": {}})
+        
+        assert is_valid is False
+        assert errors == ["Missing required key: models", "Missing required key: storage"]
+    
     def test_validate_config_structure_empty(self):
         """Test empty config"""
         is_valid, errors = DataValidator.validate_config_structure({})
@@ -136,6 +193,12 @@ class TestDataValidatorTypes:
         # Test with string (should be False)
         result = DataValidator.validate_compression_level("5")
         assert result is False
+    
+    def test_validate_compression_level_rejects_bool(self):
+        """Test booleans are not accepted as compression levels"""
+        assert DataValidator.validate_compression_level(True) is False
+        assert DataValidator.validate_compression_level(False) is False
+        assert DataValidator.validate_compression_level(0) is True
 
 
 class TestDataValidatorPatterns:
@@ -167,6 +230,48 @@ class TestDataValidatorPatterns:
         for level in levels:
             result = DataValidator.validate_level_name(level)
             assert isinstance(result, bool)  # Just verify it works
+    
+    @pytest.mark.parametrize("level,expected", [
+        ("2 m above ground", True),
+        ("500\u00a0mb", True),
+        ("mean sea-level", True),
+        ("500mb!", False),
+        ("nível", False),
+    ])
+    def test_level_name_characters(self, level, expected):
+        """Test level names allow separators and any whitespace only"""
+        assert DataValidator.validate_level_name(level) is expected
+    
+    @pytest.mark.parametrize("validator,value", [
+        (DataValidator.validate_model_name, "gfs\n"),
+        (DataValidator.validate_variable_name, "TMP\n"),
+        (DataValidator.validate_model_name, "gfs.0p25é"),
+        (DataValidator.validate_variable_name, "TMP²"),
+    ])
+    def test_names_reject_other_characters(self, validator, value):
+        """Test trailing newlines and non-ASCII characters are rejected"""
+        assert validator(value) is False
+
+
+class TestDataValidatorCache:
+    """Test caching of name validators"""
+    
+    def test_repeated_names_hit_cache(self):
+        """Test repeated model names are answered from the cache"""
+        from src.utils.validation import _is_valid_model_name
+        
+        _is_valid_model_name.cache_clear()
+        for _ in range(3):
+            assert DataValidator.validate_model_name("gfs.0p25") is True
+        
+        info = _is_valid_model_name.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+    
+    def test_unhashable_input_is_rejected_before_cache(self):
+        """Test non-string inputs never reach the cache"""
+        assert DataValidator.validate_model_name(["gfs"]) is False
+        assert DataValidator.validate_variable_name({"TMP": 1}) is False
 
 
 class TestDataValidatorIntegration: